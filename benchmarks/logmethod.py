@@ -0,0 +1,62 @@
+# Per command overhead of tagging log records with the handler name.
+# before: every handler and helper calls inspect.stack()[1][3]
+# after:  the handler is wrapped with logcontext.log_method and helpers read logcontext.current_method()
+#
+# run from the repository root: python benchmarks/logmethod.py [iterations]
+import asyncio
+import inspect
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from bot.cogs.lib import logcontext
+
+# get_string is called several times for every embed a command sends
+STRING_LOOKUPS = 6
+STRINGS = { "title": "Title", "info": "Info" }
+
+class Before():
+    def get_string(self, key: str):
+        _method = inspect.stack()[1][3]
+        return STRINGS.get(key, key)
+
+    async def command(self):
+        _method = inspect.stack()[1][3]
+        for _ in range(STRING_LOOKUPS):
+            self.get_string("title")
+        return _method
+
+class After():
+    def get_string(self, key: str):
+        _method = logcontext.current_method()
+        return STRINGS.get(key, key)
+
+    @logcontext.log_method
+    async def command(self):
+        _method = logcontext.current_method()
+        for _ in range(STRING_LOOKUPS):
+            self.get_string("title")
+        return _method
+
+async def measure(handler, iterations: int):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await handler.command()
+    return (time.perf_counter() - start) / iterations
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    loop = asyncio.new_event_loop()
+    try:
+        before = loop.run_until_complete(measure(Before(), iterations))
+        after = loop.run_until_complete(measure(After(), iterations))
+    finally:
+        loop.close()
+    print(f"iterations: {iterations}, get_string calls per command: {STRING_LOOKUPS}")
+    print(f"inspect.stack():          {before * 1000000:10.1f} us per command")
+    print(f"logcontext.log_method:    {after * 1000000:10.1f} us per command")
+    print(f"speedup:                  {before / after:10.1f}x")
+
+if __name__ == '__main__':
+    main()
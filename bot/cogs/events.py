@@ -1,5 +1,6 @@
 import discord
 from discord.ext import commands
+from discord.ext import tasks
 import asyncio
 import json
 import traceback
@@ -11,22 +12,51 @@ import typing
 from .lib import utils
 from .lib import settings
 from .lib import sqlite
-from .lib import mongo
 from .lib import logger
 from .lib import loglevel
 from .lib import dbprovider
+from .lib import namegenerator
 class Events(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.settings = settings.Settings()
-        log_level = loglevel.LogLevel[self.settings.log_level.upper()]
-        if not log_level:
-            log_level = loglevel.LogLevel.DEBUG
-
-        self.log = logger.Log(minimumLogLevel=log_level)
+        self.log = bot.log
         self.log.debug(0, "events.__init__", f"DB Provider {self.settings.db_provider.name}")
         self.log.debug(0, "events.__init__", f"SQLITE DB Path: {self.settings.db_path}")
-        self.log.debug(0, "events.__init__", f"Logger initialized with level {log_level.name}")
+        self.log.debug(0, "events.__init__", f"Logger initialized with level {self.log.minimum_log_level.name}")
+        self.db = bot.db
+        # mongo expires logs and history with ttl indexes, sqlite has to delete them itself
+        if self.settings.db_provider == dbprovider.DatabaseProvider.SQLITE:
+            self.prune.change_interval(minutes=self.settings.prune_interval)
+            self.prune.start()
+        if self.settings.random_words_url:
+            self.refresh_words.change_interval(hours=self.settings.random_words_refresh)
+            self.refresh_words.start()
+
+    def cog_unload(self):
+        self.prune.cancel()
+        self.refresh_words.cancel()
+
+    @tasks.loop(minutes=60)
+    async def prune(self):
+        try:
+            removed = await self.db.prune(logRetentionDays=self.settings.log_retention_days, historyRetentionDays=self.settings.history_retention_days)
+            if removed:
+                self.log.debug(0, "events.prune", f"Removed {removed} expired logs and history")
+        except Exception as ex:
+            self.log.error(0, "events.prune", str(ex), traceback.format_exc())
+
+    @prune.before_loop
+    async def before_prune(self):
+        await self.bot.wait_until_ready()
+
+    @tasks.loop(hours=24)
+    async def refresh_words(self):
+        # runs in the background, names keep coming from the bundled lists while it fetches or if it fails
+        if await namegenerator.get_generator().refresh(self.settings.random_words_url):
+            self.log.debug(0, "events.refresh_words", f"Random name words refreshed from {self.settings.random_words_url}")
+        else:
+            self.log.warn(0, "events.refresh_words", f"Unable to refresh random name words from {self.settings.random_words_url}")
 
 
 
@@ -0,0 +1,176 @@
+import asyncio
+import traceback
+from collections import deque
+
+class ChannelPool():
+    # Hidden channel sets created ahead of time for each create channel that has a pool size.
+    # A joining member takes one instead of waiting for two channel creations. A single task
+    # keeps every pool at its size in the background, creating (or deleting the surplus) at no
+    # more than ratePerMinute sets a minute, so a burst of joins does not also burst the
+    # guild's channel create rate limit. A pool that fails to fill (missing permissions, a full
+    # category) is parked for a back off that doubles on every failure, up to maxBackoff
+    # seconds, so it can not keep the task from the other pools.
+    def __init__(self, fillCallback, drainCallback, ratePerMinute: float = 10.0, burst: int = 5, maxBackoff: float = 1800.0):
+        # fillCallback(guildId, createChannelId) returns (voice_id, text_id) or None
+        self.fill_callback = fillCallback
+        # drainCallback(guildId, voiceChannelId, textChannelId) deletes a set that is not needed
+        self.drain_callback = drainCallback
+        self.rate = max(0.1, ratePerMinute) / 60
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        # (guild_id, create_channel_id) -> deque of (voice_id, text_id), oldest first
+        self.sets = {}
+        # (guild_id, create_channel_id) -> number of sets to keep
+        self.sizes = {}
+        # (guild_id, create_channel_id) -> (retry at loop time, back off seconds)
+        self.backoff = {}
+        self.max_backoff = max(1 / self.rate, maxBackoff)
+        self.taken = 0
+        self.missed = 0
+        self._wake = None
+        self._task = None
+        self._updated = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._updated = asyncio.get_event_loop().time()
+            self._wake = asyncio.Event()
+            self._task = asyncio.ensure_future(self.__run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def __wake(self):
+        if self._wake:
+            self._wake.set()
+
+    def set_size(self, guildId: int, createChannelId: int, size: int):
+        key = (guildId, createChannelId)
+        if size > 0:
+            self.sizes[key] = size
+        else:
+            self.sizes.pop(key, None)
+        # a new size is worth another try right away
+        self.backoff.pop(key, None)
+        self.__wake()
+
+    def get_size(self, guildId: int, createChannelId: int):
+        return self.sizes.get((guildId, createChannelId), 0)
+
+    def add(self, guildId: int, createChannelId: int, voiceChannelId: int, textChannelId: int):
+        self.sets.setdefault((guildId, createChannelId), deque()).append((voiceChannelId, textChannelId))
+        self.__wake()
+
+    def take(self, guildId: int, createChannelId: int):
+        # the oldest ready set, or None when the pool is empty. the pool is refilled behind it.
+        ready = self.sets.get((guildId, createChannelId))
+        if not ready:
+            if self.get_size(guildId, createChannelId) > 0:
+                self.missed += 1
+            return None
+        self.taken += 1
+        self.__wake()
+        return ready.popleft()
+
+    def remove(self, guildId: int, channelId: int):
+        # a pooled voice or text channel was deleted by someone else, returns its set
+        for key, ready in self.sets.items():
+            if key[0] != guildId:
+                continue
+            for s in ready:
+                if channelId in s:
+                    ready.remove(s)
+                    self.__wake()
+                    return s
+        return None
+
+    def is_pooled(self, guildId: int, channelId: int):
+        return any(channelId in s for key, ready in self.sets.items() if key[0] == guildId for s in ready)
+
+    def metrics(self):
+        return {
+            "pools": len(self.sizes),
+            "ready": sum(len(r) for r in self.sets.values()),
+            "wanted": sum(self.sizes.values()),
+            "taken": self.taken,
+            "missed": self.missed,
+            "parked": len([ b for b in self.backoff.values() if b[0] > asyncio.get_event_loop().time() ])
+        }
+
+    def __next_job(self):
+        # the pool furthest below its size is filled first, surplus sets are drained after that.
+        # parked pools are skipped, returns (job, seconds until the first parked pool is retried)
+        now = asyncio.get_event_loop().time()
+        retry_in = None
+        def parked(key):
+            nonlocal retry_in
+            backoff = self.backoff.get(key)
+            if backoff is None or backoff[0] <= now:
+                return False
+            wait = backoff[0] - now
+            retry_in = wait if retry_in is None else min(retry_in, wait)
+            return True
+        shortest = None
+        for key, size in self.sizes.items():
+            missing = size - len(self.sets.get(key, ()))
+            if missing > 0 and not parked(key) and (shortest is None or missing > shortest[1]):
+                shortest = (key, missing)
+        if shortest:
+            return ("fill", shortest[0]), retry_in
+        for key, ready in self.sets.items():
+            if len(ready) > self.sizes.get(key, 0) and not parked(key):
+                return ("drain", key), retry_in
+        return None, retry_in
+
+    def __park(self, key):
+        previous = self.backoff.get(key)
+        # failures like a missing permission or a full category rarely clear within seconds
+        delay = min(self.max_backoff, previous[1] * 2) if previous else min(self.max_backoff, max(30.0, 1 / self.rate))
+        self.backoff[key] = (asyncio.get_event_loop().time() + delay, delay)
+        print(f"[WARNING] [channelpool.ChannelPool] [guild:{key[0]}] Pool of create channel {key[1]} failed, parked for {delay:.0f} seconds")
+
+    async def __acquire(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            now = loop.time()
+            self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    async def __run(self):
+        while True:
+            job, retry_in = self.__next_job()
+            if job is None:
+                self._wake.clear()
+                try:
+                    # without parked pools there is nothing to do until a pool changes
+                    await asyncio.wait_for(self._wake.wait(), retry_in)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            action, key = job
+            await self.__acquire()
+            try:
+                if action == "fill":
+                    created = await self.fill_callback(key[0], key[1])
+                    if created:
+                        self.sets.setdefault(key, deque()).append(created)
+                        self.backoff.pop(key, None)
+                    else:
+                        self.__park(key)
+                else:
+                    ready = self.sets.get(key)
+                    if ready and len(ready) > self.sizes.get(key, 0):
+                        voice_id, text_id = ready.pop()
+                        await self.drain_callback(key[0], voice_id, text_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as ex:
+                print(ex)
+                traceback.print_exc()
+                self.__park(key)
@@ -0,0 +1,169 @@
+import asyncio
+import traceback
+
+from . import settings
+
+class GuildChannels():
+    # the tracked channel sets of one guild, indexed every way the cogs look them up
+    def __init__(self):
+        # voice_id -> owner_id
+        self.voice_owner = {}
+        # voice_id -> text_id
+        self.voice_text = {}
+        # text_id -> voice_id
+        self.text_voice = {}
+        # text_id -> owner_id
+        self.text_owner = {}
+        # owner_id -> set of voice_ids
+        self.owner_voice = {}
+
+    def add_voice(self, ownerId: int, voiceChannelId: int):
+        self.remove_voice(voiceChannelId)
+        self.voice_owner[voiceChannelId] = ownerId
+        self.owner_voice.setdefault(ownerId, set()).add(voiceChannelId)
+    def add_text(self, ownerId: int, voiceChannelId: int, textChannelId: int):
+        self.remove_text(textChannelId)
+        self.voice_text[voiceChannelId] = textChannelId
+        self.text_voice[textChannelId] = voiceChannelId
+        self.text_owner[textChannelId] = ownerId
+    def remove_voice(self, voiceChannelId: int):
+        owner_id = self.voice_owner.pop(voiceChannelId, None)
+        if owner_id is not None:
+            owned = self.owner_voice.get(owner_id)
+            if owned is not None:
+                owned.discard(voiceChannelId)
+                if not owned:
+                    self.owner_voice.pop(owner_id, None)
+    def remove_text(self, textChannelId: int):
+        voice_id = self.text_voice.pop(textChannelId, None)
+        self.text_owner.pop(textChannelId, None)
+        if voice_id is not None and self.voice_text.get(voice_id) == textChannelId:
+            self.voice_text.pop(voice_id, None)
+    def set_owner(self, voiceChannelId: int, ownerId: int, newOwnerId: int):
+        # mirrors the provider, which only moves rows still owned by ownerId
+        if self.voice_owner.get(voiceChannelId) == ownerId:
+            self.add_voice(newOwnerId, voiceChannelId)
+        text_id = self.voice_text.get(voiceChannelId)
+        if text_id is not None and self.text_owner.get(text_id) == ownerId:
+            self.text_owner[text_id] = newOwnerId
+
+class TrackedChannelRegistry():
+    # In-process registry of the tracked voice/text channel sets. Each guild is loaded once
+    # from get_tracked_channels_for_guild, after that lookups are dictionary hits. Writes go
+    # to the database first and are only applied to the registry when the provider returns
+    # True, so a failed write does not leave the registry ahead of the database.
+    # Anything not handled here is passed through to the wrapped provider.
+    def __init__(self, db):
+        self.db = db
+        self.guilds = {}
+        self._locks = {}
+
+    def __getattr__(self, name):
+        return getattr(self.db, name)
+
+    async def warm(self, guildIds: list = None):
+        if hasattr(self.db, "warm"):
+            await self.db.warm(guildIds)
+        for gid in guildIds or []:
+            await self._get_guild(gid)
+
+    def invalidate(self, guildId: int):
+        self.guilds.pop(guildId, None)
+        if hasattr(self.db, "invalidate"):
+            self.db.invalidate(guildId)
+
+    async def _get_guild(self, guildId: int):
+        guild = self.guilds.get(guildId)
+        if guild is not None:
+            return guild
+        lock = self._locks.setdefault(guildId, asyncio.Lock())
+        async with lock:
+            guild = self.guilds.get(guildId)
+            if guild is not None:
+                return guild
+            try:
+                tracked = await self.db.get_tracked_channels_for_guild(guildId=guildId)
+                if tracked is None:
+                    # the provider failed, answer from an empty set without caching it
+                    return GuildChannels()
+                guild = GuildChannels()
+                for v in tracked.voice_channels:
+                    guild.add_voice(v.owner_id, v.voice_channel_id)
+                for t in tracked.text_channels:
+                    guild.add_text(t.owner_id, t.voice_channel_id, t.text_channel_id)
+                self.guilds[guildId] = guild
+                return guild
+            except Exception as ex:
+                print(ex)
+                traceback.print_exc()
+                return GuildChannels()
+
+    async def get_tracked_voice_channel_ids(self, guildId: int):
+        guild = await self._get_guild(guildId)
+        return list(guild.voice_owner.keys())
+    async def get_text_channel_id(self, guildId: int, voiceChannelId: int):
+        guild = await self._get_guild(guildId)
+        return guild.voice_text.get(voiceChannelId)
+    async def get_voice_channel_id_from_text_channel(self, guildId: int, textChannelId: int):
+        guild = await self._get_guild(guildId)
+        return guild.text_voice.get(textChannelId)
+    async def get_channel_owner_id(self, guildId: int, channelId: int):
+        guild = await self._get_guild(guildId)
+        owner_id = guild.voice_owner.get(channelId)
+        if owner_id is None:
+            owner_id = guild.text_owner.get(channelId)
+        return owner_id
+    async def get_tracked_channel_owner(self, guildId: int, voiceChannelId: int):
+        guild = await self._get_guild(guildId)
+        return guild.voice_owner.get(voiceChannelId)
+    async def get_tracked_voice_channel_id_by_owner(self, guildId: int, ownerId: int):
+        guild = await self._get_guild(guildId)
+        return set(guild.owner_voice.get(ownerId, set()))
+    async def is_tracked_channel_owner(self, guildId: int, ownerId: int, voiceChannelId: int):
+        guild = await self._get_guild(guildId)
+        return guild.voice_owner.get(voiceChannelId) == ownerId
+    async def get_tracked_channels_for_guild(self, guildId: int):
+        guild = await self._get_guild(guildId)
+        voice_channels = [ settings.TrackedVoiceChannel(guildId=guildId, ownerId=o, voiceChannelId=v) for v, o in guild.voice_owner.items() ]
+        text_channels = [ settings.TrackedTextChannel(guildId=guildId, ownerId=guild.text_owner[t], voiceChannelId=v, textChannelId=t) for t, v in guild.text_voice.items() ]
+        return settings.TrackedChannels(voiceChannels=voice_channels, textChannels=text_channels)
+
+    async def track_new_channel_set(self, guildId: int, ownerId: int, voiceChannelId: int, textChannelId: int):
+        guild = await self._get_guild(guildId)
+        result = await self.db.track_new_channel_set(guildId=guildId, ownerId=ownerId, voiceChannelId=voiceChannelId, textChannelId=textChannelId)
+        if result:
+            guild.add_voice(ownerId, voiceChannelId)
+            guild.add_text(ownerId, voiceChannelId, textChannelId)
+        return result
+    async def track_new_voice_channel(self, guildId: int, ownerId: int, voiceChannelId: int):
+        guild = await self._get_guild(guildId)
+        result = await self.db.track_new_voice_channel(guildId=guildId, ownerId=ownerId, voiceChannelId=voiceChannelId)
+        if result:
+            guild.add_voice(ownerId, voiceChannelId)
+        return result
+    async def add_tracked_text_channel(self, guildId: int, ownerId: int, voiceChannelId: int, textChannelId: int):
+        guild = await self._get_guild(guildId)
+        result = await self.db.add_tracked_text_channel(guildId=guildId, ownerId=ownerId, voiceChannelId=voiceChannelId, textChannelId=textChannelId)
+        if result:
+            guild.add_text(ownerId, voiceChannelId, textChannelId)
+        return result
+    async def delete_tracked_text_channel(self, guildId: int, voiceChannelId: int, textChannelId: int):
+        guild = await self._get_guild(guildId)
+        try:
+            return await self.db.delete_tracked_text_channel(guildId=guildId, voiceChannelId=voiceChannelId, textChannelId=textChannelId)
+        finally:
+            guild.remove_text(textChannelId)
+    async def clean_tracked_channels(self, guildId: int, voiceChannelId: int, textChannelId: int):
+        guild = await self._get_guild(guildId)
+        try:
+            return await self.db.clean_tracked_channels(guildId, voiceChannelId, textChannelId)
+        finally:
+            # the channels are gone from discord, drop them even if the delete failed
+            guild.remove_voice(voiceChannelId)
+            guild.remove_text(textChannelId)
+    async def update_tracked_channel_owner(self, guildId: int, voiceChannelId: int, ownerId: int, newOwnerId: int):
+        guild = await self._get_guild(guildId)
+        result = await self.db.update_tracked_channel_owner(guildId=guildId, voiceChannelId=voiceChannelId, ownerId=ownerId, newOwnerId=newOwnerId)
+        if result:
+            guild.set_owner(voiceChannelId, ownerId, newOwnerId)
+        return result
@@ -1,5 +1,8 @@
 
 from traceback import print_exc
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
 
 class Database():
 
@@ -75,12 +78,22 @@ class Database():
         pass
     def track_new_channel_set(self, guildId, ownerId, voiceChannelId, textChannelId):
         pass
+    def set_guild_create_channel_pool_size(self, guildId, createChannelId, poolSize):
+        pass
+    def get_pooled_channel_sets(self, guildId):
+        pass
+    def insert_pooled_channel_set(self, guildId, createChannelId, voiceChannelId, textChannelId):
+        pass
+    def delete_pooled_channel_set(self, guildId, voiceChannelId):
+        pass
     def get_tracked_channels_for_guild(self, guildId):
         pass
     def get_tracked_channel_owner(self, guildId, voiceChannelId):
         pass
     def clean_guild_user_settings(self, guildId):
         pass
+    def get_effective_channel_settings(self, guildId, categoryId, createChannelId, userId):
+        pass
     def get_default_role(self, guildId, categoryId, userId):
         pass
     def set_default_role_for_user(self, guildId, userId, defaultRole):
@@ -102,8 +115,42 @@ class Database():
         pass
     def insert_log(self, guildId: int, level: str, method: str, message: str, stack: str = None):
         pass
+    def insert_logs(self, logs: list):
+        pass
     def clear_log(self, guildId: int):
         pass
+    def prune(self, logRetentionDays: int, historyRetentionDays: int):
+        pass
 
     def UPDATE_SCHEMA(self):
         pass
+
+class ExecutorDatabase():
+    # Awaitable facade over one of the synchronous providers. Every call runs on the
+    # facade's own worker threads, so the coroutines calling it only await the result.
+    # This intentionally does not inherit Database, every attribute is resolved on the
+    # wrapped provider through __getattr__.
+    SYNCHRONOUS = ["UPDATE_SCHEMA", "RESET_MIGRATION"]
+
+    def __init__(self, db: Database, maxWorkers: int = 1, threadNamePrefix: str = "db"):
+        self.db = db
+        self.executor = ThreadPoolExecutor(max_workers=maxWorkers, thread_name_prefix=threadNamePrefix)
+
+    def __getattr__(self, name):
+        attr = getattr(self.db, name)
+        if name in self.SYNCHRONOUS or name.startswith("_") or not callable(attr):
+            return attr
+
+        async def call(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, functools.partial(attr, *args, **kwargs))
+        call.__name__ = name
+        # cache the wrapper so the next lookup does not go through __getattr__
+        setattr(self, name, call)
+        return call
+
+    def shutdown(self):
+        # let queued calls finish before the provider releases its connection
+        self.executor.shutdown(wait=True)
+        if hasattr(self.db, "shutdown"):
+            self.db.shutdown()
@@ -3,3 +3,4 @@ class DatabaseProvider(Enum):
     DEFAULT = 0
     SQLITE = 1
     MONGODB = 2
+    MONGODB_ASYNC = 3
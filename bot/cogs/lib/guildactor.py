@@ -0,0 +1,96 @@
+import asyncio
+import traceback
+
+class GuildActor():
+    # the queue and worker of one guild
+    def __init__(self, guildId: int):
+        self.guild_id = guildId
+        self.queue = asyncio.Queue()
+        self.task = None
+        self.processed = 0
+        self.max_depth = 0
+
+class GuildActors():
+    # State changing work of a guild runs one job at a time, in the order it was submitted,
+    # on the guild's own worker. Workers of different guilds run side by side. A worker exits
+    # once its queue has been empty for idleTimeout seconds and is created again by the next job.
+    # A job must never wait on another job of its own guild, that would wait forever.
+    def __init__(self, idleTimeout: float = 60.0):
+        self.idle_timeout = max(0.1, idleTimeout)
+        self.actors = {}
+        self.processed = 0
+        self.reaped = 0
+
+    def submit(self, guildId: int, func, *args, **kwargs):
+        # queues func(*args, **kwargs) on the guild's worker. the returned future has its result,
+        # callers that only fire the job do not have to await it.
+        actor = self.actors.get(guildId)
+        if actor is None:
+            actor = GuildActor(guildId)
+            self.actors[guildId] = actor
+        future = asyncio.get_event_loop().create_future()
+        future.add_done_callback(self.__retrieve)
+        actor.queue.put_nowait((func, args, kwargs, future))
+        actor.max_depth = max(actor.max_depth, actor.queue.qsize())
+        if actor.task is None:
+            actor.task = asyncio.ensure_future(self.__run(actor))
+        return future
+
+    def depth(self, guildId: int):
+        actor = self.actors.get(guildId)
+        return actor.queue.qsize() if actor else 0
+
+    def metrics(self):
+        guilds = {}
+        for guild_id, actor in self.actors.items():
+            guilds[guild_id] = { "depth": actor.queue.qsize(), "max_depth": actor.max_depth, "processed": actor.processed }
+        return {
+            "actors": len(guilds),
+            "queued": sum(g["depth"] for g in guilds.values()),
+            "max_depth": max([ g["max_depth"] for g in guilds.values() ], default=0),
+            "processed": self.processed,
+            "reaped": self.reaped,
+            "guilds": guilds
+        }
+
+    def stop(self):
+        for actor in list(self.actors.values()):
+            if actor.task:
+                actor.task.cancel()
+            while not actor.queue.empty():
+                future = actor.queue.get_nowait()[3]
+                future.cancel()
+        self.actors.clear()
+
+    async def __run(self, actor: GuildActor):
+        while True:
+            try:
+                func, args, kwargs, future = await asyncio.wait_for(actor.queue.get(), self.idle_timeout)
+            except asyncio.TimeoutError:
+                # nothing can be queued between the check and the removal, there is no await
+                if actor.queue.empty():
+                    if self.actors.get(actor.guild_id) is actor:
+                        del self.actors[actor.guild_id]
+                    self.reaped += 1
+                    return
+                continue
+            try:
+                result = await func(*args, **kwargs)
+                if not future.done():
+                    future.set_result(result)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as ex:
+                print(ex)
+                traceback.print_exc()
+                if not future.done():
+                    future.set_exception(ex)
+            actor.processed += 1
+            self.processed += 1
+
+    @staticmethod
+    def __retrieve(future):
+        # errors are printed by the worker, this keeps unawaited futures from warning again
+        if not future.cancelled():
+            future.exception()
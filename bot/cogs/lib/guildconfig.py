@@ -0,0 +1,326 @@
+import traceback
+
+from . import settings
+
+class GuildConfigCache():
+    # Write-through cache of the guild configuration (guild settings, create channels and
+    # category settings). Reads are answered from memory after the first load, writes go
+    # to the database first and then drop the cached entry so the next read reloads it.
+    # Anything not cached here is passed through to the wrapped provider.
+    DEFAULT_PREFIX = "."
+
+    def __init__(self, db):
+        self.db = db
+        # guild_id -> GuildSettings, None when the guild has no settings saved
+        self.guild_settings = {}
+        # guild_id -> { create_channel_id: GuildCategoryChannel }
+        self.create_channels = {}
+        # guild_id -> set of create channel ids, for the membership test on every voice event
+        self.create_channel_ids = {}
+        # (guild_id, category_id) -> GuildCategorySettings, None when the category has no settings
+        self.category_settings = {}
+        # guild_id -> { (category_id, create_channel_id, user_id): EffectiveChannelSettings }
+        self.effective_settings = {}
+        # guild_id -> command prefix
+        self.prefixes = {}
+        # guild_id -> frozenset of the ids of the roles matching the admin_role setting, a name or an id
+        self.admin_role_ids = {}
+        # guild_id -> { member_id: is in an admin role }
+        self.admin_members = {}
+        # first character of every prefix in use. None until warmed, then a message starting
+        # with anything else can not be a command in any guild.
+        self.prefix_chars = None
+
+    def __getattr__(self, name):
+        return getattr(self.db, name)
+
+    async def warm(self, guildIds: list = None):
+        # bulk load everything in three queries. guilds the bot is in that have nothing saved
+        # are cached as empty so they do not fall through to the database on the first event.
+        # nothing is cached unless all three succeed, reads then go to the database instead.
+        try:
+            guild_settings = { gid: None for gid in guildIds or [] }
+            create_channels = { gid: {} for gid in guildIds or [] }
+            create_channel_ids = { gid: set() for gid in guildIds or [] }
+            category_settings = {}
+
+            # the providers return None when a query failed
+            all_guild_settings = await self.db.get_all_guild_settings()
+            if all_guild_settings is None:
+                raise Exception("Unable to load the guild settings")
+            prefix_chars = { self.DEFAULT_PREFIX[0] }
+            for gs in all_guild_settings:
+                guild_settings[gs.guild_id] = gs
+                if gs.prefix:
+                    prefix_chars.add(gs.prefix[0])
+
+            all_create_channels = await self.db.get_all_from_guild_table()
+            if all_create_channels is None:
+                raise Exception("Unable to load the create channels")
+            for r in all_create_channels:
+                channel = settings.GuildCategoryChannel(ownerId=r['ownerID'], categoryId=r['voiceCategoryID'], channelId=r['voiceChannelID'], useStage=r['useStage'], poolSize=r.get('poolSize', 0))
+                create_channels.setdefault(r['guildID'], {})[channel.channel_id] = channel
+                create_channel_ids.setdefault(r['guildID'], set()).add(channel.channel_id)
+
+            all_category_settings = await self.db.get_all_from_guild_category_settings_table()
+            if all_category_settings is None:
+                raise Exception("Unable to load the category settings")
+            for r in all_category_settings:
+                category_settings[(r['guildID'], r['voiceCategoryID'])] = settings.GuildCategorySettings(guildId=r['guildID'], categoryId=r['voiceCategoryID'], channelLimit=r['channelLimit'], channelLocked=r['channelLocked'], bitrate=r['bitrate'], defaultRole=r['defaultRole'])
+
+            self.guild_settings.update(guild_settings)
+            self.create_channels.update(create_channels)
+            self.create_channel_ids.update(create_channel_ids)
+            self.category_settings.update(category_settings)
+            self.prefix_chars = prefix_chars
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+
+    def invalidate(self, guildId: int):
+        self.guild_settings.pop(guildId, None)
+        self.prefixes.pop(guildId, None)
+        self.invalidate_admin(guildId)
+        self.effective_settings.pop(guildId, None)
+        self.invalidate_create_channels(guildId)
+        for key in [k for k in self.category_settings if k[0] == guildId]:
+            self.category_settings.pop(key, None)
+    def invalidate_guild_settings(self, guildId: int):
+        self.guild_settings.pop(guildId, None)
+        self.prefixes.pop(guildId, None)
+        self.invalidate_admin(guildId)
+        self.effective_settings.pop(guildId, None)
+    def invalidate_admin(self, guildId: int, memberId: int = None):
+        # a member's roles changed, only their answer is dropped. otherwise the roles are resolved again.
+        if memberId is not None:
+            self.admin_members.get(guildId, {}).pop(memberId, None)
+            return
+        self.admin_role_ids.pop(guildId, None)
+        self.admin_members.pop(guildId, None)
+    def invalidate_create_channels(self, guildId: int):
+        self.create_channels.pop(guildId, None)
+        self.create_channel_ids.pop(guildId, None)
+        self.effective_settings.pop(guildId, None)
+    def invalidate_category_settings(self, guildId: int, categoryId: int):
+        self.category_settings.pop((guildId, categoryId), None)
+        self.effective_settings.pop(guildId, None)
+    def invalidate_user_settings(self, guildId: int, userId: int = None):
+        if userId is None:
+            self.effective_settings.pop(guildId, None)
+            return
+        resolved = self.effective_settings.get(guildId, {})
+        for key in [k for k in resolved if k[2] == userId]:
+            resolved.pop(key, None)
+
+    async def get_guild_settings(self, guildId: int):
+        if guildId in self.guild_settings:
+            return self.guild_settings[guildId]
+        result = await self.db.get_guild_settings(guildId)
+        self.guild_settings[guildId] = result
+        return result
+
+    def could_be_command(self, content: str):
+        # mentions start with "<", they are always allowed as a prefix
+        if not content:
+            return False
+        return self.prefix_chars is None or content[0] == "<" or content[0] in self.prefix_chars
+
+    def add_prefix_char(self, prefix: str):
+        # added before the write, a message with the new prefix must not be rejected
+        if prefix and self.prefix_chars is not None:
+            self.prefix_chars.add(prefix[0])
+
+    async def get_guild_prefix(self, guildId: int):
+        prefix = self.prefixes.get(guildId)
+        if prefix is not None:
+            return prefix
+        guild_settings = await self.get_guild_settings(guildId)
+        prefix = self.DEFAULT_PREFIX
+        if guild_settings and guild_settings.prefix:
+            prefix = guild_settings.prefix
+        self.prefixes[guildId] = prefix
+        self.add_prefix_char(prefix)
+        return prefix
+
+    async def get_admin_role_ids(self, guild):
+        role_ids = self.admin_role_ids.get(guild.id)
+        if role_ids is not None:
+            return role_ids
+        role_ids = frozenset()
+        guild_settings = await self.get_guild_settings(guild.id)
+        if guild_settings and guild_settings.admin_role:
+            admin_role = guild_settings.admin_role
+            role_ids = frozenset(r.id for r in guild.roles if r.id == admin_role or r.name == admin_role)
+        self.admin_role_ids[guild.id] = role_ids
+        return role_ids
+
+    async def is_admin_member(self, guild, member):
+        members = self.admin_members.setdefault(guild.id, {})
+        result = members.get(member.id)
+        if result is None:
+            role_ids = await self.get_admin_role_ids(guild)
+            result = any(r.id in role_ids for r in member.roles)
+            members[member.id] = result
+        return result
+
+    async def _get_create_channels(self, guildId: int):
+        if guildId in self.create_channels:
+            return self.create_channels[guildId]
+        result = await self.db.get_guild_create_channel_settings(guildId=guildId)
+        if result is None:
+            # the provider failed, do not cache the miss
+            return {}
+        channels = { c.channel_id: c for c in result.channels }
+        self.create_channels[guildId] = channels
+        self.create_channel_ids[guildId] = set(channels.keys())
+        return channels
+
+    async def get_guild_create_channels(self, guildId: int):
+        if guildId not in self.create_channel_ids:
+            await self._get_create_channels(guildId)
+        return self.create_channel_ids.get(guildId, set())
+
+    async def get_guild_create_channel_settings(self, guildId: int):
+        channels = await self._get_create_channels(guildId)
+        result = settings.GuildCreateChannelSettings(guildId=guildId)
+        result.channels = list(channels.values())
+        return result
+
+    async def get_use_stage_on_create(self, guildId: int, channelId: int, categoryId: int):
+        channels = await self._get_create_channels(guildId)
+        channel = channels.get(channelId)
+        if channel and channel.category_id == categoryId:
+            return channel.use_stage
+        return None
+
+    async def get_guild_category_settings(self, guildId: int, categoryId: int):
+        key = (guildId, categoryId)
+        if key in self.category_settings:
+            return self.category_settings[key]
+        result = await self.db.get_guild_category_settings(guildId=guildId, categoryId=categoryId)
+        self.category_settings[key] = result
+        return result
+
+    async def get_effective_channel_settings(self, guildId: int, categoryId: int, createChannelId: int, userId: int):
+        resolved = self.effective_settings.setdefault(guildId, {})
+        key = (categoryId, createChannelId, userId)
+        if key in resolved:
+            return resolved[key]
+        result = await self.db.get_effective_channel_settings(guildId=guildId, categoryId=categoryId, createChannelId=createChannelId, userId=userId)
+        if result is not None:
+            resolved[key] = result
+        return result
+
+    async def get_default_role(self, guildId: int, categoryId: int, userId: int):
+        # only the user settings need a round trip, the guild and category settings are cached
+        user_settings = await self.db.get_user_settings(guildId=guildId, userId=userId)
+        if user_settings:
+            return user_settings.default_role
+        category_settings = await self.get_guild_category_settings(guildId=guildId, categoryId=categoryId)
+        if category_settings:
+            return category_settings.default_role
+        guild_settings = await self.get_guild_settings(guildId)
+        if guild_settings:
+            return guild_settings.default_role
+        return None
+
+    async def set_guild_settings_prefix(self, guildId: int, prefix: str):
+        try:
+            self.add_prefix_char(prefix)
+            return await self.db.set_guild_settings_prefix(guildId, prefix)
+        finally:
+            self.invalidate_guild_settings(guildId)
+    async def set_guild_settings_language(self, guildId: int, language: str):
+        try:
+            return await self.db.set_guild_settings_language(guildId, language)
+        finally:
+            self.invalidate_guild_settings(guildId)
+    async def insert_or_update_guild_settings(self, guildId: int, prefix: str, defaultRole: int, adminRole: int, language: str):
+        try:
+            self.add_prefix_char(prefix)
+            return await self.db.insert_or_update_guild_settings(guildId=guildId, prefix=prefix, defaultRole=defaultRole, adminRole=adminRole, language=language)
+        finally:
+            self.invalidate_guild_settings(guildId)
+    async def insert_guild_settings(self, guildId: int, prefix: str, defaultRole: int, adminRole: int, language: str):
+        try:
+            self.add_prefix_char(prefix)
+            return await self.db.insert_guild_settings(guildId=guildId, prefix=prefix, defaultRole=defaultRole, adminRole=adminRole, language=language)
+        finally:
+            self.invalidate_guild_settings(guildId)
+    async def update_guild_settings(self, guildId: int, prefix: str, defaultRole: int, adminRole: int, language: str):
+        try:
+            self.add_prefix_char(prefix)
+            return await self.db.update_guild_settings(guildId=guildId, prefix=prefix, defaultRole=defaultRole, adminRole=adminRole, language=language)
+        finally:
+            self.invalidate_guild_settings(guildId)
+
+    async def set_guild_category_settings(self, guildId: int, categoryId: int, channelLimit: int, channelLocked: bool, bitrate: int, defaultRole: int):
+        try:
+            return await self.db.set_guild_category_settings(guildId=guildId, categoryId=categoryId, channelLimit=channelLimit, channelLocked=channelLocked, bitrate=bitrate, defaultRole=defaultRole)
+        finally:
+            self.invalidate_category_settings(guildId, categoryId)
+    async def set_default_role_for_category(self, guildId: int, categoryId: int, defaultRole: int):
+        try:
+            return await self.db.set_default_role_for_category(guildId=guildId, categoryId=categoryId, defaultRole=defaultRole)
+        finally:
+            self.invalidate_category_settings(guildId, categoryId)
+
+    async def insert_guild_create_channel_settings(self, guildId: int, createChannelId: int, categoryId: int, ownerId: int, useStage: bool):
+        try:
+            return await self.db.insert_guild_create_channel_settings(guildId=guildId, createChannelId=createChannelId, categoryId=categoryId, ownerId=ownerId, useStage=useStage)
+        finally:
+            self.invalidate_create_channels(guildId)
+    async def update_guild_create_channel_settings(self, guildId: int, createChannelId: int, categoryId: int, ownerId: int, useStage: bool):
+        try:
+            return await self.db.update_guild_create_channel_settings(guildId=guildId, createChannelId=createChannelId, categoryId=categoryId, ownerId=ownerId, useStage=useStage)
+        finally:
+            self.invalidate_create_channels(guildId)
+    async def set_guild_create_channel_pool_size(self, guildId: int, createChannelId: int, poolSize: int):
+        try:
+            return await self.db.set_guild_create_channel_pool_size(guildId=guildId, createChannelId=createChannelId, poolSize=poolSize)
+        finally:
+            self.invalidate_create_channels(guildId)
+    async def get_create_channel(self, guildId: int, createChannelId: int):
+        channels = await self._get_create_channels(guildId)
+        return channels.get(createChannelId)
+    async def delete_guild_create_channel(self, guildId: int, channelId: int, categoryId: int):
+        try:
+            return await self.db.delete_guild_create_channel(guildId=guildId, channelId=channelId, categoryId=categoryId)
+        finally:
+            self.invalidate_create_channels(guildId)
+
+    async def update_user_channel_name(self, guildId: int, userId: int, channelName: str):
+        try:
+            return await self.db.update_user_channel_name(guildId=guildId, userId=userId, channelName=channelName)
+        finally:
+            self.invalidate_user_settings(guildId, userId)
+    async def update_user_limit(self, guildId: int, userId: int, limit: int = 0):
+        try:
+            return await self.db.update_user_limit(guildId=guildId, userId=userId, limit=limit)
+        finally:
+            self.invalidate_user_settings(guildId, userId)
+    async def update_user_bitrate(self, guildId: int, userId: int, bitrate: int = 8):
+        try:
+            return await self.db.update_user_bitrate(guildId=guildId, userId=userId, bitrate=bitrate)
+        finally:
+            self.invalidate_user_settings(guildId, userId)
+    async def insert_user_settings(self, guildId: int, userId: int, channelName: str, channelLimit: int, bitrate: int, defaultRole: int, autoGame: bool = False):
+        try:
+            return await self.db.insert_user_settings(guildId=guildId, userId=userId, channelName=channelName, channelLimit=channelLimit, bitrate=bitrate, defaultRole=defaultRole, autoGame=autoGame)
+        finally:
+            self.invalidate_user_settings(guildId, userId)
+    async def set_default_role_for_user(self, guildId: int, userId: int, defaultRole: int):
+        try:
+            return await self.db.set_default_role_for_user(guildId=guildId, userId=userId, defaultRole=defaultRole)
+        finally:
+            self.invalidate_user_settings(guildId, userId)
+    async def clean_user_settings(self, guildId: int, userId: int):
+        try:
+            return await self.db.clean_user_settings(guildId=guildId, userId=userId)
+        finally:
+            self.invalidate_user_settings(guildId, userId)
+    async def clean_guild_user_settings(self, guildId: int):
+        try:
+            return await self.db.clean_guild_user_settings(guildId=guildId)
+        finally:
+            self.invalidate_user_settings(guildId)
@@ -0,0 +1,23 @@
+import contextvars
+import functools
+
+# the handler the current task is running, used as the method of its log records. each event
+# and command runs in its own task with its own copy of the context, so handlers never see
+# each other's names.
+_current_method = contextvars.ContextVar("log_method", default="unknown")
+
+def log_method(func):
+    # tags everything the coroutine logs, including the helpers it calls, with
+    # module.function. the name is built once here instead of walking the stack per call.
+    name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        token = _current_method.set(name)
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            _current_method.reset(token)
+    return wrapper
+
+def current_method():
+    return _current_method.get()
@@ -1,17 +1,237 @@
-from . import mongo
+import os
+import threading
+import datetime
+import traceback
+import logging
+import logging.handlers
+from collections import deque
+
 from . import loglevel
+from . import utils
+from . import dbprovider
 
-class Log():
+class LogSink():
+    # a destination for log records with its own minimum level. queued sinks are written in
+    # batches from the writer thread, the others are written as soon as the record is logged.
+    queued = True
     def __init__(self, minimumLogLevel: loglevel.LogLevel = loglevel.LogLevel.DEBUG):
-        self.db = mongo.MongoDatabase()
         self.minimum_log_level = minimumLogLevel
+    def write(self, records: list):
+        pass
+    def close(self):
         pass
+
+class NullSink(LogSink):
+    queued = False
+
+class StdoutSink(LogSink):
+    queued = False
+    def write(self, records: list):
+        for r in records:
+            print(f"[{r['level']}] [{r['method']}] [guild:{str(r['guild_id'])}] {r['message']}")
+            if r['stack_trace']:
+                print(r['stack_trace'])
+
+class RotatingFileSink(LogSink):
+    def __init__(self, minimumLogLevel: loglevel.LogLevel, path: str, maxBytes: int = 10485760, backupCount: int = 5):
+        super().__init__(minimumLogLevel)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.handler = logging.handlers.RotatingFileHandler(path, maxBytes=maxBytes, backupCount=backupCount, encoding="UTF-8")
+    def write(self, records: list):
+        lines = []
+        for r in records:
+            created = r['created_at'].isoformat(timespec="milliseconds")
+            lines.append(f"{created} [{r['level']}] [{r['method']}] [guild:{str(r['guild_id'])}] {r['message']}")
+            if r['stack_trace']:
+                lines.append(r['stack_trace'].rstrip())
+        # one emit per batch, the handler checks for rollover once per emit
+        self.handler.emit(logging.makeLogRecord({ "msg": "\n".join(lines) }))
+    def close(self):
+        self.handler.close()
+
+class SqliteSink(LogSink):
+    def __init__(self, minimumLogLevel: loglevel.LogLevel):
+        super().__init__(minimumLogLevel)
+        from . import sqlite
+        # a connection of its own, the writer thread never waits on the database worker
+        self.db = sqlite.SqliteDatabase()
+    def write(self, records: list):
+        self.db.insert_logs(records)
+    def close(self):
+        self.db.shutdown()
+
+class MongoSink(LogSink):
+    def __init__(self, minimumLogLevel: loglevel.LogLevel, pool = None):
+        super().__init__(minimumLogLevel)
+        # imported here so deployments without mongo never load pymongo
+        from . import mongo
+        self.db = mongo.MongoDatabase(pool=pool)
+    def write(self, records: list):
+        self.db.insert_logs(records)
+
+def create_sinks(settings, minimumLogLevel: loglevel.LogLevel, pool = None):
+    # VCB_LOG_SINKS is a comma separated list of sink[:LEVEL]. without it the logs go to
+    # stdout and to the database of the configured provider.
+    names = [ s.strip() for s in (settings.log_sinks or "").split(",") if s.strip() ]
+    if not names:
+        names = ["stdout", "sqlite" if settings.db_provider == dbprovider.DatabaseProvider.SQLITE else "mongo"]
+    sinks = []
+    for n in names:
+        name, _, level_name = n.partition(":")
+        name = name.lower()
+        level = minimumLogLevel
+        if level_name:
+            try:
+                level = loglevel.LogLevel[level_name.upper()]
+            except KeyError:
+                print(f"[WARNING] [logger.create_sinks] [guild:0] Unknown log level '{level_name}' for sink '{name}', using {minimumLogLevel.name}")
+        if name == "stdout":
+            sinks.append(StdoutSink(level))
+        elif name == "file":
+            sinks.append(RotatingFileSink(level, path=settings.log_file, maxBytes=settings.log_file_max_bytes, backupCount=settings.log_file_backup_count))
+        elif name == "sqlite":
+            sinks.append(SqliteSink(level))
+        elif name == "mongo":
+            if not settings.db_url:
+                print(f"[WARNING] [logger.create_sinks] [guild:0] VCB_MONGODB_URL is not set, the mongo log sink is disabled")
+                continue
+            sinks.append(MongoSink(level, pool=pool))
+        elif name == "null":
+            sinks.append(NullSink(level))
+        else:
+            print(f"[WARNING] [logger.create_sinks] [guild:0] Unknown log sink '{name}'")
+    return sinks
+
+class Log():
+    # Records are handed to every sink whose minimum level they meet. Stdout is written right
+    # away, the other sinks are fed by a background thread that drains the queue in batches,
+    # when the batch is full or the flush interval passes, in the order they were logged. The
+    # queue is bounded, when it is full the oldest record of the lowest level is dropped, so
+    # debug output goes first.
+    def __init__(self, minimumLogLevel: loglevel.LogLevel = loglevel.LogLevel.DEBUG, sinks: list = None, queueSize: int = 10000, batchSize: int = 100, flushInterval: float = 5.0):
+        self.minimum_log_level = minimumLogLevel
+        if sinks is None:
+            sinks = [StdoutSink(minimumLogLevel)]
+        self.sinks = [ s for s in sinks if s.queued ]
+        self.direct_sinks = [ s for s in sinks if not s.queued and not isinstance(s, NullSink) ]
+        # records below every sink's level are skipped before a record is even built
+        self.queued_level = min([ s.minimum_log_level.value for s in self.sinks ], default=None)
+        self.lowest_level = min([ s.minimum_log_level.value for s in self.sinks + self.direct_sinks ], default=None)
+        self.queue_size = max(1, queueSize)
+        self.batch_size = max(1, batchSize)
+        self.flush_interval = flushInterval
+        # [level value, record] entries in arrival order. each entry is also in the deque of its
+        # level, so dropping the lowest level on overflow does not scan the records. a dropped
+        # entry's record is set to None and the writer skips it.
+        self.queue = deque()
+        self.queues = { level.value: deque() for level in loglevel.LogLevel }
+        self.count = 0
+        self.dropped = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = None
+        if self.sinks:
+            self._thread = threading.Thread(target=self.__run, name="log-writer", daemon=True)
+            self._thread.start()
+        pass
+
     def __write(self, guildId: int, level: loglevel.LogLevel, method: str, message: str, stackTrace: str = None):
-        print(f"[{level.name}] [{method}] [guild:{str(guildId)}] {message}")
-        if stackTrace:
-            print(stackTrace)
-        if level >= self.minimum_log_level:
-            self.db.insert_log(guildId=guildId, level=level, method=method, message=message, stackTrace=stackTrace)
+        if self.lowest_level is None or level.value < self.lowest_level:
+            return
+        record = {
+            "guild_id": guildId,
+            "timestamp": utils.get_timestamp(),
+            "level": level.name,
+            "method": method,
+            "message": message,
+            "stack_trace": stackTrace,
+            "created_at": datetime.datetime.utcnow()
+        }
+        for s in self.direct_sinks:
+            if level.value >= s.minimum_log_level.value:
+                s.write([record])
+        if self.queued_level is not None and level.value >= self.queued_level:
+            self.__enqueue(level, record)
+
+    def __enqueue(self, level: loglevel.LogLevel, record: dict):
+        with self._condition:
+            if self._closed:
+                return
+            if self.count >= self.queue_size:
+                lowest = next(l for l in loglevel.LogLevel if self.queues[l.value])
+                if lowest > level:
+                    # everything queued is more important than this record
+                    self.dropped += 1
+                    return
+                self.queues[lowest.value].popleft()[1] = None
+                self.count -= 1
+                self.dropped += 1
+            entry = [level.value, record]
+            self.queue.append(entry)
+            self.queues[level.value].append(entry)
+            self.count += 1
+            if self.count >= self.batch_size:
+                self._condition.notify()
+
+    def __take_batch(self):
+        # (level value, record) pairs, so each sink can filter without parsing the level name
+        # in the order they were logged
+        batch = []
+        while self.queue and len(batch) < self.batch_size:
+            level_value, record = self.queue.popleft()
+            if record is None:
+                # dropped on overflow, already gone from its level's deque
+                continue
+            # the oldest live entry of its level is this one
+            self.queues[level_value].popleft()
+            batch.append((level_value, record))
+        self.count -= len(batch)
+        return batch
+
+    def __run(self):
+        while True:
+            with self._condition:
+                if self.count < self.batch_size and not self._closed:
+                    self._condition.wait(self.flush_interval)
+                batch = self.__take_batch()
+                dropped = self.dropped
+                self.dropped = 0
+                closed = self._closed and self.count == 0
+            if dropped:
+                print(f"[WARNING] [logger.Log] [guild:0] Log queue full, dropped {dropped} records")
+            if batch:
+                for s in self.sinks:
+                    records = [ r for v, r in batch if v >= s.minimum_log_level.value ]
+                    if not records:
+                        continue
+                    try:
+                        s.write(records)
+                    except Exception as ex:
+                        # one failing sink does not keep the batch from the others
+                        print(ex)
+                        traceback.print_exc()
+            if closed and not batch:
+                return
+
+    def flush(self):
+        with self._condition:
+            self._condition.notify()
+
+    def close(self):
+        # writes everything still queued before returning
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread:
+            self._thread.join()
+        for s in self.sinks + self.direct_sinks:
+            try:
+                s.close()
+            except Exception as ex:
+                print(ex)
+                traceback.print_exc()
 
     def debug(self, guildId: int, method: str, message: str, stackTrace: str = None):
         self.__write(guildId=guildId, level=loglevel.LogLevel.DEBUG, method=method, message=message, stackTrace=stackTrace)
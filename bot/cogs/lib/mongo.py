@@ -1,18 +1,22 @@
-from pymongo import MongoClient
 import traceback
 import json
+import datetime
+from pymongo import ASCENDING
 
 # from discord.ext.commands.converter import CategoryChannelConverter
 from . import database
 from . import settings
 from . import utils
 from . import sqlite
+from . import mongopool
 from .mongodb import migration
 
 class MongoDatabase(database.Database):
-    def __init__(self):
+    def __init__(self, pool: mongopool.MongoClientPool = None):
         self.settings = settings.Settings()
-        self.client = None
+        self.pool = pool
+        if self.pool is None:
+            self.pool = mongopool.MongoClientPool(self.settings.db_url, maxPoolSize=self.settings.db_pool_size, minPoolSize=self.settings.db_min_pool_size)
         self.connection = None
         pass
 
@@ -26,6 +30,7 @@ class MongoDatabase(database.Database):
             self.connection.user_settings.delete_many({})
             self.connection.text_channels.delete_many({})
             self.connection.voice_channels.delete_many({})
+            self.connection.channel_sets.delete_many({})
             self.connection.migration.delete_many({})
             print("ALL DATA PURGED")
         except Exception as ex:
@@ -43,7 +48,7 @@ class MongoDatabase(database.Database):
             if not self.connection:
                 self.open()
 
-            migrator = migration.MongoMigration(newDBVersion)
+            migrator = migration.MongoMigration(newDBVersion, pool=self.pool)
             migrator.run()
 
             # setup missing guild category settings...
@@ -58,6 +63,8 @@ class MongoDatabase(database.Database):
                     else:
                         self.set_guild_category_settings(guildId=g['guildID'], categoryId=g['voiceCategoryID'], channelLimit=0, channelLocked=False, bitrate=64, defaultRole="@everyone")
 
+            self.APPLY_RETENTION()
+            self.CHECK_QUERY_PLANS()
         except Exception as ex:
             print(ex)
             traceback.print_exc()
@@ -65,24 +72,106 @@ class MongoDatabase(database.Database):
             if self.connection:
                 self.close()
 
+    def APPLY_RETENTION(self):
+        # the retention comes from the settings, so the indexes are checked on every start
+        # instead of once in a migration
+        try:
+            if not self.connection:
+                self.open()
+            if self.settings.log_capped_size_mb > 0:
+                self._drop_ttl_index("logs")
+                size = self.settings.log_capped_size_mb * 1024 * 1024
+                if "logs" not in self.connection.list_collection_names():
+                    print(f"[mongo.APPLY_RETENTION] Creating logs as a capped collection of {self.settings.log_capped_size_mb}MB")
+                    self.connection.create_collection("logs", capped=True, size=size)
+                    self.connection.logs.create_index([("guild_id", ASCENDING)], name="guild")
+                elif not self.connection.logs.options().get("capped"):
+                    print(f"[mongo.APPLY_RETENTION] Converting logs to a capped collection of {self.settings.log_capped_size_mb}MB")
+                    self.connection.command("convertToCapped", "logs", size=size)
+                    # converting only keeps the _id index
+                    self.connection.logs.create_index([("guild_id", ASCENDING)], name="guild")
+            else:
+                if self.connection.logs.options().get("capped"):
+                    print(f"[mongo.APPLY_RETENTION] logs is a capped collection, drop it to use VCB_LOG_RETENTION_DAYS instead")
+                else:
+                    self._ensure_ttl_index("logs", self.settings.log_retention_days)
+            self._ensure_ttl_index("tracked_channels_history", self.settings.history_retention_days)
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    def _ensure_ttl_index(self, collection: str, days: int):
+        if days <= 0:
+            self._drop_ttl_index(collection)
+            return
+        seconds = days * 24 * 60 * 60
+        index = self.connection[collection].index_information().get("created_at_ttl")
+        if index is None:
+            print(f"[mongo.APPLY_RETENTION] Expiring {collection} after {days} days")
+            self.connection[collection].create_index([("created_at", ASCENDING)], name="created_at_ttl", expireAfterSeconds=seconds)
+        elif index.get("expireAfterSeconds") != seconds:
+            print(f"[mongo.APPLY_RETENTION] Changing {collection} expiry to {days} days")
+            self.connection.command("collMod", collection, index={ "name": "created_at_ttl", "expireAfterSeconds": seconds })
+    def _drop_ttl_index(self, collection: str):
+        if "created_at_ttl" in self.connection[collection].index_information():
+            print(f"[mongo.APPLY_RETENTION] Removing {collection} expiry")
+            self.connection[collection].drop_index("created_at_ttl")
+
+    # the filters the providers run on every event. each one should be answered by an index.
+    QUERY_SHAPES = [
+        ("channel_sets", { "guildID": 0, "voiceID": 0 }),
+        ("channel_sets", { "guildID": 0, "userID": 0 }),
+        ("channel_sets", { "guildID": 0, "channelID": 0 }),
+        ("user_settings", { "guildID": 0, "userID": 0 }),
+        ("category_settings", { "guildID": 0, "voiceCategoryID": 0 }),
+        ("create_channels", { "guildID": 0, "voiceChannelID": 0 }),
+        ("create_channels", { "guildID": 0, "voiceCategoryID": 0, "voiceChannelID": 0 }),
+        ("channel_pools", { "guildID": 0 }),
+        ("guild_settings", { "guild_id": 0 }),
+        ("logs", { "guild_id": 0 })
+    ]
+    def CHECK_QUERY_PLANS(self):
+        # reports any hot query that the server would answer with a collection scan
+        try:
+            if not self.connection:
+                self.open()
+            scans = 0
+            for collection, filter in self.QUERY_SHAPES:
+                plan = self.connection[collection].find(filter).limit(1).explain()
+                stages = self._get_plan_stages(plan.get("queryPlanner", {}).get("winningPlan", {}))
+                if "COLLSCAN" in stages:
+                    scans += 1
+                    print(f"[mongo.CHECK_QUERY_PLANS] COLLECTION SCAN: {collection} {json.dumps(list(filter.keys()))}")
+            if scans == 0:
+                print(f"[mongo.CHECK_QUERY_PLANS] All {len(self.QUERY_SHAPES)} query shapes use an index")
+            return scans
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    def _get_plan_stages(self, plan: dict):
+        stages = []
+        if not plan:
+            return stages
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        if "inputStage" in plan:
+            stages.extend(self._get_plan_stages(plan["inputStage"]))
+        for p in plan.get("inputStages", []):
+            stages.extend(self._get_plan_stages(p))
+        return stages
+
 
     def open(self):
-        if not self.settings.db_url:
-            raise ValueError("VCB_MONGODB_URL is not set")
-        self.client = MongoClient(self.settings.db_url)
-        self.connection = self.client.voicecreate
+        if self.connection is None:
+            self.connection = self.pool.open()
     def close(self):
-        try:
-            if self.client:
-                self.client.close()
-        except Exception as ex:
-            print(ex)
-            traceback.print_exc()
+        # the client is owned by the pool. sockets are returned to it after every
+        # operation, so there is nothing to tear down per call.
+        pass
     def get_tracked_voice_channel_ids(self, guildId):
         try:
             if self.connection is None:
                 self.open()
-            cursor = self.connection.voice_channels.find({"guildID": guildId}, { "voiceID": 1 })
+            cursor = self.connection.channel_sets.find({"guildID": guildId}, { "voiceID": 1 })
             items = [ i['voiceID'] for i in cursor ]
             return items
         except Exception as ex:
@@ -92,9 +181,9 @@ class MongoDatabase(database.Database):
         try:
             if self.connection is None:
                 self.open()
-            result = self.connection.text_channels.find_one({"guildID": guildId, "voiceID": voiceChannelId})
+            result = self.connection.channel_sets.find_one({"guildID": guildId, "voiceID": voiceChannelId}, { "channelID": 1 })
             if result:
-                return result['channelID']
+                return result.get('channelID')
             return None
         except Exception as ex:
             print(ex)
@@ -103,7 +192,7 @@ class MongoDatabase(database.Database):
         try:
             if self.connection is None:
                 self.open()
-            result = self.connection.text_channels.find_one({"guildId": guildId, "channelID": textChannelId})
+            result = self.connection.channel_sets.find_one({"guildID": guildId, "channelID": textChannelId}, { "voiceID": 1 })
             if result:
                 return result['voiceID']
             return None
@@ -114,22 +203,13 @@ class MongoDatabase(database.Database):
         try:
             if self.connection is None:
                 self.open()
-            tracked_voice = self.connection.voice_channels.find_one({ "guildID": guildId, "voiceID": voiceChannelId})
-            if tracked_voice:
-                tracked_text = self.connection.text_channels.find_one({"guildID": guildId, "voiceID": voiceChannelId, "channelID": textChannelId })
-                text_channel_id = None
-                if tracked_text:
-                    text_channel_id = tracked_text['channelID']
-                payload = {
-                    "guild_id": guildId,
-                    "user_id": tracked_voice['userID'],
-                    "text_channel_id": text_channel_id,
-                    "voice_channel_id": tracked_voice['voiceID'],
-                    "timestamp": utils.get_timestamp()
-                }
-                self.connection.tracked_channels_history.insert_one(payload)
-            self.connection.voice_channels.delete_one({"guildID": guildId, "voiceID": voiceChannelId})
-            self.connection.text_channels.delete_one({"guildID": guildId, "channelID": textChannelId})
+            # one delete for the whole set, the removed document is kept as history
+            filter = { "guildID": guildId, "voiceID": voiceChannelId }
+            if textChannelId is not None:
+                filter = { "guildID": guildId, "$or": [ { "voiceID": voiceChannelId }, { "channelID": textChannelId } ] }
+            tracked = self.connection.channel_sets.find_one_and_delete(filter)
+            if tracked:
+                self.connection.tracked_channels_history.insert_one(self.get_channel_set_history(tracked))
         except Exception as ex:
             print(ex)
             traceback.print_exc()
@@ -155,8 +235,7 @@ class MongoDatabase(database.Database):
         try:
             if self.connection is None:
                 self.open()
-            # c.execute("SELECT voiceID FROM voiceChannel WHERE guildID = ? AND userID = ?", (guildId, ownerId,))
-            items = self.connection.voice_channels.find({"guildID": guildId, "userID": ownerId}, {"voiceID": 1})
+            items = self.connection.channel_sets.find({"guildID": guildId, "userID": ownerId}, {"voiceID": 1})
             channel_ids = [item['voiceID'] for item in items]
             return channel_ids
         except Exception as ex:
@@ -166,12 +245,7 @@ class MongoDatabase(database.Database):
         try:
             if self.connection is None:
                 self.open()
-            # c.execute("SELECT userID FROM voiceChannel WHERE guildID = ? AND voiceID = ?", (guildId, channelId,))
-            # c.execute("SELECT userID FROM textChannel WHERE guildID = ? AND channelID = ?", (guildId, channelId,))
-            item = self.connection.voice_channels.find_one({"guildID": guildId, "voiceID": channelId}, {"userID": 1})
-            if item:
-                return int(item['userID'])
-            item = self.connection.text_channels.find_one({"guildID": guildId, "channelID": channelId}, {"userID": 1})
+            item = self.connection.channel_sets.find_one({"guildID": guildId, "$or": [ { "voiceID": channelId }, { "channelID": channelId } ] }, {"userID": 1})
             if item:
                 return int(item['userID'])
             return None
@@ -199,7 +273,7 @@ class MongoDatabase(database.Database):
             if rows:
                 result = settings.GuildCreateChannelSettings(guildId=guildId)
                 for r in rows:
-                    result.channels.append(settings.GuildCategoryChannel(ownerId=(r['ownerID']), categoryId=int(r['voiceCategoryID']), channelId=int(r['voiceChannelID']), useStage=r['useStage']))
+                    result.channels.append(settings.GuildCategoryChannel(ownerId=(r['ownerID']), categoryId=int(r['voiceCategoryID']), channelId=int(r['voiceChannelID']), useStage=r['useStage'], poolSize=r.get('poolSize', 0)))
                 return result
             return None
         except Exception as ex:
@@ -235,6 +309,7 @@ class MongoDatabase(database.Database):
             "voiceChannelID": createChannelId,
             "voiceCategoryID": categoryId,
             "useStage": useStage,
+            "poolSize": 0,
             "timestamp": utils.get_timestamp()
         }
         result = self.connection.create_channels.insert_one(payload)
@@ -445,15 +520,10 @@ class MongoDatabase(database.Database):
         try:
             if self.connection is None:
                 self.open()
-            # c = self.connection.cursor()
-            # c.execute("INSERT INTO textChannel VALUES (?, ?, ?, ?)", (guildId, ownerId, textChannelId, voiceChannelId,))
-            payload = {
-                "guildID": guildId,
-                "userID": ownerId,
-                "channelID": textChannelId,
-                "voiceID": voiceChannelId
-            }
-            self.connection.text_channels.insert_one(payload)
+            self.connection.channel_sets.update_one(
+                { "guildID": guildId, "voiceID": voiceChannelId },
+                { "$set": { "channelID": textChannelId }, "$setOnInsert": { "userID": ownerId, "timestamp": utils.get_timestamp() } },
+                upsert=True)
             return True
         except Exception as ex:
             print(ex)
@@ -463,17 +533,9 @@ class MongoDatabase(database.Database):
         try:
             if self.connection is None:
                 self.open()
-            tracked = self.connection.text_channels.find_one({ "guildID": guildId, "voiceID": voiceChannelId, "channelID": textChannelId })
+            tracked = self.connection.channel_sets.find_one_and_update({ "guildID": guildId, "voiceID": voiceChannelId, "channelID": textChannelId }, { "$set": { "channelID": None } })
             if tracked:
-                payload = {
-                    "guild_id": guildId,
-                    "user_id": tracked['userID'],
-                    "text_channel_id": tracked['channelID'],
-                    "voice_channel_id": tracked['voiceID'],
-                    "timestamp": utils.get_timestamp()
-                }
-                self.connection.tracked_channels_history.insert_one(payload)
-            self.connection.text_channels.delete_one({ "guildID": guildId, "voiceID": voiceChannelId, "channelID": textChannelId })
+                self.connection.tracked_channels_history.insert_one(self.get_channel_set_history(tracked))
         except Exception as ex:
             print(ex)
             traceback.print_exc()
@@ -481,13 +543,10 @@ class MongoDatabase(database.Database):
         try:
             if self.connection is None:
                 self.open()
-            # c.execute("INSERT INTO voiceChannel VALUES (?, ?, ?)", (guildId, ownerId, voiceChannelId,))
-            payload = {
-                "guildID": guildId,
-                "userID": ownerId,
-                "voiceID": voiceChannelId
-            }
-            self.connection.voice_channels.insert_one(payload)
+            self.connection.channel_sets.update_one(
+                { "guildID": guildId, "voiceID": voiceChannelId },
+                { "$set": { "userID": ownerId }, "$setOnInsert": { "channelID": None, "timestamp": utils.get_timestamp() } },
+                upsert=True)
             return True
         except Exception as ex:
             print(ex)
@@ -497,30 +556,67 @@ class MongoDatabase(database.Database):
         try:
             if self.connection is None:
                 self.open()
-            # c.execute("INSERT INTO voiceChannel VALUES (?, ?, ?)", (guildId, ownerId, voiceChannelId,))
-            # c.execute("INSERT INTO textChannel VALUES (?, ?, ?, ?)", (guildId, ownerId, textChannelId, voiceChannelId,))
-            result = self.track_new_voice_channel(guildId=guildId, ownerId=ownerId, voiceChannelId=voiceChannelId)
-            if result:
-                result = self.add_tracked_text_channel(guildId=guildId, ownerId=ownerId, voiceChannelId=voiceChannelId, textChannelId=textChannelId)
-            return result
+            self.connection.channel_sets.update_one(
+                { "guildID": guildId, "voiceID": voiceChannelId },
+                { "$set": { "userID": ownerId, "channelID": textChannelId, "timestamp": utils.get_timestamp() } },
+                upsert=True)
+            return True
         except Exception as ex:
             print(ex)
             traceback.print_exc()
             return False
+    def set_guild_create_channel_pool_size(self, guildId, createChannelId, poolSize: int):
+        try:
+            if self.connection is None:
+                self.open()
+            result = self.connection.create_channels.update_one({ "guildID": guildId, "voiceChannelID": createChannelId }, { "$set": { "poolSize": poolSize } })
+            return result.matched_count > 0
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+            return False
+    def get_pooled_channel_sets(self, guildId):
+        try:
+            if self.connection is None:
+                self.open()
+            rows = self.connection.channel_pools.find({ "guildID": guildId }, { "createChannelID": 1, "voiceID": 1, "channelID": 1 }).sort("timestamp", ASCENDING)
+            return [ { "createChannelID": int(r['createChannelID']), "voiceID": int(r['voiceID']), "channelID": int(r['channelID']) } for r in rows ]
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+            return []
+    def insert_pooled_channel_set(self, guildId, createChannelId, voiceChannelId, textChannelId):
+        try:
+            if self.connection is None:
+                self.open()
+            self.connection.channel_pools.update_one(
+                { "guildID": guildId, "voiceID": voiceChannelId },
+                { "$set": { "createChannelID": createChannelId, "channelID": textChannelId, "timestamp": utils.get_timestamp() } },
+                upsert=True)
+            return True
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+            return False
+    def delete_pooled_channel_set(self, guildId, voiceChannelId):
+        try:
+            if self.connection is None:
+                self.open()
+            self.connection.channel_pools.delete_many({ "guildID": guildId, "voiceID": voiceChannelId })
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
     def get_tracked_channels_for_guild(self, guildId):
         try:
             if self.connection is None:
                 self.open()
-            # c.execute("SELECT voiceID, userID FROM voiceChannel WHERE guildID = ?", (guildId,))
-            # c.execute("SELECT voiceID, channelID, userID FROM textChannel WHERE guildID = ?", (guildId,))
             voice_channels = []
             text_channels = []
-            data = self.connection.voice_channels.find({"guildID": guildId}, { "voiceID": 1, "userID": 1 })
+            data = self.connection.channel_sets.find({"guildID": guildId}, { "voiceID": 1, "channelID": 1, "userID": 1 })
             for item in data:
                 voice_channels.append(settings.TrackedVoiceChannel(guildId=guildId, ownerId=item['userID'], voiceChannelId=item['voiceID']))
-            data = self.connection.text_channels.find({"guildID": guildId}, {"voiceID": 1, "channelID": 1, "userID": 1})
-            for item in data:
-                text_channels.append(settings.TrackedTextChannel(guildId=guildId, ownerId=item['userID'], voiceChannelId=item['voiceID'], textChannelId=item['channelID']))
+                if item.get('channelID'):
+                    text_channels.append(settings.TrackedTextChannel(guildId=guildId, ownerId=item['userID'], voiceChannelId=item['voiceID'], textChannelId=item['channelID']))
             tracked = settings.TrackedChannels(voiceChannels=voice_channels, textChannels=text_channels)
             return tracked
         except Exception as ex:
@@ -530,8 +626,7 @@ class MongoDatabase(database.Database):
         try:
             if self.connection is None:
                 self.open()
-            # c.execute("SELECT userID FROM voiceChannel WHERE guildID = ? AND voiceID = ?", (guildId, voiceChannelId,))
-            owner = self.connection.voice_channels.find_one({"guildID": guildId, "voiceID": voiceChannelId}, { "userID": 1 })
+            owner = self.connection.channel_sets.find_one({"guildID": guildId, "voiceID": voiceChannelId}, { "userID": 1 })
             if owner:
                 return owner['userID']
             return None
@@ -542,13 +637,22 @@ class MongoDatabase(database.Database):
         try:
             if self.connection is None:
                 self.open()
-            # c.execute("UPDATE voiceChannel SET userID = ? WHERE guildId = ? AND voiceID = ? AND userID = ?", (newOwnerId, guildId, voiceChannelId, ownerId,))
-            # c.execute("UPDATE textChannel SET userID = ? WHERE guildId = ? AND voiceID = ? AND userID = ?", (newOwnerId, guildId, voiceChannelId, ownerId,))
-            self.connection.voice_channels.update_one({"guildID": guildId, "voiceID": voiceChannelId, "userID": ownerId}, {"$set": { "userID": newOwnerId }})
-            self.connection.text_channels.update_one({"guildID": guildId, "voiceID": voiceChannelId, "userID": ownerId}, {"$set": { "userID": newOwnerId }})
+            result = self.connection.channel_sets.update_one({"guildID": guildId, "voiceID": voiceChannelId, "userID": ownerId}, {"$set": { "userID": newOwnerId }})
+            return result.matched_count > 0
         except Exception as ex:
             print(ex)
             traceback.print_exc()
+            return False
+    @staticmethod
+    def get_channel_set_history(channelSet):
+        return {
+            "guild_id": channelSet['guildID'],
+            "user_id": channelSet['userID'],
+            "text_channel_id": channelSet.get('channelID'),
+            "voice_channel_id": channelSet['voiceID'],
+            "timestamp": utils.get_timestamp(),
+            "created_at": datetime.datetime.utcnow()
+        }
     def clean_guild_user_settings(self, guildId):
         try:
             if self.connection is None:
@@ -560,6 +664,46 @@ class MongoDatabase(database.Database):
             print(ex)
             traceback.print_exc()
             return False
+    @staticmethod
+    def effective_settings_pipeline(guildId, categoryId, createChannelId, userId):
+        # starts at the create channel the user joined and pulls in the category, user and guild
+        # settings with uncorrelated lookups, so everything comes back in one round trip.
+        return [
+            { "$match": { "guildID": guildId, "voiceChannelID": createChannelId } },
+            { "$limit": 1 },
+            { "$lookup": { "from": "category_settings", "pipeline": [ { "$match": { "guildID": guildId, "voiceCategoryID": categoryId } }, { "$limit": 1 } ], "as": "category" } },
+            { "$lookup": { "from": "user_settings", "pipeline": [ { "$match": { "guildID": guildId, "userID": userId } }, { "$limit": 1 } ], "as": "user" } },
+            { "$lookup": { "from": "guild_settings", "pipeline": [ { "$match": { "guild_id": guildId } }, { "$limit": 1 } ], "as": "guild" } }
+        ]
+    @staticmethod
+    def effective_settings_from_document(guildId, categoryId, createChannelId, userId, doc):
+        guild_settings = None
+        category_settings = None
+        user_settings = None
+        if doc['guild']:
+            g = doc['guild'][0]
+            guild_settings = settings.GuildSettings(guildId=guildId, prefix=g.get('prefix'), defaultRole=g.get('default_role'), adminRole=g.get('admin_role'), language=g.get('language'))
+        if doc['category']:
+            c = doc['category'][0]
+            category_settings = settings.GuildCategorySettings(guildId=guildId, categoryId=categoryId, channelLimit=c['channelLimit'], channelLocked=c['channelLocked'], bitrate=c['bitrate'], defaultRole=c['defaultRole'])
+        if doc['user']:
+            u = doc['user'][0]
+            user_settings = settings.UserSettings(guildId=guildId, userId=userId, channelName=u['channelName'], channelLimit=int(u['channelLimit']), bitrate=int(u['bitrate']), defaultRole=u['defaultRole'], autoGame=u.get('auto_game', False))
+        return settings.EffectiveChannelSettings.merge(guildId, categoryId, createChannelId, userId, guildSettings=guild_settings, categorySettings=category_settings, userSettings=user_settings, useStage=doc.get('useStage', False) or False)
+    def get_effective_channel_settings(self, guildId, categoryId, createChannelId, userId):
+        try:
+            if self.connection is None:
+                self.open()
+            for doc in self.connection.create_channels.aggregate(self.effective_settings_pipeline(guildId, categoryId, createChannelId, userId)):
+                return self.effective_settings_from_document(guildId, categoryId, createChannelId, userId, doc)
+            # not a create channel, merge what is there
+            return settings.EffectiveChannelSettings.merge(guildId, categoryId, createChannelId, userId,
+                guildSettings=self.get_guild_settings(guildId),
+                categorySettings=self.get_guild_category_settings(guildId=guildId, categoryId=categoryId),
+                userSettings=self.get_user_settings(guildId=guildId, userId=userId))
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
     def get_default_role(self, guildId, categoryId, userId):
         try:
             guild_settings = self.get_guild_settings(guildId=guildId)
@@ -613,12 +757,22 @@ class MongoDatabase(database.Database):
                 "level": level.name,
                 "method": method,
                 "message": message,
-                "stack_trace": stackTrace
+                "stack_trace": stackTrace,
+                "created_at": datetime.datetime.utcnow()
             }
             self.connection.logs.insert_one(payload)
         except Exception as ex:
             print(ex)
             traceback.print_exc()
+    def insert_logs(self, logs: list):
+        try:
+            if self.connection is None:
+                self.open()
+            if logs:
+                self.connection.logs.insert_many(logs, ordered=False)
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
     def clear_log(self, guildId):
         try:
             if self.connection is None:
@@ -633,13 +787,31 @@ class MongoDatabase(database.Database):
         c = self.connection.guild_settings.find()
         result = []
         for g in c:
-            result.append(settings.GuildSettings(g['guild_id'], g['prefix'], g['default_role'], g['admin_role']))
+            result.append(settings.GuildSettings(g['guild_id'], g['prefix'], g['default_role'], g['admin_role'], g.get('language')))
         return result
 
     def get_all_from_guild_table(self):
-        pass
+        try:
+            if self.connection is None:
+                self.open()
+            result = []
+            for r in self.connection.create_channels.find({}, { "guildID": 1, "ownerID": 1, "voiceChannelID": 1, "voiceCategoryID": 1, "useStage": 1, "poolSize": 1 }):
+                result.append({ "guildID": int(r['guildID']), "ownerID": int(r['ownerID']), "voiceChannelID": int(r['voiceChannelID']), "voiceCategoryID": int(r['voiceCategoryID']), "useStage": bool(r['useStage']), "poolSize": int(r.get('poolSize') or 0) })
+            return result
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
     def get_all_from_guild_category_settings_table(self):
-        pass
+        try:
+            if self.connection is None:
+                self.open()
+            result = []
+            for r in self.connection.category_settings.find({}, { "guildID": 1, "voiceCategoryID": 1, "channelLimit": 1, "channelLocked": 1, "bitrate": 1, "defaultRole": 1 }):
+                result.append({ "guildID": int(r['guildID']), "voiceCategoryID": int(r['voiceCategoryID']), "channelLimit": int(r['channelLimit']), "channelLocked": bool(r['channelLocked']), "bitrate": int(r['bitrate']), "defaultRole": r['defaultRole'] })
+            return result
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
     def get_all_from_user_settings_table(self):
         pass
     def get_all_from_text_channel_table(self):
@@ -0,0 +1,564 @@
+from motor.motor_asyncio import AsyncIOMotorClient
+import traceback
+import datetime
+
+from . import database
+from . import settings
+from . import utils
+from . import mongo
+from . import mongopool
+
+class MongoAsyncDatabase(database.Database):
+    def __init__(self, pool: mongopool.MongoClientPool = None):
+        self.settings = settings.Settings()
+        # the synchronous pool is only used for the schema migration at startup
+        self.pool = pool
+        if self.pool is None:
+            self.pool = mongopool.MongoClientPool(self.settings.db_url, maxPoolSize=self.settings.db_pool_size, minPoolSize=self.settings.db_min_pool_size)
+        self.client = None
+        self.connection = None
+        pass
+
+    def UPDATE_SCHEMA(self, newDBVersion: int):
+        # runs once, before the event loop starts, so the blocking driver is fine here.
+        mongo.MongoDatabase(pool=self.pool).UPDATE_SCHEMA(newDBVersion)
+    def RESET_MIGRATION(self):
+        mongo.MongoDatabase(pool=self.pool).RESET_MIGRATION()
+
+    async def open(self):
+        if self.connection is None:
+            if not self.pool.url:
+                raise ValueError("VCB_MONGODB_URL is not set")
+            if self.client is None:
+                self.client = AsyncIOMotorClient(self.pool.url, maxPoolSize=self.pool.max_pool_size, minPoolSize=self.pool.min_pool_size)
+            self.connection = self.client[self.pool.database_name]
+    async def close(self):
+        # sockets go back to the motor pool after every operation
+        pass
+    def shutdown(self):
+        if self.client:
+            self.client.close()
+        self.client = None
+        self.connection = None
+
+    async def get_tracked_voice_channel_ids(self, guildId):
+        try:
+            await self.open()
+            cursor = self.connection.channel_sets.find({"guildID": guildId}, { "voiceID": 1 })
+            items = [ i['voiceID'] async for i in cursor ]
+            return items
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    async def get_text_channel_id(self, guildId, voiceChannelId):
+        try:
+            await self.open()
+            result = await self.connection.channel_sets.find_one({"guildID": guildId, "voiceID": voiceChannelId}, { "channelID": 1 })
+            if result:
+                return result.get('channelID')
+            return None
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    async def get_voice_channel_id_from_text_channel(self, guildId, textChannelId):
+        try:
+            await self.open()
+            result = await self.connection.channel_sets.find_one({"guildID": guildId, "channelID": textChannelId}, { "voiceID": 1 })
+            if result:
+                return result['voiceID']
+            return None
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    async def clean_tracked_channels(self, guildId, voiceChannelId, textChannelId):
+        try:
+            await self.open()
+            # one delete for the whole set, the removed document is kept as history
+            filter = { "guildID": guildId, "voiceID": voiceChannelId }
+            if textChannelId is not None:
+                filter = { "guildID": guildId, "$or": [ { "voiceID": voiceChannelId }, { "channelID": textChannelId } ] }
+            tracked = await self.connection.channel_sets.find_one_and_delete(filter)
+            if tracked:
+                await self.connection.tracked_channels_history.insert_one(mongo.MongoDatabase.get_channel_set_history(tracked))
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    async def clean_user_settings(self, guildId, userId):
+        try:
+            await self.open()
+            await self.connection.user_settings.delete_many({"guildID": guildId, "userID": userId})
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    async def get_tracked_voice_channel_id_by_owner(self, guildId, ownerId):
+        try:
+            await self.open()
+            items = self.connection.channel_sets.find({"guildID": guildId, "userID": ownerId}, {"voiceID": 1})
+            channel_ids = [item['voiceID'] async for item in items]
+            return channel_ids
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    async def get_channel_owner_id(self, guildId, channelId):
+        try:
+            await self.open()
+            item = await self.connection.channel_sets.find_one({"guildID": guildId, "$or": [ { "voiceID": channelId }, { "channelID": channelId } ] }, {"userID": 1})
+            if item:
+                return int(item['userID'])
+            return None
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    async def get_user_settings(self, guildId, userId):
+        try:
+            await self.open()
+            r = await self.connection.user_settings.find_one({"guildID": guildId, "userID": userId})
+            if r:
+                return settings.UserSettings(guildId=guildId, userId=userId, channelName=r['channelName'], channelLimit=int(r['channelLimit']), bitrate=int(r['bitrate']), defaultRole=r['defaultRole'], autoGame=r['auto_game'])
+            return None
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    async def get_guild_create_channel_settings(self, guildId):
+        try:
+            await self.open()
+            result = settings.GuildCreateChannelSettings(guildId=guildId)
+            async for r in self.connection.create_channels.find({"guildID": guildId}):
+                result.channels.append(settings.GuildCategoryChannel(ownerId=(r['ownerID']), categoryId=int(r['voiceCategoryID']), channelId=int(r['voiceChannelID']), useStage=r['useStage'], poolSize=r.get('poolSize', 0)))
+            return result
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    async def delete_guild_create_channel(self, guildId, channelId, categoryId):
+        try:
+            await self.open()
+            await self.connection.create_channels.delete_many({"guildID": guildId, "voiceChannelID": channelId, "voiceCategoryID": categoryId})
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    async def update_guild_create_channel_settings(self, guildId, createChannelId, categoryId, ownerId, useStage: bool):
+        try:
+            await self.open()
+            await self.connection.create_channels.find_one_and_update({"guildID": guildId, "voiceChannelID": createChannelId}, { "$set": { "ownerID": ownerId, "voiceCategoryID": categoryId, "useStage": useStage } })
+            return True
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+            return False
+    async def insert_guild_create_channel_settings(self, guildId: int, createChannelId: int, categoryId: int, ownerId: int, useStage: bool):
+        await self.open()
+        payload = {
+            "guildID": guildId,
+            "ownerID": ownerId,
+            "voiceChannelID": createChannelId,
+            "voiceCategoryID": categoryId,
+            "useStage": useStage,
+            "poolSize": 0,
+            "timestamp": utils.get_timestamp()
+        }
+        result = await self.connection.create_channels.insert_one(payload)
+        return result is not None
+    async def get_guild_settings(self, guildId: int):
+        try:
+            await self.open()
+            c = await self.connection.guild_settings.find_one({"guild_id": guildId})
+            if c:
+                return settings.GuildSettings(guildId=guildId, prefix=c['prefix'], defaultRole=c['default_role'], adminRole=c['admin_role'], language=c['language'])
+            return None
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+            return None
+    async def set_guild_settings_prefix(self, guildId: int, prefix: str):
+        await self.open()
+        gs = await self.get_guild_settings(guildId=guildId)
+        if not gs:
+            return False
+        payload = {
+            "prefix": prefix,
+            "timestamp": utils.get_timestamp()
+        }
+        await self.connection.guild_settings.update_one({"guild_id": guildId}, { "$set": payload })
+    async def set_guild_settings_language(self, guildId: int, language: str):
+        await self.open()
+        gs = await self.get_guild_settings(guildId=guildId)
+        if not gs:
+            return False
+        payload = {
+            "language": language,
+            "timestamp": utils.get_timestamp()
+        }
+        await self.connection.guild_settings.update_one({"guild_id": guildId}, { "$set": payload })
+    async def insert_or_update_guild_settings(self, guildId: int, prefix: str, defaultRole: int, adminRole: int, language: str):
+        try:
+            await self.open()
+            gs = await self.get_guild_settings(guildId=guildId)
+            if gs:
+                return await self.update_guild_settings(guildId=gs.guild_id, prefix=prefix, defaultRole=defaultRole, adminRole=adminRole, language=language)
+            else:
+                return await self.insert_guild_settings(guildId=guildId, prefix=prefix, defaultRole=defaultRole, adminRole=adminRole, language=language)
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+            return False
+    async def insert_guild_settings(self, guildId: int, prefix: str, defaultRole: int, adminRole: int, language: str):
+        try:
+            await self.open()
+            payload = {
+                "guild_id": guildId,
+                "prefix": prefix,
+                "default_role": defaultRole,
+                "admin_role": adminRole,
+                "language": language,
+                "timestamp": utils.get_timestamp()
+            }
+            await self.connection.guild_settings.insert_one(payload)
+            return True
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+            return False
+    async def update_guild_settings(self, guildId: int, prefix: str, defaultRole: int, adminRole: int, language: str):
+        try:
+            await self.open()
+            payload = {
+                "prefix": prefix,
+                "default_role": defaultRole,
+                "admin_role": adminRole,
+                "language": language,
+                "timestamp": utils.get_timestamp()
+            }
+            await self.connection.guild_settings.update_one({"guild_id": guildId}, { "$set": payload })
+            return True
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+            return False
+    async def set_guild_category_settings(self, guildId: int, categoryId: int, channelLimit: int, channelLocked: bool, bitrate: int, defaultRole: int):
+        try:
+            await self.open()
+            cat_settings = await self.get_guild_category_settings(guildId=guildId, categoryId=categoryId)
+            if cat_settings:
+                payload = { "channelLimit": channelLimit, "channelLocked": channelLocked, "bitrate": bitrate, "defaultRole": defaultRole }
+                await self.connection.category_settings.find_one_and_update({"guildID": guildId, "voiceCategoryID": categoryId}, { "$set": payload })
+            else:
+                payload = {
+                    "guildID": guildId,
+                    "voiceCategoryID": categoryId,
+                    "channelLimit": channelLimit,
+                    "channelLocked": channelLocked,
+                    "bitrate": bitrate,
+                    "defaultRole": defaultRole,
+                    "timestamp": utils.get_timestamp()
+                }
+                await self.connection.category_settings.insert_one(payload)
+            return True
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+            return False
+    async def get_guild_category_settings(self, guildId, categoryId):
+        try:
+            await self.open()
+            row = await self.connection.category_settings.find_one({ "guildID": guildId, "voiceCategoryID": categoryId})
+            if row:
+                return settings.GuildCategorySettings(guildId=guildId, categoryId=categoryId, channelLimit=row['channelLimit'], channelLocked=row['channelLocked'], bitrate=row['bitrate'], defaultRole=row['defaultRole'])
+            return None
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    async def update_user_channel_name(self, guildId, userId, channelName):
+        try:
+            await self.open()
+            await self.connection.user_settings.find_one_and_update({ "guildID": guildId, "userID": userId }, { "$set": { "channelName": channelName }})
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    async def update_user_limit(self, guildId, userId, limit: int = 0):
+        try:
+            await self.open()
+            await self.connection.user_settings.find_one_and_update({ "guildID": guildId, "userID": userId }, { "$set": { "channelLimit": limit }})
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    async def update_user_bitrate(self, guildId, userId, bitrate: int = 8):
+        try:
+            await self.open()
+            await self.connection.user_settings.find_one_and_update({ "guildID": guildId, "userID": userId }, { "$set": { "bitrate": bitrate }})
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    async def insert_user_settings(self, guildId, userId, channelName, channelLimit, bitrate: int, defaultRole: int, autoGame: bool = False):
+        try:
+            await self.open()
+            payload = {
+                "guildID": guildId,
+                "userID": userId,
+                "channelName": channelName,
+                "channelLimit": channelLimit,
+                "bitrate": bitrate,
+                "defaultRole": defaultRole,
+                "auto_game": autoGame,
+                "timestamp": utils.get_timestamp()
+            }
+            await self.connection.user_settings.insert_one(payload)
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    async def set_user_settings_auto_game(self, guildId: int, userId: int, autoGame: bool):
+        await self.open()
+        existing = await self.get_user_settings(guildId=guildId, userId=userId)
+        if existing:
+            await self.connection.user_settings.update_one({"guildID": guildId, "userID": userId}, { "$set": { "auto_game": autoGame }})
+    async def get_guild_create_channels(self, guildId):
+        try:
+            await self.open()
+            cursor = self.connection.create_channels.find({"guildID": guildId}, { "voiceChannelID": 1 })
+            return [ c['voiceChannelID'] async for c in cursor ]
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    async def get_use_stage_on_create(self, guildId, channelId, categoryId):
+        try:
+            await self.open()
+            result = await self.connection.create_channels.find_one({ "guildID": guildId, "voiceCategoryID": categoryId, "voiceChannelID": channelId }, { "useStage": 1 })
+            if result:
+                return result['useStage']
+            return None
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    async def add_tracked_text_channel(self, guildId, ownerId, voiceChannelId, textChannelId):
+        try:
+            await self.open()
+            await self.connection.channel_sets.update_one(
+                { "guildID": guildId, "voiceID": voiceChannelId },
+                { "$set": { "channelID": textChannelId }, "$setOnInsert": { "userID": ownerId, "timestamp": utils.get_timestamp() } },
+                upsert=True)
+            return True
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+            return False
+    async def delete_tracked_text_channel(self, guildId, voiceChannelId, textChannelId):
+        try:
+            await self.open()
+            tracked = await self.connection.channel_sets.find_one_and_update({ "guildID": guildId, "voiceID": voiceChannelId, "channelID": textChannelId }, { "$set": { "channelID": None } })
+            if tracked:
+                await self.connection.tracked_channels_history.insert_one(mongo.MongoDatabase.get_channel_set_history(tracked))
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    async def track_new_voice_channel(self, guildId, ownerId, voiceChannelId):
+        try:
+            await self.open()
+            await self.connection.channel_sets.update_one(
+                { "guildID": guildId, "voiceID": voiceChannelId },
+                { "$set": { "userID": ownerId }, "$setOnInsert": { "channelID": None, "timestamp": utils.get_timestamp() } },
+                upsert=True)
+            return True
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+            return False
+    async def track_new_channel_set(self, guildId, ownerId, voiceChannelId, textChannelId):
+        try:
+            await self.open()
+            await self.connection.channel_sets.update_one(
+                { "guildID": guildId, "voiceID": voiceChannelId },
+                { "$set": { "userID": ownerId, "channelID": textChannelId, "timestamp": utils.get_timestamp() } },
+                upsert=True)
+            return True
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+            return False
+    async def set_guild_create_channel_pool_size(self, guildId, createChannelId, poolSize: int):
+        try:
+            await self.open()
+            result = await self.connection.create_channels.update_one({ "guildID": guildId, "voiceChannelID": createChannelId }, { "$set": { "poolSize": poolSize } })
+            return result.matched_count > 0
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+            return False
+    async def get_pooled_channel_sets(self, guildId):
+        try:
+            await self.open()
+            rows = self.connection.channel_pools.find({ "guildID": guildId }, { "createChannelID": 1, "voiceID": 1, "channelID": 1 }).sort("timestamp", 1)
+            return [ { "createChannelID": int(r['createChannelID']), "voiceID": int(r['voiceID']), "channelID": int(r['channelID']) } async for r in rows ]
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+            return []
+    async def insert_pooled_channel_set(self, guildId, createChannelId, voiceChannelId, textChannelId):
+        try:
+            await self.open()
+            await self.connection.channel_pools.update_one(
+                { "guildID": guildId, "voiceID": voiceChannelId },
+                { "$set": { "createChannelID": createChannelId, "channelID": textChannelId, "timestamp": utils.get_timestamp() } },
+                upsert=True)
+            return True
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+            return False
+    async def delete_pooled_channel_set(self, guildId, voiceChannelId):
+        try:
+            await self.open()
+            await self.connection.channel_pools.delete_many({ "guildID": guildId, "voiceID": voiceChannelId })
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    async def get_tracked_channels_for_guild(self, guildId):
+        try:
+            await self.open()
+            voice_channels = []
+            text_channels = []
+            data = self.connection.channel_sets.find({"guildID": guildId}, { "voiceID": 1, "channelID": 1, "userID": 1 })
+            async for item in data:
+                voice_channels.append(settings.TrackedVoiceChannel(guildId=guildId, ownerId=item['userID'], voiceChannelId=item['voiceID']))
+                if item.get('channelID'):
+                    text_channels.append(settings.TrackedTextChannel(guildId=guildId, ownerId=item['userID'], voiceChannelId=item['voiceID'], textChannelId=item['channelID']))
+            tracked = settings.TrackedChannels(voiceChannels=voice_channels, textChannels=text_channels)
+            return tracked
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    async def get_tracked_channel_owner(self, guildId, voiceChannelId):
+        try:
+            await self.open()
+            owner = await self.connection.channel_sets.find_one({"guildID": guildId, "voiceID": voiceChannelId}, { "userID": 1 })
+            if owner:
+                return owner['userID']
+            return None
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    async def update_tracked_channel_owner(self, guildId, voiceChannelId, ownerId, newOwnerId):
+        try:
+            await self.open()
+            result = await self.connection.channel_sets.update_one({"guildID": guildId, "voiceID": voiceChannelId, "userID": ownerId}, {"$set": { "userID": newOwnerId }})
+            return result.matched_count > 0
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+            return False
+    async def clean_guild_user_settings(self, guildId):
+        try:
+            await self.open()
+            await self.connection.user_settings.delete_many({"guildID": guildId})
+            return True
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+            return False
+    async def get_effective_channel_settings(self, guildId, categoryId, createChannelId, userId):
+        try:
+            await self.open()
+            async for doc in self.connection.create_channels.aggregate(mongo.MongoDatabase.effective_settings_pipeline(guildId, categoryId, createChannelId, userId)):
+                return mongo.MongoDatabase.effective_settings_from_document(guildId, categoryId, createChannelId, userId, doc)
+            return settings.EffectiveChannelSettings.merge(guildId, categoryId, createChannelId, userId,
+                guildSettings=await self.get_guild_settings(guildId),
+                categorySettings=await self.get_guild_category_settings(guildId=guildId, categoryId=categoryId),
+                userSettings=await self.get_user_settings(guildId=guildId, userId=userId))
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    async def get_default_role(self, guildId, categoryId, userId):
+        try:
+            guild_settings = await self.get_guild_settings(guildId=guildId)
+            user_settings = await self.get_user_settings(guildId=guildId, userId=userId)
+            guild_category_settings = await self.get_guild_category_settings(guildId=guildId, categoryId=categoryId)
+            if user_settings:
+                return user_settings.default_role
+            elif guild_category_settings:
+                return guild_category_settings.default_role
+            elif guild_settings:
+                return guild_settings.default_role
+            else:
+                return None
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    async def set_default_role_for_user(self, guildId, userId, defaultRole):
+        try:
+            await self.open()
+            user_settings = await self.get_user_settings(guildId=guildId, userId=userId)
+            if user_settings:
+                await self.connection.user_settings.update_one({ "guildID": guildId, "userID": userId }, { "$set": { "defaultRole": defaultRole }})
+                return True
+            else:
+                return False
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    async def set_default_role_for_category(self, guildId, categoryId, defaultRole):
+        try:
+            await self.open()
+            category_settings = await self.get_guild_category_settings(guildId=guildId, categoryId=categoryId)
+            if category_settings:
+                await self.connection.category_settings.update_many({ "guildID": guildId, "voiceCategoryID": categoryId}, { "$set": { "defaultRole": defaultRole }})
+                return True
+            return False
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+
+    async def insert_log(self, guildId: int, level: str, method: str, message: str, stackTrace: str = None):
+        try:
+            await self.open()
+            payload = {
+                "guild_id": guildId,
+                "timestamp": utils.get_timestamp(),
+                "level": level.name,
+                "method": method,
+                "message": message,
+                "stack_trace": stackTrace,
+                "created_at": datetime.datetime.utcnow()
+            }
+            await self.connection.logs.insert_one(payload)
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    async def insert_logs(self, logs: list):
+        try:
+            await self.open()
+            if logs:
+                await self.connection.logs.insert_many(logs, ordered=False)
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    async def clear_log(self, guildId):
+        try:
+            await self.open()
+            await self.connection.logs.delete_many({ "guild_id": guildId })
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    async def get_all_guild_settings(self):
+        await self.open()
+        result = []
+        async for g in self.connection.guild_settings.find():
+            result.append(settings.GuildSettings(g['guild_id'], g['prefix'], g['default_role'], g['admin_role'], g.get('language')))
+        return result
+    async def get_all_from_guild_table(self):
+        try:
+            await self.open()
+            result = []
+            async for r in self.connection.create_channels.find({}, { "guildID": 1, "ownerID": 1, "voiceChannelID": 1, "voiceCategoryID": 1, "useStage": 1, "poolSize": 1 }):
+                result.append({ "guildID": int(r['guildID']), "ownerID": int(r['ownerID']), "voiceChannelID": int(r['voiceChannelID']), "voiceCategoryID": int(r['voiceCategoryID']), "useStage": bool(r['useStage']), "poolSize": int(r.get('poolSize') or 0) })
+            return result
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+    async def get_all_from_guild_category_settings_table(self):
+        try:
+            await self.open()
+            result = []
+            async for r in self.connection.category_settings.find({}, { "guildID": 1, "voiceCategoryID": 1, "channelLimit": 1, "channelLocked": 1, "bitrate": 1, "defaultRole": 1 }):
+                result.append({ "guildID": int(r['guildID']), "voiceCategoryID": int(r['voiceCategoryID']), "channelLimit": int(r['channelLimit']), "channelLocked": bool(r['channelLocked']), "bitrate": int(r['bitrate']), "defaultRole": r['defaultRole'] })
+            return result
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
@@ -1,15 +1,17 @@
 from bot.cogs.lib.mongodb import migrations
 from .. import settings
-from pymongo import MongoClient
+from .. import mongopool
 import traceback
 import json
 from .migrations import *
 from .. import utils
 class MongoMigration:
 
-    def __init__(self, schemaVersion: int = 0):
+    def __init__(self, schemaVersion: int = 0, pool: mongopool.MongoClientPool = None):
         self.settings = settings.Settings()
-        self.client = None
+        self.pool = pool
+        if self.pool is None:
+            self.pool = mongopool.MongoClientPool(self.settings.db_url, maxPoolSize=self.settings.db_pool_size, minPoolSize=self.settings.db_min_pool_size)
         self.connection = None
         self.schema_version = schemaVersion
         self.log("MongoMigration.__init__", "INITIALIZE MIGRATOR")
@@ -23,12 +25,18 @@ class MongoMigration:
             db_version = self.connection.migration.find_one({"user_version": self.schema_version})
 
             if not db_version:
-                # need to migrate
+                # need to migrate. run every migration newer than the version that was last recorded,
+                # not only the target one, so a database that skipped releases catches up.
+                current = self.connection.migration.find_one({}, sort=[("user_version", -1)])
+                current_version = 0
+                if current:
+                    current_version = int(current['user_version'])
+                self.log("migration.run", f"Recorded Schema Version: {current_version}")
 
                 for migration_index in range(0, self.schema_version + 1):
                     mig_name = f"migration_{migration_index:05d}"
                     if mig_name in migrations.__all__:
-                        if self.schema_version == 0 or self.schema_version <= migration_index:
+                        if current_version == 0 or current_version < migration_index:
                             self.log("migration.run", f"Schema Version: {self.schema_version}")
                             self.log("migration.run", f"Migration Index: {migration_index}")
                             module = getattr(migrations, mig_name)
@@ -54,16 +62,10 @@ class MongoMigration:
         self.close()
 
     def open(self):
-        if not self.settings.db_url:
-            raise ValueError("VCB_MONGODB_URL is not set")
-        self.client = MongoClient(self.settings.db_url)
-        self.connection = self.client.voicecreate
+        self.connection = self.pool.open()
     def close(self):
-        try:
-            if self.client:
-                self.client.close()
-        except Exception as ex:
-           self.log("migration.close", str(ex), traceback.format_exc())
+        # the shared pool outlives the migration, only release the handle.
+        self.connection = None
 
     def log(self, method: str, message: str, stackTrace: str = None):
         print(f"[DEBUG] [{method}] [guild:0] {message}")
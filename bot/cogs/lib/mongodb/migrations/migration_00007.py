@@ -0,0 +1,33 @@
+from pymongo import ASCENDING
+from . import Migration
+class Migration_00007(Migration):
+    def __init__(self, connection):
+        self.connection = connection
+        self.log("Migration_00007.__init__", f"INITIALIZE MIGRATION 00007")
+        pass
+    def execute(self):
+        self.log("Migration_00007.execute", f"EXECUTE MIGRATION 00007")
+        # v7 migration start
+        # compound indexes for every filter the providers run. create_index is a no-op
+        # when the same index already exists, so this is safe to run again.
+        self.connection.voice_channels.create_index([("guildID", ASCENDING), ("voiceID", ASCENDING)], name="guild_voice")
+        self.connection.voice_channels.create_index([("guildID", ASCENDING), ("userID", ASCENDING)], name="guild_user")
+        self.connection.text_channels.create_index([("guildID", ASCENDING), ("voiceID", ASCENDING)], name="guild_voice")
+        self.connection.text_channels.create_index([("guildID", ASCENDING), ("channelID", ASCENDING)], name="guild_channel")
+        self.connection.user_settings.create_index([("guildID", ASCENDING), ("userID", ASCENDING)], name="guild_user")
+        self.connection.category_settings.create_index([("guildID", ASCENDING), ("voiceCategoryID", ASCENDING)], name="guild_category")
+        self.connection.create_channels.create_index([("guildID", ASCENDING), ("voiceChannelID", ASCENDING), ("voiceCategoryID", ASCENDING)], name="guild_channel_category")
+        self.connection.logs.create_index([("guild_id", ASCENDING)], name="guild")
+
+        # a guild can only have one settings document. drop older duplicates so the unique index can be built.
+        duplicates = self.connection.guild_settings.aggregate([
+            { "$sort": { "timestamp": -1 } },
+            { "$group": { "_id": "$guild_id", "ids": { "$push": "$_id" }, "count": { "$sum": 1 } } },
+            { "$match": { "count": { "$gt": 1 } } }
+        ])
+        for d in duplicates:
+            self.log("Migration_00007.execute", f"Removing {d['count'] - 1} duplicate guild_settings for guild: {d['_id']}")
+            self.connection.guild_settings.delete_many({ "_id": { "$in": d['ids'][1:] } })
+        self.connection.guild_settings.create_index([("guild_id", ASCENDING)], name="guild", unique=True)
+        # v7 migration end
+        self.log("Migration_00007.execute", f"COMPLETE MIGRATION 00007")
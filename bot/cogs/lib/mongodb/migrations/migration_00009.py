@@ -0,0 +1,31 @@
+from pymongo import ASCENDING
+from . import Migration
+class Migration_00009(Migration):
+    def __init__(self, connection):
+        self.connection = connection
+        self.log("Migration_00009.__init__", f"INITIALIZE MIGRATION 00009")
+        pass
+    def execute(self):
+        self.log("Migration_00009.execute", f"EXECUTE MIGRATION 00009")
+        # v9 migration start
+        # voice_channels and text_channels are merged into one channel_sets document per voice channel,
+        # with the text channel embedded. the old collections are left in place, nothing reads them anymore.
+        collections = self.connection.list_collection_names()
+        self.connection.channel_sets.create_index([("guildID", ASCENDING), ("voiceID", ASCENDING)], name="guild_voice", unique=True)
+        self.connection.channel_sets.create_index([("guildID", ASCENDING), ("channelID", ASCENDING)], name="guild_channel")
+        self.connection.channel_sets.create_index([("guildID", ASCENDING), ("userID", ASCENDING)], name="guild_user")
+
+        if "voice_channels" in collections:
+            for v in self.connection.voice_channels.find({}):
+                self.connection.channel_sets.update_one(
+                    { "guildID": v['guildID'], "voiceID": v['voiceID'] },
+                    { "$set": { "userID": v['userID'] }, "$setOnInsert": { "channelID": None } },
+                    upsert=True)
+        if "text_channels" in collections:
+            for t in self.connection.text_channels.find({}):
+                self.connection.channel_sets.update_one(
+                    { "guildID": t['guildID'], "voiceID": t['voiceID'] },
+                    { "$set": { "channelID": t['channelID'] }, "$setOnInsert": { "userID": t['userID'] } },
+                    upsert=True)
+        # v9 migration end
+        self.log("Migration_00009.execute", f"COMPLETE MIGRATION 00009")
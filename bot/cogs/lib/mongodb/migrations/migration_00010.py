@@ -0,0 +1,20 @@
+from . import Migration
+class Migration_00010(Migration):
+    def __init__(self, connection):
+        self.connection = connection
+        self.log("Migration_00010.__init__", f"INITIALIZE MIGRATION 00010")
+        pass
+    def execute(self):
+        self.log("Migration_00010.execute", f"EXECUTE MIGRATION 00010")
+        # v10 migration start
+        # ttl indexes only expire documents with a real date, the existing logs and history only
+        # have the numeric timestamp. copy it to created_at so the old documents expire too.
+        # the ttl indexes themselves are created at startup from the retention settings.
+        backfill = [ { "$set": { "created_at": { "$toDate": { "$multiply": [ "$timestamp", 1000 ] } } } } ]
+        missing = { "created_at": { "$exists": False }, "timestamp": { "$type": "number" } }
+        logs = self.connection.logs.update_many(missing, backfill)
+        self.log("Migration_00010.execute", f"Set created_at on {logs.modified_count} logs")
+        history = self.connection.tracked_channels_history.update_many(missing, backfill)
+        self.log("Migration_00010.execute", f"Set created_at on {history.modified_count} tracked_channels_history")
+        # v10 migration end
+        self.log("Migration_00010.execute", f"COMPLETE MIGRATION 00010")
@@ -0,0 +1,16 @@
+from pymongo import ASCENDING
+from . import Migration
+class Migration_00011(Migration):
+    def __init__(self, connection):
+        self.connection = connection
+        self.log("Migration_00011.__init__", f"INITIALIZE MIGRATION 00011")
+        pass
+    def execute(self):
+        self.log("Migration_00011.execute", f"EXECUTE MIGRATION 00011")
+        # v11 migration start
+        # create channels keep no pooled channel sets until an admin sets a pool size
+        result = self.connection.create_channels.update_many({ "poolSize": { "$exists": False } }, { "$set": { "poolSize": 0 } })
+        self.log("Migration_00011.execute", f"Set poolSize on {result.modified_count} create_channels")
+        self.connection.channel_pools.create_index([("guildID", ASCENDING), ("voiceID", ASCENDING)], name="guild_voice", unique=True)
+        # v11 migration end
+        self.log("Migration_00011.execute", f"COMPLETE MIGRATION 00011")
@@ -0,0 +1,28 @@
+import threading
+from pymongo import MongoClient
+
+class MongoClientPool():
+    def __init__(self, url: str, maxPoolSize: int = 100, minPoolSize: int = 0, databaseName: str = "voicecreate"):
+        self.url = url
+        self.max_pool_size = maxPoolSize
+        self.min_pool_size = minPoolSize
+        self.database_name = databaseName
+        self.client = None
+        self._lock = threading.Lock()
+
+    def open(self):
+        # the client is created once and shared. each operation checks a socket out of
+        # the client's pool and returns it when done, so callers never need to close it.
+        if not self.url:
+            raise ValueError("VCB_MONGODB_URL is not set")
+        if self.client is None:
+            with self._lock:
+                if self.client is None:
+                    self.client = MongoClient(self.url, maxPoolSize=self.max_pool_size, minPoolSize=self.min_pool_size)
+        return self.client[self.database_name]
+
+    def close(self):
+        with self._lock:
+            if self.client:
+                self.client.close()
+            self.client = None
@@ -0,0 +1,96 @@
+import os
+import sys
+import glob
+import json
+import random
+import re
+import threading
+import traceback
+
+WORDS_PATH = os.path.normpath(os.path.join(os.path.dirname(__file__), "../../../languages/words"))
+DEFAULT_NAME = "New Voice Channel"
+
+class WordList():
+    # the words of one language. adjectives ending with "*" are stems that take the ending of
+    # the noun's gender, nouns can carry their gender as "word:g".
+    def __init__(self, language: str, words: dict):
+        self.language = language
+        self.noun_first = words.get("order") == "noun-first"
+        self.endings = words.get("endings", {})
+        self.adjectives = list(words.get("adjectives", []))
+        self.nouns = []
+        for n in words.get("nouns", []):
+            word, _, gender = n.partition(":")
+            self.nouns.append((word, gender))
+
+    def generate(self, nounCount: int = 1, adjectiveCount: int = 1):
+        nouns = random.sample(self.nouns, min(max(nounCount, 0), len(self.nouns)))
+        if not nouns:
+            return None
+        gender = nouns[0][1]
+        adjectives = []
+        for a in random.sample(self.adjectives, min(max(adjectiveCount, 0), len(self.adjectives))):
+            if a.endswith("*"):
+                a = a[:-1] + self.endings.get(gender, "")
+            adjectives.append(a)
+        words = [ n[0] for n in nouns ]
+        words = words + adjectives if self.noun_first else adjectives + words
+        return " ".join(w[:1].upper() + w[1:] for w in words)
+
+class NameGenerator():
+    # Random channel names from the word lists bundled in languages/words. The lists are read
+    # once and sampled in memory, nothing here touches the network on the event loop.
+    def __init__(self, defaultLanguage: str = "en-us"):
+        self.default_language = defaultLanguage
+        self.word_lists = {}
+        for f in sorted(glob.glob(os.path.join(WORDS_PATH, "*.json"))):
+            language = os.path.basename(f)[:-5]
+            try:
+                with open(f, encoding="UTF-8") as words_file:
+                    self.word_lists[language] = WordList(language, json.load(words_file))
+            except Exception as ex:
+                print(ex, file=sys.stderr)
+                traceback.print_exc()
+
+    def get_random_name(self, nounCount: int = 1, adjectiveCount: int = 1, language: str = None):
+        words = self.word_lists.get(language) or self.word_lists.get(self.default_language)
+        if words is None:
+            return DEFAULT_NAME
+        return words.generate(nounCount=nounCount, adjectiveCount=adjectiveCount) or DEFAULT_NAME
+
+    async def refresh(self, url: str, language: str = "en-us"):
+        # optional remote word source, the gist format of one "var nouns = [...];" file per type.
+        # the bundled list stays in use when the fetch fails.
+        import aiohttp
+        try:
+            words = {}
+            timeout = aiohttp.ClientTimeout(total=10)
+            async with aiohttp.ClientSession(timeout=timeout) as session:
+                for type in ["adjectives", "nouns"]:
+                    async with session.get(f"{url.rstrip('/')}/{type}.js") as resp:
+                        resp.raise_for_status()
+                        data = await resp.text()
+                    data = re.sub(r"(var\s(adjectives|nouns|verbs)\s=\s)|;\s*$", "", data)
+                    words[type] = [ w for w in json.loads(data) if isinstance(w, str) and w ]
+            if words["adjectives"] and words["nouns"]:
+                current = self.word_lists.get(language)
+                order = "noun-first" if current and current.noun_first else "adjectives-first"
+                self.word_lists[language] = WordList(language, { "order": order, "adjectives": words["adjectives"], "nouns": words["nouns"] })
+                return True
+            return False
+        except Exception as ex:
+            print(ex, file=sys.stderr)
+            traceback.print_exc()
+            return False
+
+_generator = None
+_lock = threading.Lock()
+
+def get_generator():
+    global _generator
+    if _generator is None:
+        with _lock:
+            if _generator is None:
+                from . import settings
+                _generator = NameGenerator(defaultLanguage=settings.Settings().language)
+    return _generator
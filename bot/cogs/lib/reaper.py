@@ -0,0 +1,86 @@
+import asyncio
+import traceback
+
+class ChannelReaper():
+    # Deletes tracked channels some time after they became empty. Pending deletions sit in a
+    # timer wheel, one slot per tick. A single task advances the wheel and hands everything that
+    # is due to the callback, one call per guild with all of its channels.
+    # Scheduling a channel that is already pending keeps the first deadline, so a burst of
+    # events becomes one deletion. Cancelling removes it, for when someone joins again.
+    def __init__(self, callback, gracePeriod: float = 5.0, tick: float = 1.0, slots: int = 60):
+        # callback(guildId: int, channelIds: list) is awaited for every guild with due channels
+        self.callback = callback
+        self.tick = max(0.1, tick)
+        self.grace_ticks = max(1, round(gracePeriod / self.tick))
+        self.slots = [ {} for _ in range(max(1, slots)) ]
+        # (guild_id, channel_id) -> slot index, for O(1) coalescing and cancelling
+        self.pending = {}
+        self.position = 0
+        self._task = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self.__run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def is_running(self):
+        return self._task is not None and not self._task.done()
+
+    def schedule(self, guildId: int, channelId: int):
+        key = (guildId, channelId)
+        if key in self.pending:
+            return False
+        # grace periods longer than the wheel wait for extra turns
+        slot = (self.position + self.grace_ticks) % len(self.slots)
+        rounds = (self.grace_ticks - 1) // len(self.slots)
+        self.slots[slot][key] = rounds
+        self.pending[key] = slot
+        return True
+
+    def cancel(self, guildId: int, channelId: int):
+        key = (guildId, channelId)
+        slot = self.pending.pop(key, None)
+        if slot is None:
+            return False
+        self.slots[slot].pop(key, None)
+        return True
+
+    def is_pending(self, guildId: int, channelId: int):
+        return (guildId, channelId) in self.pending
+
+    def advance(self):
+        # moves the wheel one tick and returns { guild_id: [channel_id] } of what is due
+        self.position = (self.position + 1) % len(self.slots)
+        slot = self.slots[self.position]
+        if not slot:
+            return {}
+        due = {}
+        for key, rounds in list(slot.items()):
+            if rounds > 0:
+                slot[key] = rounds - 1
+                continue
+            del slot[key]
+            self.pending.pop(key, None)
+            due.setdefault(key[0], []).append(key[1])
+        return due
+
+    async def __run(self):
+        loop = asyncio.get_event_loop()
+        next_tick = loop.time()
+        while True:
+            next_tick += self.tick
+            await asyncio.sleep(max(0, next_tick - loop.time()))
+            # each guild's batch runs on its own, a slow delete does not hold up the wheel
+            for guild_id, channel_ids in self.advance().items():
+                asyncio.ensure_future(self.__reap(guild_id, channel_ids))
+
+    async def __reap(self, guildId: int, channelIds: list):
+        try:
+            await self.callback(guildId, channelIds)
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
@@ -0,0 +1,9 @@
+from enum import Enum
+class RequestPriority(Enum):
+    # lower values are sent first
+    MOVE = 0
+    CREATE = 1
+    EDIT = 2
+    NOTICE = 3
+    DELETE = 4
+    BACKGROUND = 5
@@ -0,0 +1,157 @@
+import asyncio
+import heapq
+import itertools
+
+from .requestpriority import RequestPriority
+
+class RestRequest():
+    __slots__ = ("priority", "route", "func", "args", "kwargs", "coalesce", "future", "queued_at", "superseded")
+    def __init__(self, priority: RequestPriority, route, func, args, kwargs, coalesce, future, queuedAt: float):
+        self.priority = priority
+        self.route = route
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.coalesce = coalesce
+        self.future = future
+        self.queued_at = queuedAt
+        self.superseded = False
+
+class RestScheduler():
+    # Every Discord call the cogs make can go through here. Requests wait in one priority queue,
+    # moves and channel creates first, notices and deletes last. At most maxConcurrent run at
+    # once and requests for the same route (the rate limit bucket, a channel or a guild's
+    # members) run one at a time, so a pile of deletes on one channel only ever holds one slot.
+    # A queued request with the same coalesce key as a newer one is dropped, both callers get
+    # the result of the newer one, e.g. three renames of one channel become the last rename.
+    # discord.py sleeps inside a rate limited call, so a slot can be held for seconds. Moves and
+    # creates have reservedSlots more slots than the rest, so they never wait for deletes, and
+    # background work only ever holds backgroundSlots of the shared ones.
+    URGENT = (RequestPriority.MOVE, RequestPriority.CREATE)
+    def __init__(self, maxConcurrent: int = 8, reservedSlots: int = 2, backgroundSlots: int = 1):
+        self.max_concurrent = max(1, maxConcurrent)
+        self.reserved_slots = max(1, reservedSlots)
+        self.background_slots = max(1, min(backgroundSlots, self.max_concurrent))
+        # (priority value, sequence, RestRequest)
+        self.queue = []
+        self.sequence = itertools.count()
+        # routes with a request in flight
+        self.busy_routes = set()
+        # coalesce key -> the queued RestRequest
+        self.pending = {}
+        self.running = 0
+        # priority value -> requests in flight
+        self.running_by_priority = { p.value: 0 for p in RequestPriority }
+        self.coalesced = 0
+        # priority value -> [ completed, total wait seconds, max wait seconds ]
+        self.waits = { p.value: [0, 0.0, 0.0] for p in RequestPriority }
+
+    def submit(self, priority: RequestPriority, route, func, *args, coalesce = None, **kwargs):
+        # queues func(*args, **kwargs), which is only called once the request is sent. the
+        # returned future has the result.
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        future.add_done_callback(self.__retrieve)
+        request = RestRequest(priority, route, func, args, kwargs, coalesce, future, loop.time())
+        if coalesce is not None:
+            previous = self.pending.pop(coalesce, None)
+            if previous is not None:
+                previous.superseded = True
+                self.coalesced += 1
+                # the older caller gets what the newer request returns
+                future.add_done_callback(lambda f, p=previous.future: self.__chain(f, p))
+                # a superseded request keeps the higher priority of the two
+                if previous.priority.value < priority.value:
+                    request.priority = previous.priority
+            self.pending[coalesce] = request
+        heapq.heappush(self.queue, (request.priority.value, next(self.sequence), request))
+        self.__pump()
+        return future
+
+    def metrics(self):
+        queued = { p.name: 0 for p in RequestPriority }
+        for _, _, r in self.queue:
+            if not r.superseded:
+                queued[r.priority.name] += 1
+        waits = {}
+        for p in RequestPriority:
+            completed, total, longest = self.waits[p.value]
+            waits[p.name] = { "completed": completed, "avg_wait": (total / completed) if completed else 0.0, "max_wait": longest }
+        running = { p.name: self.running_by_priority[p.value] for p in RequestPriority }
+        return { "running": self.running, "running_by_priority": running, "queued": queued, "coalesced": self.coalesced, "waits": waits }
+
+    def stop(self):
+        for _, _, r in self.queue:
+            if not r.future.done():
+                r.future.cancel()
+        self.queue = []
+        self.pending.clear()
+
+    def __has_slot(self, priority: RequestPriority):
+        if priority in self.URGENT:
+            return self.running < self.max_concurrent + self.reserved_slots
+        others = self.running - sum(self.running_by_priority[p.value] for p in self.URGENT)
+        if others >= self.max_concurrent:
+            return False
+        if priority == RequestPriority.BACKGROUND:
+            return self.running_by_priority[priority.value] < self.background_slots
+        return True
+
+    def __pump(self):
+        # starts the best queued requests whose route and slot are free
+        deferred = []
+        while self.queue and self.running < self.max_concurrent + self.reserved_slots:
+            item = heapq.heappop(self.queue)
+            request = item[2]
+            if request.superseded or request.future.done():
+                continue
+            if (request.route is not None and request.route in self.busy_routes) or not self.__has_slot(request.priority):
+                deferred.append(item)
+                continue
+            if request.coalesce is not None and self.pending.get(request.coalesce) is request:
+                del self.pending[request.coalesce]
+            if request.route is not None:
+                self.busy_routes.add(request.route)
+            self.running += 1
+            self.running_by_priority[request.priority.value] += 1
+            asyncio.ensure_future(self.__run(request))
+        for item in deferred:
+            heapq.heappush(self.queue, item)
+
+    async def __run(self, request: RestRequest):
+        wait = asyncio.get_event_loop().time() - request.queued_at
+        stats = self.waits[request.priority.value]
+        stats[0] += 1
+        stats[1] += wait
+        stats[2] = max(stats[2], wait)
+        try:
+            result = await request.func(*request.args, **request.kwargs)
+            if not request.future.done():
+                request.future.set_result(result)
+        except asyncio.CancelledError:
+            request.future.cancel()
+        except Exception as ex:
+            if not request.future.done():
+                request.future.set_exception(ex)
+        finally:
+            self.running -= 1
+            self.running_by_priority[request.priority.value] -= 1
+            self.busy_routes.discard(request.route)
+            self.__pump()
+
+    @staticmethod
+    def __chain(source, target):
+        if target.done():
+            return
+        if source.cancelled():
+            target.cancel()
+        elif source.exception() is not None:
+            target.set_exception(source.exception())
+        else:
+            target.set_result(source.result())
+
+    @staticmethod
+    def __retrieve(future):
+        # callers that do not await the future handle failures with their own callback
+        if not future.cancelled():
+            future.exception()
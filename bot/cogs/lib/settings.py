@@ -2,16 +2,52 @@ import sys
 import os
 import traceback
 import glob
+import marshal
+import threading
 import typing
 from . import utils
 import json
 from . import dbprovider
+from . import stringtable
 
 class Settings:
+    # One shared, read only instance for the whole process. Settings() always returns it. The
+    # environment and app.manifest are read the first time, the language files only when the
+    # strings are first used.
     APP_VERSION = "1.0.0-snapshot"
     BITRATE_DEFAULT = 64
+    LANGUAGES_PATH = os.path.normpath(os.path.join(os.path.dirname(__file__), "../../../languages"))
+    # the parsed language files, reused until one of them changes
+    LANGUAGE_CACHE_FILE = "catalog.cache"
+    LANGUAGE_CACHE_VERSION = 1
 
-    def __init__(self):
+    _instance = None
+    _lock = threading.RLock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance.load()
+                    cls._instance = instance
+        return cls._instance
+
+    def __setattr__(self, name, value):
+        if self.__dict__.get("_frozen"):
+            raise AttributeError(f"Settings are read only, unable to set '{name}'")
+        super().__setattr__(name, value)
+
+    def __getattr__(self, name):
+        # only called for attributes that are not set, the language catalog is loaded on first use
+        if name in ("strings", "string_tables", "languages"):
+            with self._lock:
+                if "strings" not in self.__dict__:
+                    self.__dict__.update(self.load_language_catalog())
+                return self.__dict__[name]
+        raise AttributeError(f"'Settings' object has no attribute '{name}'")
+
+    def load(self):
         try:
             with open('app.manifest', encoding="UTF-8") as json_file:
                 self.__dict__.update(json.load(json_file))
@@ -19,46 +55,117 @@ class Settings:
             print(e, file=sys.stderr)
 
         self.db_url = utils.dict_get(os.environ, "VCB_MONGODB_URL", default_value="")
+        self.db_pool_size = int(utils.dict_get(os.environ, "VCB_MONGODB_POOL_SIZE", default_value="100"))
+        self.db_min_pool_size = int(utils.dict_get(os.environ, "VCB_MONGODB_MIN_POOL_SIZE", default_value="0"))
         self.db_path = utils.dict_get(os.environ, 'VCB_DB_PATH', default_value = 'voice.db')
 
         self.bot_owner = utils.dict_get(os.environ, 'BOT_OWNER', default_value= '262031734260891648')
         self.log_level = utils.dict_get(os.environ, 'LOG_LEVEL', default_value = 'DEBUG')
+        self.log_queue_size = int(utils.dict_get(os.environ, 'VCB_LOG_QUEUE_SIZE', default_value = '10000'))
+        self.log_batch_size = int(utils.dict_get(os.environ, 'VCB_LOG_BATCH_SIZE', default_value = '100'))
+        self.log_flush_interval = float(utils.dict_get(os.environ, 'VCB_LOG_FLUSH_INTERVAL', default_value = '5'))
+        # retention in days, 0 keeps everything
+        self.log_retention_days = int(utils.dict_get(os.environ, 'VCB_LOG_RETENTION_DAYS', default_value = '30'))
+        self.history_retention_days = int(utils.dict_get(os.environ, 'VCB_HISTORY_RETENTION_DAYS', default_value = '90'))
+        # when set, the mongo logs collection is capped at this size instead of using the ttl index
+        self.log_capped_size_mb = int(utils.dict_get(os.environ, 'VCB_LOG_CAPPED_SIZE_MB', default_value = '0'))
+        self.prune_interval = int(utils.dict_get(os.environ, 'VCB_PRUNE_INTERVAL', default_value = '60'))
+        # comma separated sink[:LEVEL] list, stdout,file,sqlite,mongo,null
+        self.log_sinks = utils.dict_get(os.environ, 'VCB_LOG_SINKS', default_value = '')
+        self.log_file = utils.dict_get(os.environ, 'VCB_LOG_FILE', default_value = 'logs/voicecreate.log')
+        self.log_file_max_bytes = int(utils.dict_get(os.environ, 'VCB_LOG_FILE_MAX_BYTES', default_value = '10485760'))
+        self.log_file_backup_count = int(utils.dict_get(os.environ, 'VCB_LOG_FILE_BACKUP_COUNT', default_value = '5'))
         self.language = utils.dict_get(os.environ, "LANGUAGE", default_value = "en-us").lower()
 
-        self.load_language_manifest()
-        self.load_strings()
+        # minutes between full sweeps of the tracked channels, voice events only check the channel that was left
+        self.reconcile_interval = int(utils.dict_get(os.environ, 'VCB_RECONCILE_INTERVAL', default_value = '15'))
+        # seconds an empty tracked channel is kept before it is deleted
+        self.channel_grace_period = float(utils.dict_get(os.environ, 'VCB_CHANNEL_GRACE_PERIOD', default_value = '5'))
+        # seconds a guild's event worker waits for new work before it is stopped
+        self.guild_actor_idle_timeout = float(utils.dict_get(os.environ, 'VCB_GUILD_ACTOR_IDLE_TIMEOUT', default_value = '60'))
+        # pooled channel sets created (or deleted) per minute across all guilds, and the largest pool a create channel can have
+        self.channel_pool_rate = float(utils.dict_get(os.environ, 'VCB_CHANNEL_POOL_RATE', default_value = '10'))
+        self.channel_pool_max = int(utils.dict_get(os.environ, 'VCB_CHANNEL_POOL_MAX', default_value = '10'))
+        # discord requests the bot has in flight at once, the rest wait in priority order
+        self.rest_concurrency = int(utils.dict_get(os.environ, 'VCB_REST_CONCURRENCY', default_value = '8'))
+        # optional remote source for the random channel name words, the bundled lists are used without it
+        self.random_words_url = utils.dict_get(os.environ, 'VCB_RANDOM_WORDS_URL', default_value = '')
+        self.random_words_refresh = int(utils.dict_get(os.environ, 'VCB_RANDOM_WORDS_REFRESH', default_value = '24'))
+        self.language_cache = utils.dict_get(os.environ, 'VCB_LANGUAGE_CACHE', default_value = 'true').lower() == 'true'
 
         dbp = utils.dict_get(os.environ, 'DB_PROVIDER', default_value = 'DEFAULT').upper()
         self.db_provider = dbprovider.DatabaseProvider[dbp]
         if not self.db_provider:
             self.db_provider = dbprovider.DatabaseProvider.DEFAULT
+        self._frozen = True
 
+    def load_language_catalog(self):
+        manifest_file = os.path.join(self.LANGUAGES_PATH, "manifest.json")
+        lang_files = sorted(f for f in glob.glob(os.path.join(self.LANGUAGES_PATH, "[a-z][a-z]-[a-z][a-z].json")) if os.path.isfile(f))
+        # the cache is only used while every source file has the same size and mtime
+        key = [ self.LANGUAGE_CACHE_VERSION ]
+        for f in [manifest_file] + lang_files:
+            if os.path.isfile(f):
+                stat = os.stat(f)
+                key.append((os.path.basename(f), stat.st_mtime_ns, stat.st_size))
+        cache_file = os.path.join(self.LANGUAGES_PATH, self.LANGUAGE_CACHE_FILE)
 
-    def load_strings(self):
-        self.strings = {}
+        catalog = None
+        if self.language_cache:
+            catalog = self.read_language_cache(cache_file, key)
+        if catalog is None:
+            catalog = { "languages": self.load_language_manifest(manifest_file), "strings": self.load_strings(lang_files) }
+            if self.language_cache:
+                self.write_language_cache(cache_file, key, catalog)
 
-        lang_files = glob.glob(os.path.join(os.path.dirname(__file__), "../../../languages", "[a-z][a-z]-[a-z][a-z].json"))
-        languages = [os.path.basename(f)[:-5] for f in lang_files if os.path.isfile(f)]
-        for lang in languages:
-            self.strings[lang] = {}
-            try:
-                lang_json = os.path.join("languages", f"{lang}.json")
-                if not os.path.exists(lang_json) or not os.path.isfile(lang_json):
-                    # THIS SHOULD NEVER GET HERE
-                    continue
+        # one table per language with the default language merged in underneath, so a lookup
+        # never has to fall back at runtime
+        fallback = catalog["strings"].get(self.language, {})
+        catalog["string_tables"] = { lang: stringtable.StringTable(lang, strings, fallback=fallback) for lang, strings in catalog["strings"].items() }
+        return catalog
+
+    def read_language_cache(self, path: str, key: list):
+        try:
+            if not os.path.isfile(path):
+                return None
+            with open(path, "rb") as cache:
+                cached = marshal.load(cache)
+            if cached.get("key") != key:
+                return None
+            return cached["catalog"]
+        except Exception as e:
+            # a stale or broken cache is rebuilt from the json files
+            print(e, file=sys.stderr)
+            return None
+
+    def write_language_cache(self, path: str, key: list, catalog: dict):
+        try:
+            temp = f"{path}.{os.getpid()}.tmp"
+            with open(temp, "wb") as cache:
+                marshal.dump({ "key": key, "catalog": catalog }, cache)
+            os.replace(temp, path)
+        except Exception as e:
+            # the languages folder may be read only, the catalog still works without the cache
+            print(e, file=sys.stderr)
 
+    def load_strings(self, langFiles: list):
+        strings = {}
+        for lang_json in langFiles:
+            lang = os.path.basename(lang_json)[:-5]
+            try:
                 with open(lang_json, encoding="UTF-8") as lang_file:
-                    self.strings[lang].update(json.load(lang_file))
+                    strings[lang] = json.load(lang_file)
             except Exception as e:
                 print(e, file=sys.stderr)
                 raise e
+        return strings
 
-    def load_language_manifest(self):
-        lang_manifest = os.path.join(os.path.dirname(__file__), "../../../languages/manifest.json")
-        self.languages = {}
-        if os.path.exists(lang_manifest):
-            with open(lang_manifest, encoding="UTF-8") as manifest_file:
-                self.languages.update(json.load(manifest_file))
+    def load_language_manifest(self, path: str):
+        languages = {}
+        if os.path.exists(path):
+            with open(path, encoding="UTF-8") as manifest_file:
+                languages.update(json.load(manifest_file))
+        return languages
 
 
 
@@ -89,17 +196,64 @@ class GuildSettings:
         self.prefix = prefix
         self.language = language
 
+class EffectiveChannelSettings:
+    # the settings a new channel is created with, after the user, category and guild settings are merged.
+    # name is None when the user has not saved one.
+    def __init__(self, guildId: int, categoryId: int, createChannelId: int, userId: int, name: str, limit: int, locked: bool, bitrate: int, defaultRole: typing.Union[str, int], useStage: bool):
+        self.guild_id = guildId
+        self.category_id = categoryId
+        self.create_channel_id = createChannelId
+        self.user_id = userId
+        self.name = name
+        self.limit = limit
+        self.locked = locked
+        self.bitrate = bitrate
+        self.default_role = defaultRole
+        self.use_stage = useStage
+
+    @staticmethod
+    def merge(guildId: int, categoryId: int, createChannelId: int, userId: int, guildSettings = None, categorySettings = None, userSettings = None, useStage: bool = False):
+        limit = 0
+        locked = False
+        bitrate = Settings.BITRATE_DEFAULT
+        name = None
+        if userSettings is None:
+            if categorySettings is not None:
+                limit = categorySettings.channel_limit
+                locked = categorySettings.channel_locked
+                bitrate = categorySettings.bitrate
+        else:
+            name = userSettings.channel_name
+            if categorySettings is None:
+                limit = userSettings.channel_limit
+                bitrate = userSettings.bitrate
+            else:
+                limit = userSettings.channel_limit or categorySettings.channel_limit
+                locked = categorySettings.channel_locked or False
+                bitrate = userSettings.bitrate or categorySettings.bitrate
+
+        default_role = None
+        if userSettings:
+            default_role = userSettings.default_role
+        elif categorySettings:
+            default_role = categorySettings.default_role
+        elif guildSettings:
+            default_role = guildSettings.default_role
+        return EffectiveChannelSettings(guildId=guildId, categoryId=categoryId, createChannelId=createChannelId, userId=userId, name=name, limit=limit, locked=locked, bitrate=bitrate, defaultRole=default_role, useStage=bool(useStage))
+
 class GuildCreateChannelSettings:
     def __init__(self, guildId: int):
         self.guild_id = guildId
         self.channels = []
 
 class GuildCategoryChannel:
-    def __init__(self, ownerId: int, categoryId: int, channelId: int, useStage: bool):
+    def __init__(self, ownerId: int, categoryId: int, channelId: int, useStage: bool, poolSize: int = 0):
         self.owner_id = int(ownerId)
         self.category_id = int(categoryId)
         self.channel_id = int(channelId)
         self.use_stage = useStage >= 1
+        # hidden channel sets kept ready for members joining this create channel
+        self.pool_size = int(poolSize or 0)
 
 class TrackedVoiceChannel:
     def __init__(self, guildId: int, ownerId: int, voiceChannelId: int):
@@ -4,35 +4,58 @@ import json
 import glob
 from typing import final
 
-from discord.ext.commands.converter import CategoryChannelConverter
 from . import database
 from . import settings
 from . import utils
 class SqliteDatabase(database.Database):
+    # applied once when the connection is created. WAL lets readers run while a write is
+    # in progress and NORMAL sync is still safe in WAL mode, it just skips an fsync per commit.
+    PRAGMAS = [
+        "PRAGMA journal_mode = WAL",
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA temp_store = MEMORY",
+        "PRAGMA cache_size = -16000",
+        "PRAGMA mmap_size = 268435456",
+        "PRAGMA busy_timeout = 5000"
+    ]
     def __init__(self):
         self.settings = settings.Settings()
         self.connection = None
         pass
     def open(self):
-        self.connection = sqlite3.connect(self.settings.db_path)
+        # one long lived connection. it is created on the main thread for the schema update
+        # and then only used from the single database worker thread of the ExecutorDatabase.
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.settings.db_path, check_same_thread=False)
+            for p in self.PRAGMAS:
+                self.connection.execute(p)
         pass
     def close(self):
+        # ends the unit of work. the connection stays open until shutdown
         try:
             if self.connection:
                 self.connection.commit()
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+        pass
+    def shutdown(self):
+        try:
+            if self.connection:
+                self.connection.commit()
+                self.connection.execute("PRAGMA optimize")
                 self.connection.close()
         except Exception as ex:
             print(ex)
-            traceback.print_exc(ex)
+            traceback.print_exc()
         finally:
             self.connection = None
-        pass
     def get_tracked_voice_channel_ids(self, guildId):
         try:
             if self.connection is None:
                 self.open()
             c = self.connection.cursor()
-            c.execute("SELECT voiceID FROM voiceChannel WHERE guildID = ?", (guildId,))
+            c.execute("SELECT voiceID FROM channelSet WHERE guildID = ?", (guildId,))
             items = [i[0] for i in c.fetchall()]
             return items
         except Exception as ex:
@@ -43,9 +66,8 @@ class SqliteDatabase(database.Database):
             if self.connection is None:
                 self.open()
             c = self.connection.cursor()
-            c.execute("SELECT voiceID FROM voiceChannel WHERE guildID = ? AND userID = ?", (guildId, ownerId,))
+            c.execute("SELECT voiceID FROM channelSet WHERE guildID = ? AND userID = ?", (guildId, ownerId,))
             channel_ids = [item for items in c.fetchall() for item in items]
-            print(json.dumps(channel_ids))
             return channel_ids
         except Exception as ex:
             print(ex)
@@ -67,7 +89,7 @@ class SqliteDatabase(database.Database):
             if self.connection is None:
                 self.open()
             c = self.connection.cursor()
-            c.execute("SELECT channelID FROM textChannel WHERE guildID = ? and voiceId = ?", (guildId, voiceChannelId))
+            c.execute("SELECT channelID FROM channelSet WHERE guildID = ? and voiceID = ?", (guildId, voiceChannelId))
             item = c.fetchone()
             if item:
                 return item[0]
@@ -80,7 +102,7 @@ class SqliteDatabase(database.Database):
             if self.connection is None:
                 self.open()
             c = self.connection.cursor()
-            c.execute("SELECT voiceID FROM textChannel WHERE guildID = ? and channelID = ?", (guildId, textChannelId))
+            c.execute("SELECT voiceID FROM channelSet WHERE guildID = ? and channelID = ?", (guildId, textChannelId))
             item = c.fetchone()
             if item:
                 return item[0]
@@ -93,8 +115,8 @@ class SqliteDatabase(database.Database):
             if self.connection is None:
                 self.open()
             c = self.connection.cursor()
-            c.execute('DELETE FROM voiceChannel WHERE guildID = ? and voiceId = ?', (guildId, voiceChannelId,))
-            c.execute('DELETE FROM textChannel WHERE guildID = ? and channelID = ?', (guildId, textChannelId,))
+            c.execute("INSERT INTO trackedChannelsHistory SELECT guildID, userID, voiceID, channelID, ? FROM channelSet WHERE guildID = ? AND (voiceID = ? OR channelID = ?)", (utils.get_timestamp(), guildId, voiceChannelId, textChannelId,))
+            c.execute('DELETE FROM channelSet WHERE guildID = ? AND (voiceID = ? OR channelID = ?)', (guildId, voiceChannelId, textChannelId,))
             self.connection.commit()
         except Exception as ex:
             print(ex)
@@ -106,15 +128,10 @@ class SqliteDatabase(database.Database):
             if self.connection is None:
                 self.open()
             c = self.connection.cursor()
-            c.execute("SELECT userID FROM voiceChannel WHERE guildID = ? AND voiceID = ?", (guildId, channelId,))
+            c.execute("SELECT userID FROM channelSet WHERE guildID = ? AND voiceID = ? UNION ALL SELECT userID FROM channelSet WHERE guildID = ? AND channelID = ?", (guildId, channelId, guildId, channelId,))
             item = c.fetchone()
             if item:
                 return int(item[0])
-            c.execute("SELECT userID FROM textChannel WHERE guildID = ? AND channelID = ?", (guildId, channelId,))
-            item = c.fetchone()
-            if item:
-                return int(item[0])
-
             return None
 
         except Exception as ex:
@@ -173,7 +190,7 @@ class SqliteDatabase(database.Database):
             stageInt = 0
             if useStage:
                 stageInt = 1
-            c.execute("INSERT INTO guild VALUES (?, ?, ?, ?, ?)", (guildId, ownerId, createChannelId, categoryId, stageInt))
+            c.execute("INSERT OR REPLACE INTO guild (guildID, ownerID, voiceChannelID, voiceCategoryID, useStage) VALUES (?, ?, ?, ?, ?)", (guildId, ownerId, createChannelId, categoryId, stageInt))
             self.connection.commit()
             return True
         except Exception as ex:
@@ -186,15 +203,15 @@ class SqliteDatabase(database.Database):
             if self.connection is None:
                 self.open()
             c = self.connection.cursor()
-            c.execute("SELECT ownerID, voiceChannelID, voiceCategoryID, useStage FROM guild WHERE guildID = ?", (guildId,))
+            c.execute("SELECT ownerID, voiceChannelID, voiceCategoryID, useStage, poolSize FROM guild WHERE guildID = ?", (guildId,))
             rows = c.fetchall()
             if rows:
                 result = settings.GuildCreateChannelSettings(guildId=guildId)
                 for r in rows:
-                    result.channels.append(settings.GuildCategoryChannel(ownerId=int(r[0]), categoryId=r[2], channelId=r[1], useStage=int(r[3])))
+                    result.channels.append(settings.GuildCategoryChannel(ownerId=int(r[0]), categoryId=r[2], channelId=r[1], useStage=int(r[3]), poolSize=r[4]))
                 return result
-            print("NO GUILD SETTINGS FOUND")
-            return None
+            # no create channels is an answer too, None is kept for errors
+            return settings.GuildCreateChannelSettings(guildId=guildId)
         except Exception as ex:
             print(ex)
             traceback.print_exc()
@@ -231,9 +248,9 @@ class SqliteDatabase(database.Database):
             c = self.connection.cursor()
             cat_settings = self.get_guild_category_settings(guildId=guildId, categoryId=categoryId)
             if cat_settings:
-                c.execute("UPDATE guildCategorySettings SET channelLimit = ?, channelLocked = ?, bitrate = ?, defaultRole = ? WHERE guildID = ? AND voiceCategoryID = ?", (channelLimit, channelLocked, bitrate, defaultRole, guildId, CategoryChannelConverter,))
+                c.execute("UPDATE guildCategorySettings SET channelLimit = ?, channelLocked = ?, bitrate = ?, defaultRole = ? WHERE guildID = ? AND voiceCategoryID = ?", (channelLimit, channelLocked, bitrate, defaultRole, guildId, categoryId,))
             else:
-                c.execute("INSERT INTO guildCategorySettings VALUES ( ?, ?, ?, ?, ?, ? )", (guildId, CategoryChannelConverter, channelLimit, channelLocked, bitrate, defaultRole,))
+                c.execute("INSERT OR REPLACE INTO guildCategorySettings VALUES ( ?, ?, ?, ?, ?, ? )", (guildId, categoryId, channelLimit, channelLocked, bitrate, defaultRole,))
             self.connection.commit()
             return True
         except Exception as ex:
@@ -301,7 +318,7 @@ class SqliteDatabase(database.Database):
             if self.connection is None:
                 self.open()
             c = self.connection.cursor()
-            c.execute("INSERT INTO userSettings VALUES (?, ?, ?, ?, ?, ?, ?)", (guildId, userId, channelName, channelLimit, bitrate, defaultRole, autoGame))
+            c.execute("INSERT OR REPLACE INTO userSettings VALUES (?, ?, ?, ?, ?, ?, ?)", (guildId, userId, channelName, channelLimit, bitrate, defaultRole, autoGame))
         except Exception as ex:
             print(ex)
             traceback.print_exc()
@@ -317,20 +334,67 @@ class SqliteDatabase(database.Database):
             if self.connection is None:
                 self.open()
             c = self.connection.cursor()
-            c.execute("INSERT INTO voiceChannel VALUES (?, ?, ?)", (guildId, ownerId, voiceChannelId,))
+            c.execute("INSERT INTO channelSet (guildID, userID, voiceID) VALUES (?, ?, ?) ON CONFLICT (guildID, voiceID) DO UPDATE SET userID = excluded.userID", (guildId, ownerId, voiceChannelId,))
+            self.connection.commit()
+            return True
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+            return False
+    def track_new_channel_set(self, guildId, ownerId, voiceChannelId, textChannelId):
+        try:
+            if self.connection is None:
+                self.open()
+            c = self.connection.cursor()
+            c.execute("INSERT OR REPLACE INTO channelSet (guildID, userID, voiceID, channelID) VALUES (?, ?, ?, ?)", (guildId, ownerId, voiceChannelId, textChannelId,))
+            self.connection.commit()
+            return True
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+            return False
+
+    def set_guild_create_channel_pool_size(self, guildId, createChannelId, poolSize: int):
+        try:
+            if self.connection is None:
+                self.open()
+            c = self.connection.cursor()
+            c.execute("UPDATE guild SET poolSize = ? WHERE guildID = ? AND voiceChannelID = ?", (poolSize, guildId, createChannelId,))
+            self.connection.commit()
+            return c.rowcount > 0
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+            return False
+    def get_pooled_channel_sets(self, guildId):
+        try:
+            if self.connection is None:
+                self.open()
+            c = self.connection.cursor()
+            c.execute("SELECT createChannelID, voiceID, channelID FROM channelPool WHERE guildID = ? ORDER BY timestamp", (guildId,))
+            return [ { "createChannelID": int(r[0]), "voiceID": int(r[1]), "channelID": int(r[2]) } for r in c.fetchall() ]
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+            return []
+    def insert_pooled_channel_set(self, guildId, createChannelId, voiceChannelId, textChannelId):
+        try:
+            if self.connection is None:
+                self.open()
+            c = self.connection.cursor()
+            c.execute("INSERT OR REPLACE INTO channelPool (guildID, createChannelID, voiceID, channelID, timestamp) VALUES (?, ?, ?, ?, ?)", (guildId, createChannelId, voiceChannelId, textChannelId, utils.get_timestamp(),))
         except Exception as ex:
             print(ex)
             traceback.print_exc()
         finally:
             if self.connection:
                 self.connection.commit()
-    def track_new_channel_set(self, guildId, ownerId, voiceChannelId, textChannelId):
+    def delete_pooled_channel_set(self, guildId, voiceChannelId):
         try:
             if self.connection is None:
                 self.open()
             c = self.connection.cursor()
-            c.execute("INSERT INTO voiceChannel VALUES (?, ?, ?)", (guildId, ownerId, voiceChannelId,))
-            c.execute("INSERT INTO textChannel VALUES (?, ?, ?, ?)", (guildId, ownerId, textChannelId, voiceChannelId,))
+            c.execute("DELETE FROM channelPool WHERE guildID = ? AND voiceID = ?", (guildId, voiceChannelId,))
         except Exception as ex:
             print(ex)
             traceback.print_exc()
@@ -343,19 +407,20 @@ class SqliteDatabase(database.Database):
             if self.connection is None:
                 self.open()
             c = self.connection.cursor()
-            c.execute("INSERT INTO textChannel VALUES (?, ?, ?, ?)", (guildId, ownerId, textChannelId, voiceChannelId,))
+            c.execute("INSERT INTO channelSet (guildID, userID, voiceID, channelID) VALUES (?, ?, ?, ?) ON CONFLICT (guildID, voiceID) DO UPDATE SET channelID = excluded.channelID", (guildId, ownerId, voiceChannelId, textChannelId,))
+            self.connection.commit()
+            return True
         except Exception as ex:
             print(ex)
             traceback.print_exc()
-        finally:
-            if self.connection:
-                self.connection.commit()
+            return False
     def delete_tracked_text_channel(self, guildId, voiceChannelId, textChannelId):
         try:
             if self.connection is None:
                 self.open()
             c = self.connection.cursor()
-            c.execute("DELETE FROM textChannel WHERE guildID = ? AND voiceID = ? AND channelID = ?", (guildId, voiceChannelId, textChannelId,))
+            c.execute("INSERT INTO trackedChannelsHistory SELECT guildID, userID, voiceID, channelID, ? FROM channelSet WHERE guildID = ? AND voiceID = ? AND channelID = ?", (utils.get_timestamp(), guildId, voiceChannelId, textChannelId,))
+            c.execute("UPDATE channelSet SET channelID = NULL WHERE guildID = ? AND voiceID = ? AND channelID = ?", (guildId, voiceChannelId, textChannelId,))
         except Exception as ex:
             print(ex)
             traceback.print_exc()
@@ -367,16 +432,13 @@ class SqliteDatabase(database.Database):
             if self.connection is None:
                 self.open()
             c = self.connection.cursor()
-            c.execute("SELECT voiceID, userID FROM voiceChannel WHERE guildID = ?", (guildId,))
-            voiceSets = c.fetchall()
+            c.execute("SELECT voiceID, channelID, userID FROM channelSet WHERE guildID = ?", (guildId,))
             voice_channels = []
-            for item in voiceSets:
-                voice_channels.append(settings.TrackedVoiceChannel(guildId=guildId, ownerId=item[1], voiceChannelId=item[0]))
-            c.execute("SELECT voiceID, channelID, userID FROM textChannel WHERE guildID = ?", (guildId,))
-            textSets = c.fetchall()
             text_channels = []
-            for item in textSets:
-                text_channels.append(settings.TrackedTextChannel(guildId=guildId, ownerId=item[2], voiceChannelId=item[0], textChannelId=item[1]))
+            for item in c.fetchall():
+                voice_channels.append(settings.TrackedVoiceChannel(guildId=guildId, ownerId=item[2], voiceChannelId=item[0]))
+                if item[1]:
+                    text_channels.append(settings.TrackedTextChannel(guildId=guildId, ownerId=item[2], voiceChannelId=item[0], textChannelId=item[1]))
             tracked = settings.TrackedChannels(voiceChannels=voice_channels, textChannels=text_channels)
             return tracked
         except Exception as ex:
@@ -387,7 +449,7 @@ class SqliteDatabase(database.Database):
             if self.connection is None:
                 self.open()
             c = self.connection.cursor()
-            c.execute("SELECT userID FROM voiceChannel WHERE guildID = ? AND voiceID = ?", (guildId, voiceChannelId,))
+            c.execute("SELECT userID FROM channelSet WHERE guildID = ? AND voiceID = ?", (guildId, voiceChannelId,))
             ownerSet = c.fetchone()
             if ownerSet:
                 return int(ownerSet[0])
@@ -395,22 +457,18 @@ class SqliteDatabase(database.Database):
         except Exception as ex:
             print(ex)
             traceback.print_exc()
-        finally:
-            if self.connection:
-                self.connection.commit()
     def update_tracked_channel_owner(self, guildId, voiceChannelId, ownerId, newOwnerId):
         try:
             if self.connection is None:
                 self.open()
             c = self.connection.cursor()
-            c.execute("UPDATE voiceChannel SET userID = ? WHERE guildId = ? AND voiceID = ? AND userID = ?", (newOwnerId, guildId, voiceChannelId, ownerId,))
-            c.execute("UPDATE textChannel SET userID = ? WHERE guildId = ? AND voiceID = ? AND userID = ?", (newOwnerId, guildId, voiceChannelId, ownerId,))
+            c.execute("UPDATE channelSet SET userID = ? WHERE guildID = ? AND voiceID = ? AND userID = ?", (newOwnerId, guildId, voiceChannelId, ownerId,))
+            self.connection.commit()
+            return c.rowcount > 0
         except Exception as ex:
             print(ex)
             traceback.print_exc()
-        finally:
-            if self.connection:
-                self.connection.commit()
+            return False
     def clean_guild_user_settings(self, guildId):
         try:
             if self.connection is None:
@@ -435,6 +493,33 @@ class SqliteDatabase(database.Database):
         finally:
             if self.connection:
                 self.connection.commit()
+    def get_effective_channel_settings(self, guildId, categoryId, createChannelId, userId):
+        try:
+            if self.connection is None:
+                self.open()
+            c = self.connection.cursor()
+            c.execute("""SELECT u.userID, u.channelName, u.channelLimit, u.bitrate, u.defaultRole, u.auto_game,
+                    gc.voiceCategoryID, gc.channelLimit, gc.channelLocked, gc.bitrate, gc.defaultRole,
+                    g.useStage, gs.defaultRole
+                FROM (SELECT ? AS guildID) AS k
+                LEFT JOIN guild g ON g.guildID = k.guildID AND g.voiceChannelID = ? AND g.voiceCategoryID = ?
+                LEFT JOIN guildCategorySettings gc ON gc.guildID = k.guildID AND gc.voiceCategoryID = ?
+                LEFT JOIN userSettings u ON u.guildID = k.guildID AND u.userID = ?
+                LEFT JOIN guildSettings gs ON gs.guildID = k.guildID""", (guildId, createChannelId, categoryId, categoryId, userId,))
+            row = c.fetchone()
+            user_settings = None
+            category_settings = None
+            guild_settings = None
+            if row[0] is not None:
+                user_settings = settings.UserSettings(guildId=guildId, userId=userId, channelName=row[1], channelLimit=int(row[2] or 0), bitrate=int(row[3] or 0), defaultRole=row[4], autoGame=bool(row[5]))
+            if row[6] is not None:
+                category_settings = settings.GuildCategorySettings(guildId=guildId, categoryId=categoryId, channelLimit=int(row[7] or 0), channelLocked=int(row[8] or 0), bitrate=int(row[9] or 0), defaultRole=row[10])
+            if row[12] is not None:
+                guild_settings = settings.GuildSettings(guildId=guildId, prefix=None, defaultRole=row[12], adminRole=None, language=None)
+            return settings.EffectiveChannelSettings.merge(guildId, categoryId, createChannelId, userId, guildSettings=guild_settings, categorySettings=category_settings, userSettings=user_settings, useStage=bool(row[11]))
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
     def get_default_role(self, guildId, categoryId, userId):
         try:
             user_settings = self.get_user_settings(guildId=guildId, userId=userId)
@@ -455,7 +540,7 @@ class SqliteDatabase(database.Database):
             c = self.connection.cursor()
             user_settings = self.get_user_settings(guildId=guildId, userId=userId)
             if user_settings:
-                c.execute("UPDATE userSettings SET defaultRole = ? WHERE WHERE guildID = ? and userId = ?", (defaultRole, guildId, userId))
+                c.execute("UPDATE userSettings SET defaultRole = ? WHERE guildID = ? and userId = ?", (defaultRole, guildId, userId))
                 return True
             else:
                 return False
@@ -472,7 +557,7 @@ class SqliteDatabase(database.Database):
             c = self.connection.cursor()
             category_settings = self.get_guild_category_settings(guildId=guildId, categoryId=categoryId)
             if category_settings:
-                c.execute("UPDATE guildCategorySettings SET defaultRole = ? WHERE WHERE guildID = ? and voiceCategoryID = ?", (defaultRole, guildId, categoryId))
+                c.execute("UPDATE guildCategorySettings SET defaultRole = ? WHERE guildID = ? and voiceCategoryID = ?", (defaultRole, guildId, categoryId))
                 return True
             else:
                 return False
@@ -493,7 +578,8 @@ class SqliteDatabase(database.Database):
             print(f"LOADED SCHEMA VERSION: {dbversion}")
             print(f"CURRENT SCHEMA VERSION: {newDBVersion}")
             for x in range(0, newDBVersion+1):
-                files = glob.glob(f"database/sql/{x:04d}.*.sql")
+                # sorted so the table creation scripts (NNNN.0-*) run before the alters for the same version
+                files = sorted(glob.glob(f"database/sql/{x:04d}.*.sql"))
                 for f in files:
                     if dbversion == 0 or dbversion < x:
                         print(f"Applying SQL: {f}")
@@ -521,9 +607,9 @@ class SqliteDatabase(database.Database):
                 self.open()
             c = self.connection.cursor()
             result = []
-            rows = c.execute("SELECT guildID, ownerID, voiceChannelID, voiceCategoryID, useStage FROM guild")
+            rows = c.execute("SELECT guildID, ownerID, voiceChannelID, voiceCategoryID, useStage, poolSize FROM guild")
             for r in rows:
-                result.append({ "guildID": int(r[0]), "ownerID": int(r[1]), "voiceChannelID": int(r[2]), "voiceCategoryID": int(r[3]), "useStage": bool(r[4]) })
+                result.append({ "guildID": int(r[0]), "ownerID": int(r[1]), "voiceChannelID": int(r[2]), "voiceCategoryID": int(r[3]), "useStage": bool(r[4]), "poolSize": int(r[5] or 0) })
             return result
         except Exception as ex:
             print(ex)
@@ -570,7 +656,8 @@ class SqliteDatabase(database.Database):
                 self.open()
             c = self.connection.cursor()
             result = []
-            rows = c.execute("SELECT guildID, userID, channelID, voiceID FROM textChannel")
+            # the textChannel table stopped receiving writes when channelSet replaced it
+            rows = c.execute("SELECT guildID, userID, channelID, voiceID FROM channelSet WHERE channelID IS NOT NULL")
             for r in rows:
                 result.append({ "guildID": int(r[0]), "userID": int(r[1]), "channelID": int(r[2]), "voiceID": int(r[3]) })
             return result
@@ -587,9 +674,10 @@ class SqliteDatabase(database.Database):
                 self.open()
             c = self.connection.cursor()
             result = []
-            rows = c.execute("SELECT guildID, userID, voiceID FROM voiceChannel")
+            # the voiceChannel table stopped receiving writes when channelSet replaced it
+            rows = c.execute("SELECT guildID, userID, voiceID FROM channelSet")
             for r in rows:
-                result.append({ "guildID": int(r[0]), "userID": int(r[1]), "voiceID": int(r[3]) })
+                result.append({ "guildID": int(r[0]), "userID": int(r[1]), "voiceID": int(r[2]) })
             return result
 
         except Exception as ex:
@@ -599,8 +687,63 @@ class SqliteDatabase(database.Database):
             if self.connection:
                 self.close()
     def get_all_guild_settings(self):
-        pass
+        # guild settings are not stored in sqlite. an empty list, None means the query failed
+        return []
     def insert_log(self, guildId: int, level: str, method: str, message: str, stack: str = None):
-        pass
+        try:
+            if self.connection is None:
+                self.open()
+            c = self.connection.cursor()
+            c.execute("INSERT INTO logs VALUES (?, ?, ?, ?, ?, ?)", (guildId, utils.get_timestamp(), level.name, method, message, stack))
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+        finally:
+            if self.connection:
+                self.connection.commit()
+    def insert_logs(self, logs: list):
+        try:
+            if self.connection is None:
+                self.open()
+            if logs:
+                c = self.connection.cursor()
+                c.executemany("INSERT INTO logs VALUES (?, ?, ?, ?, ?, ?)", [ (l['guild_id'], l['timestamp'], l['level'], l['method'], l['message'], l['stack_trace']) for l in logs ])
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+        finally:
+            if self.connection:
+                self.connection.commit()
     def clear_log(self, guildId: int):
-        pass
+        try:
+            if self.connection is None:
+                self.open()
+            c = self.connection.cursor()
+            c.execute("DELETE FROM logs WHERE guildID = ?", (guildId,))
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+        finally:
+            if self.connection:
+                self.connection.commit()
+    def prune(self, logRetentionDays: int, historyRetentionDays: int):
+        # sqlite has no ttl, the rows older than the retention are deleted on a timer instead
+        try:
+            if self.connection is None:
+                self.open()
+            c = self.connection.cursor()
+            now = utils.get_timestamp()
+            removed = 0
+            if logRetentionDays > 0:
+                c.execute("DELETE FROM logs WHERE timestamp < ?", (now - logRetentionDays * 86400,))
+                removed += c.rowcount
+            if historyRetentionDays > 0:
+                c.execute("DELETE FROM trackedChannelsHistory WHERE timestamp < ?", (now - historyRetentionDays * 86400,))
+                removed += c.rowcount
+            return removed
+        except Exception as ex:
+            print(ex)
+            traceback.print_exc()
+        finally:
+            if self.connection:
+                self.connection.commit()
@@ -0,0 +1,43 @@
+import re
+
+class StringTemplate():
+    # a localized string split once into literal text and {placeholder} names, so rendering
+    # is a join instead of a str.replace per argument
+    PLACEHOLDER = re.compile(r"\{([a-zA-Z_][a-zA-Z0-9_]*)\}")
+    __slots__ = ("text", "parts")
+
+    def __init__(self, text: str):
+        self.text = text
+        # literals at even indexes, placeholder names at odd indexes
+        self.parts = self.PLACEHOLDER.split(text)
+
+    def render(self, **kwargs):
+        if len(self.parts) == 1:
+            return self.text
+        result = []
+        for i, p in enumerate(self.parts):
+            if i % 2 == 0:
+                result.append(p)
+            elif p in kwargs:
+                result.append(str(kwargs[p]))
+            else:
+                # like str_replace, placeholders without a value are left as they are
+                result.append(f"{{{p}}}")
+        return "".join(result)
+
+class StringTable():
+    # every string of one language with the fallback language already merged in, and a
+    # compiled template for each of them
+    def __init__(self, language: str, strings: dict, fallback: dict = None):
+        self.language = language
+        self.strings = { **(fallback or {}), **strings }
+        self.templates = { k: StringTemplate(v) for k, v in self.strings.items() if isinstance(v, str) }
+
+    def get(self, key: str):
+        return self.strings.get(key)
+
+    def render(self, key: str, **kwargs):
+        template = self.templates.get(key)
+        if template is None:
+            return None
+        return template.render(**kwargs)
@@ -6,7 +6,6 @@ import sys
 import os
 import glob
 import typing
-import requests
 import random
 import re
 import datetime
@@ -35,60 +34,23 @@ def chunk_list(lst, size):
     for i in range(0, len(lst), size):
         yield lst[i:i + size]
 
-def get_random_name(noun_count = 1, adjective_count = 1):
-    try:
-        adjectives = load_from_gist("adjectives", adjective_count)
-        nouns = load_from_gist("nouns", noun_count)
-        results = adjectives + nouns
-        return " ".join(w.title() for w in results)
-    except Exception as ex:
-        print(ex)
-        traceback.print_exc()
-        try:
-            nouns = requests.get(f"https://random-word-form.herokuapp.com/random/noun?count={str(noun_count)}").json()
-            adjectives = requests.get(f"https://random-word-form.herokuapp.com/random/adjective?count={str(adjective_count)}").json()
-            results = adjectives + nouns
-            print("FROM random-word-form")
-            return " ".join(w.title() for w in results)
-        except Exception as ex:
-            print(ex)
-            traceback.print_exc()
-            try:
-                print("FROM random-word-api")
-                results = requests.get(f"https://random-word-api.herokuapp.com/word?number={str(noun_count + adjective_count)}&swear=0").json()
-                return " ".join(w.title() for w in results)
-            except Exception as ex:
-                print(ex)
-                traceback.print_exc()
-                return "New Voice Channel"
+def get_random_name(noun_count = 1, adjective_count = 1, language: str = None):
+    from . import namegenerator
+    return namegenerator.get_generator().get_random_name(nounCount=noun_count, adjectiveCount=adjective_count, language=language)
 
 def to_timestamp(date):
     return (date - datetime.datetime(1970,1,1)).total_seconds()
 def get_timestamp():
     return to_timestamp(datetime.datetime.now())
 
-def load_from_gist(type, count):
-    types = [ "adjectives", "nouns", "verbs" ]
-    if type not in types:
-        type = "nouns"
-    if count <= 0:
-        count = 1
-    elif count > 10:
-        count = 10
-    data = requests.get(f"https://gist.githubusercontent.com/camalot/8d2af3796ac86083e873995eab98190d/raw/b39de3a6ba03205380caf5d58e0cae8a869ac36d/{type}.js").text
-    data = re.sub(r"(var\s(adjectives|nouns|verbs)\s=\s)|;$","", data)
-    jdata = json.loads(data)
-    return random.sample(jdata, count)
-
 def get_args_dict(func, args, kwargs):
     args_names = func.__code__.co_varnames[:func.__code__.co_argcount]
     return {**dict(zip(args_names, args)), **kwargs}
 
 def str_replace(input_string: str, *args, **kwargs):
-    xargs = get_args_dict(str_replace, args, kwargs)
     result = input_string
-    for a in xargs:
-        result = result.replace(f"{{{a}}}", kwargs[a])
+    for k, v in kwargs.items():
+        result = result.replace(f"{{{k}}}", v)
     return result
 
 def get_by_name_or_id(iterable, nameOrId: typing.Union[int, str]):
@@ -24,14 +24,10 @@ class Slash(commands.Cog):
         self.bot = bot
         # slash = self.bot.slash
         self.settings = settings.Settings()
-        log_level = loglevel.LogLevel[self.settings.log_level.upper()]
-        if not log_level:
-            log_level = loglevel.LogLevel.DEBUG
-
-        self.log = logger.Log(minimumLogLevel=log_level)
+        self.log = bot.log
         self.log.debug(0, "slash.__init__", f"DB Provider {self.settings.db_provider.name}")
         self.log.debug(0, "slash.__init__", f"SQLITE DB Path: {self.settings.db_path}")
-        self.log.debug(0, "slash.__init__", f"Logger initialized with level {log_level.name}")
+        self.log.debug(0, "slash.__init__", f"Logger initialized with level {self.log.minimum_log_level.name}")
 
     def cog_unload(self):
         self.bot.slash.remove_cog_commands(self)
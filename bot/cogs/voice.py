@@ -4,6 +4,7 @@ import asyncio
 import json
 import datetime
 from discord.ext import commands
+from discord.ext import tasks
 import traceback
 from urllib.parse import quote
 from discord.ext.commands.core import guild_only
@@ -19,12 +20,15 @@ import glob
 import typing
 from .lib import utils
 from .lib import settings
-from .lib import sqlite
-from .lib import mongo
 from .lib import logger
 from .lib import loglevel
-from .lib import dbprovider
-import inspect
+from .lib import logcontext
+from .lib import stringtable
+from .lib import reaper
+from .lib import guildactor
+from .lib import channelpool
+from .lib import restscheduler
+from .lib import requestpriority
 class EmbedField():
     def __init__(self, name, value):
         self.name = name
@@ -34,38 +38,119 @@ class voice(commands.Cog):
     def __init__(self, bot):
         self.settings = settings.Settings()
         self.bot = bot
-        if self.settings.db_provider == dbprovider.DatabaseProvider.SQLITE:
-            self.db = sqlite.SqliteDatabase()
-        elif self.settings.db_provider == dbprovider.DatabaseProvider.MONGODB:
-            self.db = mongo.MongoDatabase()
-        else:
-            self.db = mongo.MongoDatabase()
-
-        log_level = loglevel.LogLevel[self.settings.log_level.upper()]
-        if not log_level:
-            log_level = loglevel.LogLevel.DEBUG
+        # the provider is created once by the bot. every call on it is awaitable.
+        self.db = bot.db
 
-        self.log = logger.Log(minimumLogLevel=log_level)
+        self.log = bot.log
         self.log.debug(0, "voice.__init__", f"DB Provider {self.settings.db_provider.name}")
-        self.log.debug(0, "voice.__init__", f"Logger initialized with level {log_level.name}")
+        self.log.debug(0, "voice.__init__", f"Logger initialized with level {self.log.minimum_log_level.name}")
 
 
+        # guild_id -> StringTable of the guild's language
         self.strings = {}
+        self.default_strings = self.settings.string_tables.get(self.settings.language) or stringtable.StringTable(self.settings.language, {})
+
+        # voice events only check the channel that was left, this catches anything they missed
+        self.reconcile_tracked_channels.change_interval(minutes=self.settings.reconcile_interval)
+        # empty tracked channels are deleted after a grace period, unless someone joins again
+        self.reaper = reaper.ChannelReaper(self.queue_reap_tracked_channels, gracePeriod=self.settings.channel_grace_period)
+        # guild_id -> queue and worker, the state changing event handlers of a guild never overlap
+        self.actors = guildactor.GuildActors(idleTimeout=self.settings.guild_actor_idle_timeout)
+        # hidden channel sets kept ready for create channels with a pool size
+        self.pool = channelpool.ChannelPool(self.fill_channel_pool, self.drain_channel_pool, ratePerMinute=self.settings.channel_pool_rate)
+        # channel_id -> name the bot gave a pooled channel it is claiming, its update event is not a manual rename
+        self.claimed_names = {}
+        # every Discord call of the cog is sent from here, moves and creates first, cleanup last
+        self.rest = restscheduler.RestScheduler(maxConcurrent=self.settings.rest_concurrency)
+
+    def cog_unload(self):
+        self.reconcile_tracked_channels.cancel()
+        self.reaper.stop()
+        self.actors.stop()
+        self.pool.stop()
+        self.rest.stop()
+
+    @tasks.loop(minutes=15)
+    @logcontext.log_method
+    async def reconcile_tracked_channels(self):
+        _method = logcontext.current_method()
+        # every guild sweeps on its own queue, so the sweeps run side by side
+        await asyncio.gather(*[ self.actors.submit(guild.id, self.clean_up_tracked_channels, guild.id) for guild in self.bot.guilds ], return_exceptions=True)
+        metrics = self.actors.metrics()
+        self.log.debug(0, _method, f"Guild queues: {metrics['actors']} active, {metrics['queued']} queued, {metrics['max_depth']} max depth, {metrics['processed']} processed, {metrics['reaped']} idle workers stopped")
+        pool = self.pool.metrics()
+        if pool['pools']:
+            self.log.debug(0, _method, f"Channel pools: {pool['ready']}/{pool['wanted']} sets ready in {pool['pools']} pools, {pool['taken']} taken, {pool['missed']} joins found an empty pool")
+        rest = self.rest.metrics()
+        waits = ", ".join(f"{k.lower()} {v['completed']} sent avg {v['avg_wait']*1000:.0f}ms max {v['max_wait']*1000:.0f}ms" for k, v in rest['waits'].items() if v['completed'])
+        self.log.debug(0, _method, f"Discord requests: {rest['running']} running, {sum(rest['queued'].values())} queued, {rest['coalesced']} coalesced. Queue wait: {waits or 'none'}")
+
+    @reconcile_tracked_channels.before_loop
+    async def before_reconcile_tracked_channels(self):
+        # on_ready already swept every guild, wait one interval before the first pass
+        await self.bot.wait_until_ready()
+        await asyncio.sleep(self.settings.reconcile_interval * 60)
+
+    async def clean_up_tracked_channel(self, guildId: int, voiceChannel):
+        # a member left voiceChannel. only that channel is checked, from the gateway cache, and
+        # when it is empty it is handed to the reaper instead of being deleted right away.
+        _method = logcontext.current_method()
+        try:
+            if len(voiceChannel.voice_states) > 0:
+                return
+            owner_id = await self.db.get_tracked_channel_owner(guildId=guildId, voiceChannelId=voiceChannel.id)
+            if owner_id is None:
+                return
+            if self.reaper.schedule(guildId, voiceChannel.id):
+                self.log.debug(guildId, _method , f"Channel {voiceChannel} is empty, deleting in {self.settings.channel_grace_period} seconds")
+        except Exception as ex:
+            self.log.error(guildId, _method, str(ex), traceback.format_exc())
+
+    async def queue_reap_tracked_channels(self, guildId: int, channelIds: list):
+        await self.actors.submit(guildId, self.reap_tracked_channels, guildId, channelIds)
+
+    @logcontext.log_method
+    async def reap_tracked_channels(self, guildId: int, channelIds: list):
+        # called by the reaper with every channel of the guild whose grace period ran out
+        _method = logcontext.current_method()
+        deletes = []
+        for voiceChannelId in channelIds:
+            voiceChannel = self.bot.get_channel(voiceChannelId)
+            if voiceChannel and len(voiceChannel.voice_states) > 0:
+                # someone came back without the join cancelling the deletion
+                continue
+            owner_id = await self.db.get_tracked_channel_owner(guildId=guildId, voiceChannelId=voiceChannelId)
+            if owner_id is None:
+                # already cleaned up
+                continue
+            textChannelId = await self.db.get_text_channel_id(guildId, voiceChannelId)
+            self.log.debug(guildId, _method , f"Deleting Channel {voiceChannel or voiceChannelId} because everyone left")
+            await self.db.clean_tracked_channels(guildId, voiceChannelId, textChannelId)
+            textChannel = self.bot.get_channel(textChannelId) if textChannelId else None
+            if textChannel:
+                deletes.append(self.delete_channel(textChannel))
+            if voiceChannel:
+                deletes.append(self.delete_channel(voiceChannel))
+        for result in await asyncio.gather(*deletes, return_exceptions=True):
+            if isinstance(result, discord.errors.NotFound):
+                self.log.debug(guildId, _method , f"Channel Not Found. Already Cleaned Up")
+            elif isinstance(result, Exception):
+                self.log.error(guildId, _method, str(result), "".join(traceback.format_exception(type(result), result, result.__traceback__)))
 
     async def clean_up_tracked_channels(self, guildID):
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         self.log.debug(guildID, _method , "Clean up tracked channels")
-        self.db.open()
+        await self.db.open()
         try:
             self.log.debug(guildID, _method , "checking guild create channels")
-            guildSettings = self.db.get_guild_create_channel_settings(guildId=guildID)
+            guildSettings = await self.db.get_guild_create_channel_settings(guildId=guildID)
             if guildSettings and guildSettings.channels:
                 for cc in guildSettings.channels:
                     cc_channel = await self.get_or_fetch_channel(cc.channel_id)
                     if not cc_channel:
                         # delete this channel as it no longer exists.
                         self.log.debug(guildID, _method , f"Deleting create channel {cc.channel_id} as it does not exist")
-                        self.db.delete_guild_create_channel(guildId=guildID, channelId=cc.channel_id, categoryId=cc.category_id)
+                        await self.db.delete_guild_create_channel(guildId=guildID, channelId=cc.channel_id, categoryId=cc.category_id)
                         pass
                     else:
                         # check the category and update if necessary
@@ -77,63 +162,157 @@ class voice(commands.Cog):
                             # check if the category is the same that we have tracked
                             if cc.category_id != cc_category.id:
                                 self.log.debug(guildID, _method , "Category ID is different")
-                                self.db.update_guild_create_channel_settings(guildId=guildID, createChannelId=cc.channel_id, categoryId=cc_category.id, ownerId=cc.owner_id, useStage=cc.use_stage)
+                                await self.db.update_guild_create_channel_settings(guildId=guildID, createChannelId=cc.channel_id, categoryId=cc_category.id, ownerId=cc.owner_id, useStage=cc.use_stage)
             self.log.debug(guildID, _method , "checking user created channels")
-            trackedChannels = self.db.get_tracked_voice_channel_ids(guildID)
+            trackedChannels = await self.db.get_tracked_voice_channel_ids(guildID)
             for vc in trackedChannels:
                 textChannel = None
                 voiceChannelId = vc
                 if voiceChannelId:
                     voiceChannel = await self.get_or_fetch_channel(voiceChannelId)
 
-                    textChannelId = self.db.get_text_channel_id(guildID, voiceChannelId)
+                    textChannelId = await self.db.get_text_channel_id(guildID, voiceChannelId)
                     if textChannelId:
                         textChannel = await self.get_or_fetch_channel(textChannelId)
 
                     if voiceChannel:
                         if len(voiceChannel.members) == 0 and len(voiceChannel.voice_states) == 0:
                             self.log.debug(guildID, _method , f"Start Tracked Cleanup: {voiceChannelId}")
-                            self.log.debug(guildID, _method , f"Deleting Channel {voiceChannel} because everyone left")
-                            self.db.clean_tracked_channels(guildID, voiceChannelId, textChannelId)
-                            if textChannel:
-                                await textChannel.delete()
-                            await voiceChannel.delete()
+                            self.reaper.schedule(guildID, voiceChannelId)
                     else:
                         self.log.debug(guildID, _method , f"Unable to find voice channel: {voiceChannelId}")
-                        self.db.clean_tracked_channels(guildID, voiceChannelId, textChannelId)
+                        await self.db.clean_tracked_channels(guildID, voiceChannelId, textChannelId)
         except discord.errors.NotFound as nf:
             self.log.warn(guildID, _method, str(nf), traceback.format_exc())
             self.log.debug(guildID, _method , f"Channel Not Found. Already Cleaned Up")
         except Exception as ex:
             self.log.error(guildID, _method, str(ex), traceback.format_exc())
         finally:
-             self.db.close()
+             await self.db.close()
 
     @commands.group()
+    @logcontext.log_method
     async def voice(self, ctx):
         pass
 
     @commands.Cog.listener()
+    @logcontext.log_method
     async def on_ready(self):
+        await self.db.warm([g.id for g in self.bot.guilds])
         for guild in self.bot.guilds:
             await self.clean_up_tracked_channels(guild.id)
-            self.set_guild_strings(guild.id)
+            await self.set_guild_strings(guild.id)
+            await self.load_channel_pool(guild.id)
+        self.reaper.start()
+        self.pool.start()
+        if not self.reconcile_tracked_channels.is_running():
+            self.reconcile_tracked_channels.start()
+
+
+    @logcontext.log_method
+    async def load_channel_pool(self, guildId: int):
+        # adopts the pooled sets that survived a restart and sets the size of every pool
+        _method = logcontext.current_method()
+        try:
+            create_channels = await self.db.get_guild_create_channel_settings(guildId)
+            for c in create_channels.channels if create_channels else []:
+                self.pool.set_size(guildId, c.channel_id, min(c.pool_size, self.settings.channel_pool_max))
+            for r in await self.db.get_pooled_channel_sets(guildId) or []:
+                voiceChannel = self.bot.get_channel(r['voiceID'])
+                textChannel = self.bot.get_channel(r['channelID'])
+                if voiceChannel and textChannel:
+                    # sets of pools that got smaller or were removed are drained by the pool
+                    self.pool.add(guildId, r['createChannelID'], r['voiceID'], r['channelID'])
+                    continue
+                self.log.debug(guildId, _method, f"Dropping incomplete pooled channel set {r['voiceID']}")
+                await self.drain_channel_pool(guildId, r['voiceID'], r['channelID'])
+        except Exception as ex:
+            self.log.error(guildId, _method, str(ex), traceback.format_exc())
+
+    def get_pooled_overwrites(self, guild):
+        # hidden from everyone but the bot until claimed, the claim replaces all of them
+        return {
+            guild.default_role: discord.PermissionOverwrite(view_channel=False),
+            guild.me: discord.PermissionOverwrite(view_channel=True, connect=True)
+        }
+
+    @logcontext.log_method
+    async def fill_channel_pool(self, guildId: int, createChannelId: int):
+        # called by the pool for every set it is missing, returns the ids of the new set
+        _method = logcontext.current_method()
+        guild = self.bot.get_guild(guildId)
+        sourceChannel = self.bot.get_channel(createChannelId)
+        if guild is None or sourceChannel is None or await self.db.get_create_channel(guildId, createChannelId) is None:
+            # the bot left the guild or the create channel is gone
+            self.pool.set_size(guildId, createChannelId, 0)
+            return None
+        overwrites = self.get_pooled_overwrites(guild)
+        reason = f"Channel pool of {sourceChannel}"
+        # behind everything members are waiting on, a pool is only filled when nothing else is queued.
+        # a route of its own, a fill sleeping on a rate limit does not hold up a member's create
+        route = ("guild", guildId, "pool")
+        voiceChannel, textChannel = await asyncio.gather(
+            self.rest.submit(requestpriority.RequestPriority.BACKGROUND, route, guild.create_voice_channel, sourceChannel.name, category=sourceChannel.category, overwrites=overwrites, reason=reason),
+            self.rest.submit(requestpriority.RequestPriority.BACKGROUND, route, guild.create_text_channel, sourceChannel.name, category=sourceChannel.category, overwrites=overwrites, reason=reason),
+            return_exceptions=True)
+        failed = [ c for c in [voiceChannel, textChannel] if isinstance(c, BaseException) ]
+        if failed:
+            ex = failed[0]
+            self.log.error(guildId, _method, str(ex), "".join(traceback.format_exception(type(ex), ex, ex.__traceback__)))
+            await asyncio.gather(*[ self.delete_channel(c, requestpriority.RequestPriority.BACKGROUND) for c in [voiceChannel, textChannel] if not isinstance(c, BaseException) ], return_exceptions=True)
+            return None
+        await self.db.insert_pooled_channel_set(guildId, createChannelId, voiceChannel.id, textChannel.id)
+        self.log.debug(guildId, _method, f"Added pooled channel set {voiceChannel.id} for {sourceChannel}")
+        return voiceChannel.id, textChannel.id
+
+    @logcontext.log_method
+    async def drain_channel_pool(self, guildId: int, voiceChannelId: int, textChannelId: int):
+        _method = logcontext.current_method()
+        await self.db.delete_pooled_channel_set(guildId, voiceChannelId)
+        channels = [ self.bot.get_channel(voiceChannelId), self.bot.get_channel(textChannelId) ]
+        for result in await asyncio.gather(*[ self.delete_channel(c, requestpriority.RequestPriority.BACKGROUND) for c in channels if c ], return_exceptions=True):
+            if isinstance(result, Exception) and not isinstance(result, discord.errors.NotFound):
+                self.log.error(guildId, _method, str(result), "".join(traceback.format_exception(type(result), result, result.__traceback__)))
 
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        pooled = self.pool.remove(channel.guild.id, channel.id)
+        if pooled:
+            await self.drain_channel_pool(channel.guild.id, pooled[0], pooled[1])
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before, after):
+        if before.name != after.name:
+            self.db.invalidate_admin(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role):
+        self.db.invalidate_admin(role.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role):
+        self.db.invalidate_admin(role.guild.id)
 
     @commands.Cog.listener()
     async def on_member_update(self, before, after):
+        if before.roles != after.roles:
+            self.db.invalidate_admin(after.guild.id, after.id)
+        self.actors.submit(after.guild.id, self.handle_member_update, before, after)
+
+    @logcontext.log_method
+    async def handle_member_update(self, before, after):
         try:
-            _method = inspect.stack()[1][3]
+            _method = logcontext.current_method()
             guild_id = after.guild.id
             if not after:
                 return
             is_in_channel = after is not None and after.voice is not None and after.voice.channel is not None
             if is_in_channel:
-                self.db.open()
+                await self.db.open()
                 self.log.debug(guild_id, _method , f"Member Update Start of user: '{after.name}'")
                 voice_channel = after.voice.channel
                 voice_channel_id = voice_channel.id
-                owner_id = self.db.get_channel_owner_id(guildId=guild_id, channelId=voice_channel_id)
+                owner_id = await self.db.get_channel_owner_id(guildId=guild_id, channelId=voice_channel_id)
                 if owner_id != after.id:
                     # user is in a channel, but not their channel
                     self.log.debug(guild_id, _method , f"User:{str(after.id)} is in a channel, but not their own channel.")
@@ -144,25 +323,17 @@ class voice(commands.Cog):
                     return
 
                 owner = await self.get_or_fetch_member(after.guild, owner_id)
-                user_settings = self.db.get_user_settings(guild_id, after.id)
+                user_settings = await self.db.get_user_settings(guild_id, after.id)
 
                 if user_settings and user_settings.auto_game:
-                    text_channel_id = self.db.get_text_channel_id(guildId=guild_id, voiceChannelId=voice_channel_id)
+                    text_channel_id = await self.db.get_text_channel_id(guildId=guild_id, voiceChannelId=voice_channel_id)
                     if text_channel_id:
                         text_channel = await self.get_or_fetch_channel(int(text_channel_id))
                     self.log.debug(guild_id, _method , f"trigger auto game change")
                     selected_title = voice_channel.name
                     if owner and text_channel:
-                        selected_title = await self.ask_game_for_user(targetChannel=text_channel, user=owner, title=self.get_string(guild_id, 'title_update_to_game'))
-                        if selected_title:
-                            if voice_channel.name != selected_title:
-                                if text_channel:
-                                    self.log.debug(guild_id, _method , f"Change Text Channel Name: {selected_title}")
-                                    await text_channel.edit(name=selected_title)
-                                    await self.sendEmbed(text_channel, self.get_string(guild_id, 'title_update_channel_name'), f'{after.mention}, {utils.str_replace(self.get_string(guild_id, "info_channel_name_change"), name=selected_title)}', delete_after=5)
-                                await voice_channel.edit(name=selected_title)
-                        else:
-                            self.log.debug(guild_id, _method , f"Unable to retrieve a valid title from game.")
+                        # the prompt waits up to a minute for an answer, it must not hold up the guild's queue
+                        asyncio.ensure_future(self.ask_auto_game_title(guild_id, after, owner, voice_channel, text_channel))
                     else:
                         self.log.debug(guild_id, _method , f"owner is none, or text_channel is none. Can't ask to choose game.")
                         game_activity = [a for a in after.activities if a.type == discord.ActivityType.playing]
@@ -177,11 +348,12 @@ class voice(commands.Cog):
 
                         if selected_title:
                             if voice_channel.name != selected_title:
+                                # a rate limited rename must not hold up the guild's queue, nothing waits for it
                                 if text_channel:
                                     self.log.debug(guild_id, _method , f"Change Text Channel Name: {selected_title}")
-                                    await text_channel.edit(name=selected_title)
+                                    self.detach_request(guild_id, _method, self.edit_channel(text_channel, name=selected_title))
                                 self.log.debug(guild_id, _method , f"Change Voice Channel Name: {selected_title}")
-                                await voice_channel.edit(name=selected_title)
+                                self.detach_request(guild_id, _method, self.edit_channel(voice_channel, name=selected_title))
                 else:
                     self.log.debug(guild_id, _method , f"trigger name change, but setting is false.")
         except discord.errors.NotFound as nf:
@@ -189,13 +361,48 @@ class voice(commands.Cog):
         except Exception as ex:
             self.log.error(guild_id, _method , str(ex), traceback.format_exc())
         finally:
-            self.db.close()
+            await self.db.close()
+
+    @logcontext.log_method
+    async def ask_auto_game_title(self, guildId: int, member, owner, voiceChannel, textChannel):
+        _method = logcontext.current_method()
+        try:
+            selected_title = await self.ask_game_for_user(targetChannel=textChannel, user=owner, title=self.get_string(guildId, 'title_update_to_game'))
+            if not selected_title:
+                self.log.debug(guildId, _method , f"Unable to retrieve a valid title from game.")
+                return
+            # the rename is a state change again, it goes back through the guild's queue
+            await self.actors.submit(guildId, self.rename_auto_game_channels, guildId, member, voiceChannel, textChannel, selected_title)
+        except discord.errors.NotFound as nf:
+            self.log.warn(guildId, _method, str(nf), traceback.format_exc())
+        except Exception as ex:
+            self.log.error(guildId, _method , str(ex), traceback.format_exc())
+
+    @logcontext.log_method
+    async def rename_auto_game_channels(self, guildId: int, member, voiceChannel, textChannel, title: str):
+        _method = logcontext.current_method()
+        if voiceChannel.name == title:
+            return
+        self.log.debug(guildId, _method , f"Change Text Channel Name: {title}")
+        # the renames and the notice are queued, not awaited, so a rate limited rename only delays itself
+        self.detach_request(guildId, _method, self.edit_channel(textChannel, name=title))
+        self.detach_request(guildId, _method, self.post_embed(textChannel, self.get_string(guildId, 'title_update_channel_name'), f'{member.mention}, {self.render_string(guildId, "info_channel_name_change", name=title)}', delete_after=5))
+        self.detach_request(guildId, _method, self.edit_channel(voiceChannel, name=title))
 
     @commands.Cog.listener()
     async def on_guild_channel_update(self, before, after):
+        self.actors.submit(after.guild.id, self.handle_guild_channel_update, before, after)
+
+    @logcontext.log_method
+    async def handle_guild_channel_update(self, before, after):
         try:
-            _method = inspect.stack()[1][3]
-            self.db.open()
+            _method = logcontext.current_method()
+            await self.db.open()
+            if after and after.id in self.claimed_names:
+                # the bot renamed a pooled channel for its new owner, that is not a manual rename
+                claimed_name = self.claimed_names.pop(after.id)
+                if after.name == claimed_name:
+                    return
             if before and after:
                 if before.id == after.id:
                     # This handles a manual channel rename. it changes the text channel name to match.
@@ -205,7 +412,7 @@ class voice(commands.Cog):
                         self.log.debug(guild_id, _method, "Unable to locate category", traceback.format_exc())
                         return
                     category_id = channel.category.id
-                    owner_id = self.db.get_channel_owner_id(guild_id, after.id)
+                    owner_id = await self.db.get_channel_owner_id(guild_id, after.id)
                     if owner_id:
                         owner = await self.get_or_fetch_member(before.guild, owner_id)
                         if not owner:
@@ -217,54 +424,64 @@ class voice(commands.Cog):
                             self.log.debug(guild_id, _method , "Channel Names are the same. Nothing to do")
                             return
                         else:
-                            default_role = self.db.get_default_role(guildId=guild_id, categoryId=category_id, userId=owner_id)
+                            default_role = await self.db.get_default_role(guildId=guild_id, categoryId=category_id, userId=owner_id)
                             self.log.debug(guild_id, _method, f"default_role: {default_role}")
                             temp_default_role = self.get_by_name_or_id(after.guild.roles, default_role)
                             self.log.debug(guild_id, _method, f"temp_default_role: {temp_default_role}")
-                            user_settings = self.db.get_user_settings(guild_id, owner_id)
+                            user_settings = await self.db.get_user_settings(guild_id, owner_id)
 
                             self.log.debug(guild_id, _method , f"Channel Type: {after.type}")
 
                             if after.type == discord.ChannelType.voice:
                                 # new channel name
-                                text_channel_id = self.db.get_text_channel_id(guildId=guild_id, voiceChannelId=after.id)
+                                text_channel_id = await self.db.get_text_channel_id(guildId=guild_id, voiceChannelId=after.id)
                                 if text_channel_id:
                                     text_channel = await self.get_or_fetch_channel(int(text_channel_id))
                                 if text_channel:
+                                    # the rename and the notice are queued, not awaited, so a rate limited rename only delays itself
                                     self.log.debug(guild_id, _method , f"Change Text Channel Name: {after.name}")
-                                    await text_channel.edit(name=after.name)
-                                    await self.sendEmbed(text_channel, self.get_string(guild_id, 'title_update_channel_name'), f'{owner.mention}, {utils.str_replace(self.get_string(guild_id, "info_channel_name_change"), channel=text_channel.name)}', delete_after=5)
+                                    self.detach_request(guild_id, _method, self.edit_channel(text_channel, name=after.name))
+                                    self.detach_request(guild_id, _method, self.post_embed(text_channel, self.get_string(guild_id, 'title_update_channel_name'), f'{owner.mention}, {self.render_string(guild_id, "info_channel_name_change", channel=after.name)}', delete_after=5))
                             if after.type == discord.ChannelType.text:
                                 voiceChannel = None
-                                voice_channel_id = self.db.get_voice_channel_id_from_text_channel(guildId=guild_id, textChannelId=after.id)
+                                voice_channel_id = await self.db.get_voice_channel_id_from_text_channel(guildId=guild_id, textChannelId=after.id)
                                 if voice_channel_id:
                                     voiceChannel = await self.get_or_fetch_channel(voice_channel_id)
                                 if voiceChannel:
                                     self.log.debug(guild_id, _method , f"Change Voice Channel Name: {after.name}")
-                                    await voiceChannel.edit(name=after.name)
-                                    await self.sendEmbed(after, self.get_string(guild_id, 'title_update_channel_name'), f'{owner.mention}, {utils.str_replace(self.get_string(guild_id, "info_channel_name_change"), channel=after.name)}', delete_after=5)
+                                    self.detach_request(guild_id, _method, self.edit_channel(voiceChannel, name=after.name))
+                                    self.detach_request(guild_id, _method, self.post_embed(after, self.get_string(guild_id, 'title_update_channel_name'), f'{owner.mention}, {self.render_string(guild_id, "info_channel_name_change", channel=after.name)}', delete_after=5))
 
 
                             if user_settings:
-                                self.db.update_user_channel_name(guildId=guild_id, userId=owner_id, channelName=after.name)
+                                await self.db.update_user_channel_name(guildId=guild_id, userId=owner_id, channelName=after.name)
                             else:
-                                self.db.insert_user_settings(guildId=guild_id, userId=owner_id, channelName=after.name, channelLimit=0, bitrate=self.settings.BITRATE_DEFAULT, defaultRole=temp_default_role.id, autoGame=False)
+                                await self.db.insert_user_settings(guildId=guild_id, userId=owner_id, channelName=after.name, channelLimit=0, bitrate=self.settings.BITRATE_DEFAULT, defaultRole=temp_default_role.id, autoGame=False)
         except discord.errors.NotFound as nf:
             self.log.warn(guild_id, _method, str(nf), traceback.format_exc())
         except Exception as e:
             self.log.error(guild_id, _method , str(e), traceback.format_exc())
         finally:
-            self.db.close()
+            await self.db.close()
 
     @commands.Cog.listener()
     async def on_voice_state_update(self, member, before, after):
-        self.db.open()
-        _method = inspect.stack()[1][3]
+        # events of one guild are handled one at a time, other guilds do not wait on them
+        self.actors.submit(member.guild.id, self.handle_voice_state_update, member, before, after)
+
+    @logcontext.log_method
+    async def handle_voice_state_update(self, member, before, after):
+        await self.db.open()
+        _method = logcontext.current_method()
         guild_id = member.guild.id
         self.log.debug(guild_id, _method , f"On Voice State Update")
-        await self.clean_up_tracked_channels(guild_id)
-        await asyncio.sleep(2)
-        voiceChannels = self.db.get_guild_create_channels(guild_id)
+        if before.channel is not None and (after.channel is None or after.channel.id != before.channel.id):
+            # left or moved out of a channel, mute and deafen changes do not need a cleanup
+            await self.clean_up_tracked_channel(guild_id, before.channel)
+        if after.channel is not None:
+            # joined or still in a channel that may be waiting to be deleted
+            self.reaper.cancel(guild_id, after.channel.id)
+        voiceChannels = await self.db.get_guild_create_channels(guild_id)
         if voiceChannels is None:
             self.log.debug(guild_id, _method , f"No voice create channels found for GuildID: {guild_id}")
             pass
@@ -277,114 +494,192 @@ class voice(commands.Cog):
                     category_id = after.channel.category_id
                     source_channel = after.channel
                     source_channel_id = after.channel.id
-                    channel_owner_id = self.db.get_channel_owner_id(guildId=guild_id, channelId=source_channel_id)
-                    userSettings = self.db.get_user_settings(guildId=guild_id, userId=channel_owner_id or member.id)
-                    guildSettings = self.db.get_guild_category_settings(guildId=guild_id, categoryId=category_id)
-                    useStage = self.db.get_use_stage_on_create(guildId=guild_id, channelId=source_channel_id, categoryId=category_id) or 0
                     # CHANNEL SETTINGS START
-                    limit = 0
-                    locked = False
-                    bitrate = self.settings.BITRATE_DEFAULT
-                    name = utils.get_random_name()
-
-                    default_role_id = self.db.get_default_role(guildId=guild_id, categoryId=category_id, userId=member.id)
-                    default_role = self.get_by_name_or_id(member.guild.roles, default_role_id) or member.guild.default_role
-                    if userSettings is None:
-                        if guildSettings is not None:
-                            limit = guildSettings.channel_limit
-                            locked = guildSettings.channel_locked
-                            bitrate = guildSettings.bitrate
-                    else:
-                        name = userSettings.channel_name
-                        if guildSettings is None:
-                            limit = userSettings.channel_limit
-                            bitrate = userSettings.bitrate
-                            locked = False
-                        elif guildSettings is not None:
-                            limit = userSettings.channel_limit or guildSettings.channel_limit
-                            locked = guildSettings.channel_locked or False
-                            bitrate = userSettings.bitrate or guildSettings.bitrate
-                        else:
-                            limit = userSettings.channel_limit
-                            locked = guildSettings.channel_locked
-                            bitrate = guildSettings.bitrate
+                    channel_settings = await self.db.get_effective_channel_settings(guildId=guild_id, categoryId=category_id, createChannelId=source_channel_id, userId=member.id)
+                    if channel_settings is None:
+                        channel_settings = settings.EffectiveChannelSettings.merge(guild_id, category_id, source_channel_id, member.id)
+                    limit = channel_settings.limit
+                    locked = channel_settings.locked
+                    bitrate = channel_settings.bitrate
+                    useStage = channel_settings.use_stage
+                    name = channel_settings.name or self.get_random_name(guild_id)
+                    default_role = self.get_by_name_or_id(member.guild.roles, channel_settings.default_role) or member.guild.default_role
                     # CHANNEL SETTINGS END
 
-                    mid = member.id
                     category = discord.utils.get(member.guild.categories, id=category_id)
-                    self.log.debug(guild_id, _method , f"Creating channel {name} in {category} with bitrate {bitrate}kbps")
-                    is_community = member.guild.features.count("COMMUNITY") > 0
-                    if(useStage and is_community):
-                        self.log.debug(guild_id, _method , f"Creating Stage Channel")
-                        stage_topic = utils.get_random_name(noun_count=1, adjective_count=2)
-                        voiceChannel = await member.guild.create_stage_channel(name, topic=stage_topic, category=category, reason="Create Channel Request by {member}", position=0)
-                    else:
-                        self.log.debug(guild_id, _method , f"Created Voice Channel")
-                        voiceChannel = await source_channel.clone(name=name, reason="Create Channel Request by {member}")
-                        # voiceChannel = await member.guild.create_voice_channel(name, category=category, reason="Create Channel Request by {member}")
-                        # await voiceChannel.edit(sync_permissions=True)
-                    textChannel = await member.guild.create_text_channel(name, category=category, position=0)
-                    await textChannel.edit(sync_permissions=True)
-                    channelID = voiceChannel.id
-
-                    self.log.debug(guild_id, _method , f"Moving {member} to {voiceChannel}")
-                    await member.move_to(voiceChannel)
-                    # if the bot cant do this, dont fail...
-                    try:
-                        self.log.debug(guild_id, _method , f"Setting permissions on {voiceChannel}")
-                        # if use_voice_activity is not True, some cases where people cant speak, unless they use P2T
-                        await voiceChannel.set_permissions(member, speak=True, priority_speaker=True, connect=True, read_messages=True, send_messages=True, view_channel=True, use_voice_activation=True, stream=True, move_members=True)
-                        await textChannel.set_permissions(member, read_messages=True, send_messages=True, view_channel=True, read_message_history=True)
-                    except Exception as ex:
-                        self.log.error(guild_id, _method , str(ex), traceback.format_exc())
-                    self.log.debug(guild_id, _method , f"Set user limit to {limit} on {voiceChannel}")
-                    await voiceChannel.edit(name=name, user_limit=limit, bitrate=(bitrate*1000), position=0)
-
-                    self.log.debug(guild_id, _method , f"Track voiceChannel userID: {mid} channelID: {channelID}")
-                    self.log.debug(guild_id, _method , f"Track Voice and Text Channels {name} in {category}")
-
-                    self.db.track_new_channel_set(guildId=guild_id, ownerId=mid, voiceChannelId=channelID, textChannelId=textChannel.id)
-
-                    try:
-                        if default_role:
-                            self.log.debug(guild_id, _method , f"Check if bot can set channel for {default_role.name} {voiceChannel}")
-                            await textChannel.set_permissions(default_role, read_messages=(not locked), send_messages=(not locked), read_message_history=(not locked), view_channel=True)
-                            await voiceChannel.set_permissions(default_role, speak=True, connect=(not locked), read_messages=(not locked), send_messages=(not locked), view_channel=True, stream=(not locked), use_voice_activation=True, move_members=True)
-                    except Exception as ex:
-                        self.log.error(guild_id, _method , str(ex), traceback.format_exc())
-
-                    await self.sendEmbed(textChannel, self.get_string(guild_id, 'title_new_voice_text_channel'), f"{member.mention}, {self.get_string(guild_id, 'info_new_voice_text_channel')}", delete_after=None, footer=None)
-                    # initMessage contains keys that point to strings in the language file.
-                    initMessage = self.settings.initMessage
-                    if initMessage:
-                        # title, message, fields=None, delete_after=None, footer=None
-                        fields = []
-                        for f in range(len(initMessage['fields'])):
-                            fields.append(EmbedField(self.get_string(guild_id, initMessage['fields'][f]['name']), initMessage['fields'][f]['value']).__dict__)
-                        await self.sendEmbed(textChannel, self.get_string(guild_id, initMessage['title']), f"{member.mention}, {self.get_string(guild_id, initMessage['message'])}", fields=fields, delete_after=None, footer=None)
+                    await self.create_channel_set(member, source_channel, category, name=name, limit=limit, locked=locked, bitrate=bitrate, useStage=useStage, defaultRole=default_role)
             except discord.errors.NotFound as nf:
                 self.log.warn(guild_id, _method , str(nf))
             except Exception as ex:
                 self.log.error(guild_id, _method , str(ex), traceback.format_exc())
 
 
+    def get_channel_set_overwrites(self, member, defaultRole, locked: bool, sourceOverwrites: dict, categoryOverwrites: dict):
+        # the final overwrites of a new channel set. the voice channel starts from the create
+        # channel's, like a clone, the text channel from the category's, like a permission sync.
+        voice_overwrites = dict(sourceOverwrites or {})
+        text_overwrites = dict(categoryOverwrites or {})
+        # if use_voice_activity is not True, some cases where people cant speak, unless they use P2T
+        voice_overwrites[member] = discord.PermissionOverwrite(speak=True, priority_speaker=True, connect=True, read_messages=True, send_messages=True, view_channel=True, use_voice_activation=True, stream=True, move_members=True)
+        text_overwrites[member] = discord.PermissionOverwrite(read_messages=True, send_messages=True, view_channel=True, read_message_history=True)
+        if defaultRole:
+            voice_overwrites[defaultRole] = discord.PermissionOverwrite(speak=True, connect=(not locked), read_messages=(not locked), send_messages=(not locked), view_channel=True, stream=(not locked), use_voice_activation=True, move_members=True)
+            text_overwrites[defaultRole] = discord.PermissionOverwrite(read_messages=(not locked), send_messages=(not locked), read_message_history=(not locked), view_channel=True)
+        return voice_overwrites, text_overwrites
+
+    async def create_channel_set(self, member, sourceChannel, category, name: str, limit: int, locked: bool, bitrate: int, useStage: bool, defaultRole):
+        # Each channel is created with its name, position, limits and final overwrites in one
+        # REST call. The two channels are created together, the member is moved as soon as the
+        # voice channel exists, then the set is tracked. The welcome messages are only queued.
+        # When the create channel has a pool, a hidden set is claimed with one edit per channel
+        # instead, those do not share the guild's channel create rate limit.
+        _method = logcontext.current_method()
+        guild_id = member.guild.id
+        timings = {}
+        loop = asyncio.get_event_loop()
+        started = loop.time()
+        reason = f"Create Channel Request by {member}"
+        create_route = ("guild", guild_id, "channels")
+        source_overwrites = sourceChannel.overwrites
+        category_overwrites = category.overwrites if category else {}
+        voice_overwrites, text_overwrites = self.get_channel_set_overwrites(member, defaultRole, locked, source_overwrites, category_overwrites)
+
+        async def timed(stage: str, aw):
+            stage_start = loop.time()
+            try:
+                return await aw
+            finally:
+                timings[stage] = loop.time() - stage_start
+
+        async def create_with_fallback(create, overwrites: dict, fallbackOverwrites: dict):
+            # if the bot cant grant the overwrites, dont fail... create the channel with the ones it copies
+            try:
+                return await create(overwrites)
+            except discord.errors.Forbidden as ex:
+                self.log.error(guild_id, _method , str(ex), traceback.format_exc())
+                return await create(fallbackOverwrites)
+
+        async def create_voice_channel():
+            if useStage and member.guild.features.count("COMMUNITY") > 0:
+                self.log.debug(guild_id, _method , f"Creating Stage Channel")
+                stage_topic = self.get_random_name(guild_id, nounCount=1, adjectiveCount=2)
+                return await create_with_fallback(
+                    lambda o: self.rest.submit(requestpriority.RequestPriority.CREATE, create_route, member.guild.create_stage_channel, name, topic=stage_topic, category=category, overwrites=o, reason=reason, position=0),
+                    voice_overwrites, source_overwrites)
+            self.log.debug(guild_id, _method , f"Creating Voice Channel")
+            return await create_with_fallback(
+                lambda o: self.rest.submit(requestpriority.RequestPriority.CREATE, create_route, member.guild.create_voice_channel, name, category=category, overwrites=o, reason=reason, position=0, user_limit=limit, bitrate=(bitrate*1000)),
+                voice_overwrites, source_overwrites)
+
+        async def open_voice_channel():
+            voiceChannel = await timed("create_voice", create_voice_channel())
+            self.log.debug(guild_id, _method , f"Moving {member} to {voiceChannel}")
+            await timed("move", self.rest.submit(requestpriority.RequestPriority.MOVE, ("guild", guild_id, "members"), member.move_to, voiceChannel))
+            timings["joined_to_moved"] = loop.time() - started
+            return voiceChannel
+
+        async def create_text_channel():
+            return await create_with_fallback(
+                lambda o: self.rest.submit(requestpriority.RequestPriority.CREATE, create_route, member.guild.create_text_channel, name, category=category, overwrites=o, reason=reason, position=0),
+                text_overwrites, category_overwrites)
+
+        async def claim_voice_channel(voiceChannel):
+            await timed("claim_voice", self.edit_channel(voiceChannel, requestpriority.RequestPriority.CREATE, name=name, overwrites=voice_overwrites, user_limit=limit, bitrate=(bitrate*1000), position=0, reason=reason))
+            self.log.debug(guild_id, _method , f"Moving {member} to {voiceChannel}")
+            await timed("move", self.rest.submit(requestpriority.RequestPriority.MOVE, ("guild", guild_id, "members"), member.move_to, voiceChannel))
+            timings["joined_to_moved"] = loop.time() - started
+            return voiceChannel
+
+        async def claim_pooled_channel_set():
+            # stage channels are never pooled
+            if useStage and member.guild.features.count("COMMUNITY") > 0:
+                return None
+            while True:
+                pooled = self.pool.take(guild_id, sourceChannel.id)
+                if pooled is None:
+                    return None
+                voiceChannel = self.bot.get_channel(pooled[0])
+                textChannel = self.bot.get_channel(pooled[1])
+                await self.db.delete_pooled_channel_set(guild_id, pooled[0])
+                if voiceChannel and textChannel:
+                    break
+                # half of the set was deleted by someone, drop the rest and take the next one
+                await asyncio.gather(*[ self.delete_channel(c) for c in [voiceChannel, textChannel] if c ], return_exceptions=True)
+            self.log.debug(guild_id, _method , f"Claiming pooled channel set {voiceChannel} as {name}")
+            self.claimed_names[voiceChannel.id] = name
+            self.claimed_names[textChannel.id] = name
+            claimed = await asyncio.gather(
+                claim_voice_channel(voiceChannel),
+                timed("claim_text", self.edit_channel(textChannel, requestpriority.RequestPriority.CREATE, name=name, overwrites=text_overwrites, position=0, reason=reason)),
+                return_exceptions=True)
+            failed = [ c for c in claimed if isinstance(c, BaseException) ]
+            if failed:
+                # the member still gets a set, a created one
+                ex = failed[0]
+                self.log.error(guild_id, _method, str(ex), "".join(traceback.format_exception(type(ex), ex, ex.__traceback__)))
+                self.claimed_names.pop(voiceChannel.id, None)
+                self.claimed_names.pop(textChannel.id, None)
+                await asyncio.gather(self.delete_channel(voiceChannel), self.delete_channel(textChannel), return_exceptions=True)
+                return None
+            return voiceChannel, textChannel
+
+        claimed = await claim_pooled_channel_set()
+        if claimed:
+            voiceChannel, textChannel = claimed
+        else:
+            self.log.debug(guild_id, _method , f"Creating channel {name} in {category} with bitrate {bitrate}kbps")
+            voiceChannel, textChannel = await asyncio.gather(
+                open_voice_channel(),
+                timed("create_text", create_text_channel()),
+                return_exceptions=True)
+            failed = [ c for c in [voiceChannel, textChannel] if isinstance(c, BaseException) ]
+            if failed:
+                # do not leave half a channel set behind
+                await asyncio.gather(*[ self.delete_channel(c) for c in [voiceChannel, textChannel] if not isinstance(c, BaseException) ], return_exceptions=True)
+                raise failed[0]
+        created = loop.time()
+
+        # the welcome messages are queued behind the next member's create and move, nothing waits for them
+        self.detach_request(guild_id, _method, self.post_embed(textChannel, self.get_string(guild_id, 'title_new_voice_text_channel'), f"{member.mention}, {self.get_string(guild_id, 'info_new_voice_text_channel')}", delete_after=None, footer=None))
+        # initMessage contains keys that point to strings in the language file.
+        initMessage = self.settings.initMessage
+        if initMessage:
+            # title, message, fields=None, delete_after=None, footer=None
+            fields = []
+            for f in range(len(initMessage['fields'])):
+                fields.append(EmbedField(self.get_string(guild_id, initMessage['fields'][f]['name']), initMessage['fields'][f]['value']).__dict__)
+            self.detach_request(guild_id, _method, self.post_embed(textChannel, self.get_string(guild_id, initMessage['title']), f"{member.mention}, {self.get_string(guild_id, initMessage['message'])}", fields=fields, delete_after=None, footer=None))
+
+        self.log.debug(guild_id, _method , f"Track Voice and Text Channels {name} in {category} for userID: {member.id}")
+        try:
+            if not await timed("track", self.db.track_new_channel_set(guildId=guild_id, ownerId=member.id, voiceChannelId=voiceChannel.id, textChannelId=textChannel.id)):
+                self.log.error(guild_id, _method, f"Unable to track channel set {voiceChannel} for userID: {member.id}")
+        except Exception as ex:
+            self.log.error(guild_id, _method, str(ex), traceback.format_exc())
+
+        stages = ", ".join(f"{k} {v*1000:.0f}ms" for k, v in timings.items())
+        self.log.debug(guild_id, _method , f"Created channel set {voiceChannel} in {(loop.time() - started)*1000:.0f}ms (create {(created - started)*1000:.0f}ms): {stages}")
+        return voiceChannel, textChannel
+
     @voice.command()
+    @logcontext.log_method
     async def version(self, ctx):
         author = ctx.author
         appName = utils.dict_get(self.settings.__dict__, "name", default_value = "Voice Create Bot")
         await self.sendEmbed(ctx.channel, self.get_string(ctx.guild.id, 'title_version'), f"{author.mention}, {appName} version: {self.settings.APP_VERSION}", delete_after=10)
-        await ctx.message.delete()
+        self.delete_message(ctx.message)
 
     @voice.command()
     @has_permissions(administrator=True)
+    @logcontext.log_method
     async def channels(self, ctx):
-        _method = inspect.stack()[1][3]
-        self.db.open()
+        _method = logcontext.current_method()
+        await self.db.open()
         guild_id = ctx.author.guild.id
         author = ctx.author
         try:
-            if self.isAdmin(ctx):
-                guild_channels = self.db.get_tracked_channels_for_guild(guildId=guild_id)
+            if await self.isAdmin(ctx):
+                guild_channels = await self.db.get_tracked_channels_for_guild(guildId=guild_id)
                 channelFields = list()
                 for vc in guild_channels.voice_channels:
                     voice_channel = await self.get_or_fetch_channel(vc.voice_channel_id)
@@ -417,17 +712,18 @@ class voice(commands.Cog):
             self.log.error(guild_id, _method , str(ex), traceback.format_exc())
             await self.notify_of_error(ctx)
         finally:
-            self.db.close()
-            await ctx.message.delete()
+            await self.db.close()
+            self.delete_message(ctx.message)
 
     @voice.command(aliases=["track-text-channel", "ttc"])
     @has_permissions(administrator=True)
+    @logcontext.log_method
     async def track_text_channel(self, ctx, channel: discord.TextChannel = None):
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         guild_id = ctx.author.guild.id
-        self.db.open()
+        await self.db.open()
         try:
-            if self.isAdmin(ctx):
+            if await self.isAdmin(ctx):
 
                 voiceChannel = None
                 if ctx.author.voice:
@@ -435,12 +731,12 @@ class voice(commands.Cog):
 
                 if channel is None:
                     await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_track_text_channel'), f"{ctx.author.mention}, {self.get_string(guild_id, 'info_no_channel_to_track')}", fields=None, delete_after=5)
-                    await ctx.message.delete()
+                    self.delete_message(ctx.message)
                     return
 
                 if voiceChannel:
                     # check if this voice channel is tracked.
-                    tracked = self.db.get_tracked_channels_for_guild(guildId=guild_id)
+                    tracked = await self.db.get_tracked_channels_for_guild(guildId=guild_id)
                     tracked_voice_filter = [tv for tv in tracked.voice_channels if tv.voice_channel_id == voiceChannel.id]
                     tracked_text_filter = [tt for tt in tracked.text_channels if tt.voice_channel_id == voiceChannel.id]
                     if tracked_voice_filter:
@@ -449,11 +745,11 @@ class voice(commands.Cog):
                             # no tracked text channel
                             if channel.category_id == voiceChannel.category_id:
                                 # text channel is in the same category as the voice channel
-                                self.db.add_tracked_text_channel(guildId=guild_id, ownerId=tracked_voice.owner_id, voiceChannelId=voiceChannel.id, textChannelId=channel.id)
-                                await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_track_text_channel'), f"{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, 'info_now_tracking_text'), channel=channel.name, voice_channel=voiceChannel.name)}", delete_after=5)
+                                await self.db.add_tracked_text_channel(guildId=guild_id, ownerId=tracked_voice.owner_id, voiceChannelId=voiceChannel.id, textChannelId=channel.id)
+                                await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_track_text_channel'), f"{ctx.author.mention}, {self.render_string(guild_id, 'info_now_tracking_text', channel=channel.name, voice_channel=voiceChannel.name)}", delete_after=5)
                             else:
                                 # not in the same category
-                                await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_track_text_channel'), f"{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, 'info_tracking_not_supported'), channel=channel.name, voice_channel=voiceChannel.name)}", delete_after=5)
+                                await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_track_text_channel'), f"{ctx.author.mention}, {self.render_string(guild_id, 'info_tracking_not_supported', channel=channel.name, voice_channel=voiceChannel.name)}", delete_after=5)
                         else:
                             tracked_text = tracked_text_filter[0]
                             # channel already has a textChannel associated with it.
@@ -462,17 +758,17 @@ class voice(commands.Cog):
 
                             if tc_lookup:
                                 # channel exists. so we just exit
-                                await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_track_text_channel'), f"{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, 'info_already_has_channel'), voice_channel=voiceChannel.name)}", delete_after=5)
+                                await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_track_text_channel'), f"{ctx.author.mention}, {self.render_string(guild_id, 'info_already_has_channel', voice_channel=voiceChannel.name)}", delete_after=5)
                             else:
                                 # old tracked channel missing
-                                self.db.delete_tracked_text_channel(guildId=guild_id, voiceChannelId=voiceChannel.id, textChannelId=tracked_text.text_channel_id)
+                                await self.db.delete_tracked_text_channel(guildId=guild_id, voiceChannelId=voiceChannel.id, textChannelId=tracked_text.text_channel_id)
                                 if channel.category_id == voiceChannel.category_id:
                                     # text channel is in the same category as the voice channel
-                                    self.db.add_tracked_text_channel(guildId=guild_id, ownerId=tracked_voice.owner_id, voiceChannelId=voiceChannel.id, textChannelId=channel.id)
-                                    await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_track_text_channel'), f"{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, 'info_now_tracking'), channel=channel.name, voice_channel=voiceChannel.name)}", delete_after=5)
+                                    await self.db.add_tracked_text_channel(guildId=guild_id, ownerId=tracked_voice.owner_id, voiceChannelId=voiceChannel.id, textChannelId=channel.id)
+                                    await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_track_text_channel'), f"{ctx.author.mention}, {self.render_string(guild_id, 'info_now_tracking', channel=channel.name, voice_channel=voiceChannel.name)}", delete_after=5)
                                 else:
                                     # not in the same category
-                                    await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_track_text_channel'), f"{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, 'info_tracking_not_supported'), channel=channel.name, voice_channel=voiceChannel.name)}", delete_after=5)
+                                    await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_track_text_channel'), f"{ctx.author.mention}, {self.render_string(guild_id, 'info_tracking_not_supported', channel=channel.name, voice_channel=voiceChannel.name)}", delete_after=5)
 
                     else:
                         # not tracked
@@ -485,13 +781,14 @@ class voice(commands.Cog):
             self.log.error(guild_id, _method , str(ex), traceback.format_exc())
             await self.notify_of_error(ctx)
         finally:
-            self.db.close()
-            await ctx.message.delete()
+            await self.db.close()
+            self.delete_message(ctx.message)
 
     @voice.command()
+    @logcontext.log_method
     async def track(self, ctx):
-        _method = inspect.stack()[1][3]
-        self.db.open()
+        _method = logcontext.current_method()
+        await self.db.open()
         guild_id = ctx.author.guild.id
         try:
             message_author_id = ctx.author.id
@@ -499,25 +796,26 @@ class voice(commands.Cog):
             if not channel:
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_track_voice_channel'), f"{ctx.author.mention}, {self.get_string(guild_id, 'info_not_in_channel')}", delete_after=5)
             else:
-                if self.isAdmin(ctx):
-                    tracked_channels = self.db.get_tracked_channels_for_guild(guildId=guild_id)
+                if await self.isAdmin(ctx):
+                    tracked_channels = await self.db.get_tracked_channels_for_guild(guildId=guild_id)
                     filtered = [t for t in tracked_channels.voice_channels if t.voice_channel_id == channel.id]
                     if filtered:
                         await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_track_voice_channel'), f"{ctx.author.mention}, {self.get_string(guild_id, 'info_channel_already_tracked')}", delete_after=5)
                     else:
-                        self.db.track_new_voice_channel(guildId=guild_id, ownerId=message_author_id, voiceChannelId=channel.id)
-                        await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_track_voice_channel'), f"{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, 'info_new_voice_channel_tracked'), voice_channel=channel.name)}", delete_after=5)
+                        await self.db.track_new_voice_channel(guildId=guild_id, ownerId=message_author_id, voiceChannelId=channel.id)
+                        await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_track_voice_channel'), f"{ctx.author.mention}, {self.render_string(guild_id, 'info_new_voice_channel_tracked', voice_channel=channel.name)}", delete_after=5)
         except Exception as ex:
             self.log.error(guild_id, _method , str(ex), traceback.format_exc())
             await self.notify_of_error(ctx)
         finally:
-            self.db.close()
-            await ctx.message.delete()
+            await self.db.close()
+            self.delete_message(ctx.message)
 
     @voice.command()
+    @logcontext.log_method
     async def owner(self, ctx, member: discord.Member):
-        _method = inspect.stack()[1][3]
-        self.db.open()
+        _method = logcontext.current_method()
+        await self.db.open()
         guild_id = ctx.author.guild.id
         channel = None
         try:
@@ -526,28 +824,29 @@ class voice(commands.Cog):
             if channel is None:
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_set_channel_owner"), f"{ctx.author.mention}, {self.get_string(guild_id, 'info_not_in_channel')}", delete_after=5)
             else:
-                owner_id = self.db.get_tracked_channel_owner(guildId=guild_id, voiceChannelId=channel.id)
+                owner_id = await self.db.get_tracked_channel_owner(guildId=guild_id, voiceChannelId=channel.id)
                 if not owner_id:
                     await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_set_channel_owner"), f"{ctx.author.mention}, {self.get_string(guild_id, 'info_unmanaged_channel')}", delete_after=5)
                 else:
-                    if self.isAdmin(ctx) or ctx.author.id == owner_id:
-                        self.db.update_tracked_channel_owner(guildId=guild_id, voiceChannelId=channel.id, ownerId=owner_id, newOwnerId=member.id)
-                        await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_set_channel_owner"), f"{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, 'info_new_owner'), user=member.mention)}", delete_after=5)
+                    if await self.isAdmin(ctx) or ctx.author.id == owner_id:
+                        await self.db.update_tracked_channel_owner(guildId=guild_id, voiceChannelId=channel.id, ownerId=owner_id, newOwnerId=member.id)
+                        await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_set_channel_owner"), f"{ctx.author.mention}, {self.render_string(guild_id, 'info_new_owner', user=member.mention)}", delete_after=5)
                     else:
                         await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_set_channel_owner"), f"{ctx.author.mention}, {self.get_string(guild_id, 'info_permission_denied')}", delete_after=5)
         except Exception as ex:
             self.log.error(guild_id, _method , str(ex), traceback.format_exc())
             await self.notify_of_error(ctx)
         finally:
-            self.db.close()
-            await ctx.message.delete()
+            await self.db.close()
+            self.delete_message(ctx.message)
 
     @voice.command()
+    @logcontext.log_method
     async def resync(self, ctx):
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         guild_id = ctx.guild.id
         try:
-            self.db.open
+            await self.db.open()
             category_id = ctx.author.voice.channel.category.id
             voice_channel = None
             voice_channel_id = None
@@ -558,35 +857,36 @@ class voice(commands.Cog):
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_not_in_channel'), f'{ctx.author.mention}, {self.get_string(guild_id, "info_not_in_channel")}', delete_after=5)
                 return
 
-            owner_id = self.db.get_channel_owner_id(guildId=guild_id, channelId=voice_channel_id)
-            if not self.isAdmin(ctx) and ctx.author.id != owner_id:
+            owner_id = await self.db.get_channel_owner_id(guildId=guild_id, channelId=voice_channel_id)
+            if not await self.isAdmin(ctx) and ctx.author.id != owner_id:
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_permission_denied"), f'{ctx.author.mention}, {self.get_string(guild_id, "info_permission_denied")}', delete_after=5)
                 return
 
-            text_channel_id = self.db.get_text_channel_id(guildId=guild_id, voiceChannelId=voice_channel_id)
+            text_channel_id = await self.db.get_text_channel_id(guildId=guild_id, voiceChannelId=voice_channel_id)
             if text_channel_id:
                 text_channel = await self.get_or_fetch_channel(text_channel_id)
             if text_channel:
-                await text_channel.edit(sync_permissions=True)
-                await text_channel.set_permissions(ctx.author, read_messages=True, send_messages=True, view_channel=True, read_message_history=True)
+                await self.edit_channel(text_channel, sync_permissions=True)
+                await self.set_permissions(text_channel, ctx.author, read_messages=True, send_messages=True, view_channel=True, read_message_history=True)
 
-            await voice_channel.edit(sync_permissions=True)
+            await self.edit_channel(voice_channel, sync_permissions=True)
             # BUG that requires use_voice_activation=True or some users cannot speak.
-            await voice_channel.set_permissions(ctx.author, speak=True, priority_speaker=True, connect=True, read_messages=True, send_messages=True, view_channel=True, stream=True, use_voice_activation=True, move_members=True)
+            await self.set_permissions(voice_channel, ctx.author, speak=True, priority_speaker=True, connect=True, read_messages=True, send_messages=True, view_channel=True, stream=True, use_voice_activation=True, move_members=True)
             await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_channel_sync'), f'{ctx.author.mention}, {self.get_string(guild_id, "info_channel_sync")}', delete_after=5)
         except Exception as ex:
             self.log.error(guild_id, _method , str(ex), traceback.format_exc())
             await self.notify_of_error(ctx)
         finally:
-            self.db.close()
-            await ctx.message.delete()
+            await self.db.close()
+            self.delete_message(ctx.message)
 
     @voice.command()
+    @logcontext.log_method
     async def private(self, ctx):
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         guild_id = ctx.guild.id
         try:
-            self.db.open()
+            await self.db.open()
             author_id = ctx.author.id
             category_id = ctx.author.voice.channel.category.id
             voice_channel = None
@@ -596,20 +896,20 @@ class voice(commands.Cog):
             else:
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_not_in_channel'), f'{ctx.author.mention}, {self.get_string(guild_id, "info_not_in_channel")}', delete_after=5)
                 return
-            owner_id = self.db.get_channel_owner_id(guildId=guild_id, channelId=voice_channel_id)
+            owner_id = await self.db.get_channel_owner_id(guildId=guild_id, channelId=voice_channel_id)
 
-            if (not self.isAdmin(ctx) and author_id != owner_id) or owner_id is None:
+            if (not await self.isAdmin(ctx) and author_id != owner_id) or owner_id is None:
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_permission_denied'), f'{ctx.author.mention}, {self.get_string(guild_id, "info_permission_denied")}', delete_after=5)
                 return
             owner_user = await self.get_or_fetch_user(owner_id)
 
-            default_role = self.db.get_default_role(guildId=guild_id, categoryId=category_id, userId=owner_id)
+            default_role = await self.db.get_default_role(guildId=guild_id, categoryId=category_id, userId=owner_id)
             everyone = self.get_by_name_or_id(ctx.guild.roles, default_role) or ctx.guild.default_role
-            text_channel_id = self.db.get_text_channel_id(guildId=guild_id, voiceChannelId=voice_channel_id)
+            text_channel_id = await self.db.get_text_channel_id(guildId=guild_id, voiceChannelId=voice_channel_id)
             if text_channel_id:
                 text_channel = await self.get_or_fetch_channel(text_channel_id)
 
-            await ctx.message.delete()
+            self.delete_message(ctx.message)
             await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_channel_private'), f'{ctx.author.mention}, {self.get_string(guild_id, "info_channel_private_progress")}', delete_after=5)
             permRoles = []
             for m in voice_channel.members:
@@ -622,34 +922,35 @@ class voice(commands.Cog):
             for gr in ctx.guild.roles:
                 denyRoles.append(gr)
             if text_channel:
-                await text_channel.edit(sync_permissions=True)
-                await text_channel.set_permissions(owner_user, connect=True, read_messages=True, send_messages=True, view_channel=True, read_message_history=True)
+                await self.edit_channel(text_channel, sync_permissions=True)
+                await self.set_permissions(text_channel, owner_user, connect=True, read_messages=True, send_messages=True, view_channel=True, read_message_history=True)
                 for r in permRoles:
-                    await text_channel.set_permissions(r, connect=True, read_messages=True, send_messages=True, view_channel=True, read_message_history=True)
+                    await self.set_permissions(text_channel, r, connect=True, read_messages=True, send_messages=True, view_channel=True, read_message_history=True)
                 # deny everyone else
                 for r in denyRoles:
-                    await text_channel.set_permissions(r, connect=False, read_messages=False, view_channel=True, read_message_history=False, send_messages=False)
-            await voice_channel.edit(sync_permissions=True)
-            await voice_channel.set_permissions(owner_user, speak=True, view_channel=True, connect=True, use_voice_activation=True, stream=False )
+                    await self.set_permissions(text_channel, r, connect=False, read_messages=False, view_channel=True, read_message_history=False, send_messages=False)
+            await self.edit_channel(voice_channel, sync_permissions=True)
+            await self.set_permissions(voice_channel, owner_user, speak=True, view_channel=True, connect=True, use_voice_activation=True, stream=False )
             for r in permRoles:
-                await voice_channel.set_permissions(r, speak=True, view_channel=True, connect=True, use_voice_activation=True, stream=False)
+                await self.set_permissions(voice_channel, r, speak=True, view_channel=True, connect=True, use_voice_activation=True, stream=False)
             # deny everyone else
             for r in denyRoles:
-                await voice_channel.set_permissions(r, speak=False, view_channel=True, connect=False)
+                await self.set_permissions(voice_channel, r, speak=False, view_channel=True, connect=False)
             await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_channel_private'), f'{ctx.author.mention}, {self.get_string(guild_id, "info_channel_private")}', delete_after=5)
 
         except Exception as ex:
             self.log.error(guild_id, _method , str(ex), traceback.format_exc())
             await self.notify_of_error(ctx)
         finally:
-            self.db.close()
+            await self.db.close()
 
     @voice.command()
+    @logcontext.log_method
     async def hide(self, ctx, userOrRole: typing.Union[discord.Role, discord.Member] = None):
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         guild_id = ctx.guild.id
         try:
-            self.db.open()
+            await self.db.open()
             author_id = ctx.author.id
             category_id = None
             category = None
@@ -664,16 +965,16 @@ class voice(commands.Cog):
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_not_in_channel'), f'{ctx.author.mention}, {self.get_string(guild_id, "info_not_in_channel")}', delete_after=5)
                 return
 
-            owner_id = self.db.get_channel_owner_id(guildId=guild_id, channelId=voice_channel_id)
+            owner_id = await self.db.get_channel_owner_id(guildId=guild_id, channelId=voice_channel_id)
             owner = await self.get_or_fetch_user(owner_id)
-            if (not self.isAdmin(ctx) and author_id != owner_id) or owner_id is None:
+            if (not await self.isAdmin(ctx) and author_id != owner_id) or owner_id is None:
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_permission_denied'), f'{ctx.author.mention}, {self.get_string(guild_id, "title_permission_denied")}', delete_after=5)
                 return
 
-            default_role = self.db.get_default_role(guildId=guild_id, categoryId=category_id, userId=owner_id)
+            default_role = await self.db.get_default_role(guildId=guild_id, categoryId=category_id, userId=owner_id)
             # everyone = discord.utils.get(ctx.guild.roles, name=default_role)
             everyone = self.get_by_name_or_id(ctx.guild.roles, default_role) or ctx.guild.default_role
-            text_channel_id = self.db.get_text_channel_id(guildId=guild_id, voiceChannelId=voice_channel_id)
+            text_channel_id = await self.db.get_text_channel_id(guildId=guild_id, voiceChannelId=voice_channel_id)
             if text_channel_id:
                 text_channel = await self.get_or_fetch_channel(text_channel_id)
 
@@ -683,13 +984,13 @@ class voice(commands.Cog):
             if userOrRole:
                 permRoles.append(userOrRole)
             if text_channel:
-                await text_channel.set_permissions(owner, view_channel=True)
+                await self.set_permissions(text_channel, owner, view_channel=True)
                 for r in permRoles:
-                    await text_channel.set_permissions(r, view_channel=False)
+                    await self.set_permissions(text_channel, r, view_channel=False)
 
-            await voice_channel.set_permissions(owner, view_channel=True)
+            await self.set_permissions(voice_channel, owner, view_channel=True)
             for r in permRoles:
-                await voice_channel.set_permissions(r, view_channel=False)
+                await self.set_permissions(voice_channel, r, view_channel=False)
 
             await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_channel_hide"), f'{ctx.author.mention}, {self.get_string(guild_id, "info_channel_hide")}', delete_after=5)
 
@@ -697,11 +998,12 @@ class voice(commands.Cog):
             self.log.error(guild_id, _method , str(ex), traceback.format_exc())
             await self.notify_of_error(ctx)
     @voice.command()
+    @logcontext.log_method
     async def show(self, ctx, userOrRole: typing.Union[discord.Role, discord.Member] = None):
         guild_id = ctx.guild.id
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         try:
-            self.db.open()
+            await self.db.open()
             author_id = ctx.author.id
             category_id = None
             category = None
@@ -716,15 +1018,15 @@ class voice(commands.Cog):
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_not_in_channel'), f'{ctx.author.mention}, {self.get_string(guild_id, "info_not_in_channel")}', delete_after=5)
                 return
 
-            owner_id = self.db.get_channel_owner_id(guildId=guild_id, channelId=voice_channel_id)
+            owner_id = await self.db.get_channel_owner_id(guildId=guild_id, channelId=voice_channel_id)
             owner = await self.get_or_fetch_user(owner_id)
-            if (not self.isAdmin(ctx) and author_id != owner_id) or owner_id is None:
+            if (not await self.isAdmin(ctx) and author_id != owner_id) or owner_id is None:
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_permission_denied'), f'{ctx.author.mention}, {self.get_string(guild_id, "title_permission_denied")}', delete_after=5)
                 return
 
-            default_role = self.db.get_default_role(guildId=guild_id, categoryId=category_id, userId=owner_id)
+            default_role = await self.db.get_default_role(guildId=guild_id, categoryId=category_id, userId=owner_id)
             everyone = self.get_by_name_or_id(ctx.guild.roles, default_role) or ctx.guild.default_role
-            text_channel_id = self.db.get_text_channel_id(guildId=guild_id, voiceChannelId=voice_channel_id)
+            text_channel_id = await self.db.get_text_channel_id(guildId=guild_id, voiceChannelId=voice_channel_id)
             if text_channel_id:
                 text_channel = await self.get_or_fetch_channel(text_channel_id)
 
@@ -734,13 +1036,13 @@ class voice(commands.Cog):
             if userOrRole:
                 permRoles.append(userOrRole)
             if text_channel:
-                await text_channel.set_permissions(owner, view_channel=True)
+                await self.set_permissions(text_channel, owner, view_channel=True)
                 for r in permRoles:
-                    await text_channel.set_permissions(r, view_channel=True)
+                    await self.set_permissions(text_channel, r, view_channel=True)
 
-            await voice_channel.set_permissions(owner, view_channel=True)
+            await self.set_permissions(voice_channel, owner, view_channel=True)
             for r in permRoles:
-                await voice_channel.set_permissions(r, view_channel=True)
+                await self.set_permissions(voice_channel, r, view_channel=True)
 
             await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_channel_show"), f'{ctx.author.mention}, {self.get_string(guild_id, "info_channel_show")}', delete_after=5)
 
@@ -749,11 +1051,12 @@ class voice(commands.Cog):
             await self.notify_of_error(ctx)
 
     @voice.command()
+    @logcontext.log_method
     async def mute(self, ctx, userOrRole: typing.Union[discord.Role, discord.Member] = None):
         guild_id = ctx.guild.id
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         try:
-            self.db.open()
+            await self.db.open()
             author_id = ctx.author.id
             category_id = None
             category = None
@@ -766,16 +1069,16 @@ class voice(commands.Cog):
             else:
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_not_in_channel'), f'{ctx.author.mention}, {self.get_string(guild_id, "info_not_in_channel")}', delete_after=5)
                 return
-            owner_id = self.db.get_channel_owner_id(guildId=guild_id, channelId=voice_channel_id)
+            owner_id = await self.db.get_channel_owner_id(guildId=guild_id, channelId=voice_channel_id)
             owner = await self.get_or_fetch_user(owner_id)
 
-            if (not self.isAdmin(ctx) and author_id != owner_id) or owner_id is None:
+            if (not await self.isAdmin(ctx) and author_id != owner_id) or owner_id is None:
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_permission_denied'), f'{ctx.author.mention}, {self.get_string(guild_id, "title_permission_denied")}', delete_after=5)
                 return
 
-            default_role = self.db.get_default_role(guildId=guild_id, categoryId=category_id, userId=owner_id)
+            default_role = await self.db.get_default_role(guildId=guild_id, categoryId=category_id, userId=owner_id)
             everyone = self.get_by_name_or_id(ctx.guild.roles, default_role) or ctx.guild.default_role
-            text_channel_id = self.db.get_text_channel_id(guildId=guild_id, voiceChannelId=voice_channel_id)
+            text_channel_id = await self.db.get_text_channel_id(guildId=guild_id, voiceChannelId=voice_channel_id)
             if text_channel_id:
                 text_channel = await self.get_or_fetch_channel(text_channel_id)
 
@@ -785,13 +1088,13 @@ class voice(commands.Cog):
             if userOrRole:
                 permRoles.append(userOrRole)
             if text_channel:
-                await text_channel.set_permissions(owner, connect=True, read_messages=True, send_messages=True, view_channel=True, read_message_history=True)
+                await self.set_permissions(text_channel, owner, connect=True, read_messages=True, send_messages=True, view_channel=True, read_message_history=True)
                 for r in permRoles:
-                    await text_channel.set_permissions(r, send_messages=False)
+                    await self.set_permissions(text_channel, r, send_messages=False)
 
-            await voice_channel.set_permissions(owner, speak=True)
+            await self.set_permissions(voice_channel, owner, speak=True)
             for r in permRoles:
-                await voice_channel.set_permissions(r, speak=False)
+                await self.set_permissions(voice_channel, r, speak=False)
 
             await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_channel_mute"), f'{ctx.author.mention}, {self.get_string(guild_id, "info_channel_mute")}', delete_after=5)
 
@@ -799,15 +1102,16 @@ class voice(commands.Cog):
             self.log.error(guild_id, _method , str(ex), traceback.format_exc())
             await self.notify_of_error(ctx)
         finally:
-            self.db.close()
-            await ctx.message.delete()
+            await self.db.close()
+            self.delete_message(ctx.message)
 
     @voice.command()
+    @logcontext.log_method
     async def unmute(self, ctx, userOrRole: typing.Union[discord.Role, discord.Member] = None):
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         guild_id = ctx.guild.id
         try:
-            self.db.open()
+            await self.db.open()
             author_id = ctx.author.id
             category_id = ctx.author.voice.channel.category.id
             voice_channel = None
@@ -817,15 +1121,15 @@ class voice(commands.Cog):
             else:
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_not_in_channel'), f'{ctx.author.mention}, {self.get_string(guild_id, "info_not_in_channel")}', delete_after=5)
                 return
-            owner_id = self.db.get_channel_owner_id(guildId=guild_id, channelId=voice_channel_id)
+            owner_id = await self.db.get_channel_owner_id(guildId=guild_id, channelId=voice_channel_id)
             owner = await self.get_or_fetch_user(owner_id)
-            if (not self.isAdmin(ctx) and author_id != owner_id) or owner_id is None:
+            if (not await self.isAdmin(ctx) and author_id != owner_id) or owner_id is None:
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_permission_denied'), f'{ctx.author.mention}, {self.get_string(guild_id, "title_permission_denied")}', delete_after=5)
                 return
 
-            default_role = self.db.get_default_role(guildId=guild_id, categoryId=category_id, userId=owner_id)
+            default_role = await self.db.get_default_role(guildId=guild_id, categoryId=category_id, userId=owner_id)
             everyone = self.get_by_name_or_id(ctx.guild.roles, default_role) or ctx.guild.default_role
-            text_channel_id = self.db.get_text_channel_id(guildId=guild_id, voiceChannelId=voice_channel_id)
+            text_channel_id = await self.db.get_text_channel_id(guildId=guild_id, voiceChannelId=voice_channel_id)
             if text_channel_id:
                 text_channel = await self.get_or_fetch_channel(text_channel_id)
 
@@ -835,13 +1139,13 @@ class voice(commands.Cog):
             if userOrRole:
                 permRoles.append(userOrRole)
             if text_channel:
-                await text_channel.set_permissions(owner, connect=True, read_messages=True, send_messages=True, view_channel=True, read_message_history=True)
+                await self.set_permissions(text_channel, owner, connect=True, read_messages=True, send_messages=True, view_channel=True, read_message_history=True)
                 for r in permRoles:
-                    await text_channel.set_permissions(r, send_messages=True)
+                    await self.set_permissions(text_channel, r, send_messages=True)
 
-            await voice_channel.set_permissions(owner, speak=True)
+            await self.set_permissions(voice_channel, owner, speak=True)
             for r in permRoles:
-                await voice_channel.set_permissions(r, speak=True)
+                await self.set_permissions(voice_channel, r, speak=True)
 
             await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_channel_unmute"), f'{ctx.author.mention}, {self.get_string(guild_id, "info_channel_unmute")}', delete_after=5)
 
@@ -849,91 +1153,116 @@ class voice(commands.Cog):
             self.log.error(guild_id, _method , str(ex), traceback.format_exc())
             await self.notify_of_error(ctx)
         finally:
-            self.db.close()
-            await ctx.message.delete()
+            await self.db.close()
+            self.delete_message(ctx.message)
 
     @voice.command(aliases=["set-prefix"])
     @has_permissions(administrator=True)
+    @logcontext.log_method
     async def set_prefix(self, ctx, prefix="."):
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         guild_id = ctx.guild.id
-        if self.isAdmin(ctx):
+        if await self.isAdmin(ctx):
             if prefix:
-                self.db.set_guild_settings_prefix(ctx.guild.id, prefix)
+                await self.db.set_guild_settings_prefix(ctx.guild.id, prefix)
                 # self.bot.command_prefix = self.get_prefix
-                await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_prefix"), f'{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, "info_set_prefix"), prefix=prefix)}', delete_after=10)
-                await ctx.message.delete()
+                await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_prefix"), f'{ctx.author.mention}, {self.render_string(guild_id, "info_set_prefix", prefix=prefix)}', delete_after=10)
+                self.delete_message(ctx.message)
+
+    @voice.command(aliases=["set-pool"])
+    @has_permissions(administrator=True)
+    @logcontext.log_method
+    async def set_pool(self, ctx, channel: discord.VoiceChannel, size: int = 0):
+        _method = logcontext.current_method()
+        guild_id = ctx.guild.id
+        try:
+            if not await self.isAdmin(ctx):
+                await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_permission_denied"), f'{ctx.author.mention}, {self.get_string(guild_id, "info_permission_denied")}', delete_after=5)
+                return
+            size = max(0, min(size, self.settings.channel_pool_max))
+            if not await self.db.set_guild_create_channel_pool_size(guildId=guild_id, createChannelId=channel.id, poolSize=size):
+                await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_channel_pool"), f'{ctx.author.mention}, {self.render_string(guild_id, "info_not_create_channel", channel=channel.name)}', delete_after=10)
+                return
+            # the pool creates or removes sets in the background
+            self.pool.set_size(guild_id, channel.id, size)
+            await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_channel_pool"), f'{ctx.author.mention}, {self.render_string(guild_id, "info_set_pool", channel=channel.name, size=size)}', delete_after=10)
+        except Exception as ex:
+            self.log.error(guild_id, _method , str(ex), traceback.format_exc())
+            await self.notify_of_error(ctx)
+        finally:
+            self.delete_message(ctx.message)
 
     @voice.command()
+    @logcontext.log_method
     async def prefix(self, ctx):
         try:
-            _method = inspect.stack()[1][3]
+            _method = logcontext.current_method()
             guild_id = ctx.guild.id
-            guild_settings = self.db.get_guild_settings(guild_id)
-            prefix = "."
-            if guild_settings:
-                prefix = guild_settings.prefix
-            await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_prefix"), f'{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, "info_get_prefix"), prefix=prefix)}', delete_after=10)
+            prefix = await self.db.get_guild_prefix(guild_id)
+            await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_prefix"), f'{ctx.author.mention}, {self.render_string(guild_id, "info_get_prefix", prefix=prefix)}', delete_after=10)
         except Exception as ex:
             self.log.error(guild_id, _method , str(ex), traceback.format_exc())
             await self.notify_of_error(ctx)
         finally:
-            await ctx.message.delete()
+            self.delete_message(ctx.message)
 
     @voice.command()
+    @logcontext.log_method
     async def language(self, ctx):
         try:
-            if self.isAdmin(ctx):
-                _method = inspect.stack()[1][3]
+            if await self.isAdmin(ctx):
+                _method = logcontext.current_method()
                 guild_id = ctx.guild.id
-                guild_settings = self.db.get_guild_settings(guild_id)
+                guild_settings = await self.db.get_guild_settings(guild_id)
                 language = self.settings.language
                 if guild_settings:
                     language = guild_settings.language
-                await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_language"), f'{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, "info_get_language"), language=self.settings.languages[language])}', delete_after=10)
+                await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_language"), f'{ctx.author.mention}, {self.render_string(guild_id, "info_get_language", language=self.settings.languages[language])}', delete_after=10)
         except Exception as ex:
             self.log.error(guild_id, _method , str(ex), traceback.format_exc())
             await self.notify_of_error(ctx)
         finally:
-            await ctx.message.delete()
+            self.delete_message(ctx.message)
 
     @voice.command(aliases=["set-language"])
+    @logcontext.log_method
     async def set_language(self, ctx):
-        if self.isAdmin(ctx):
+        if await self.isAdmin(ctx):
             try:
-                _method = inspect.stack()[1][3]
+                _method = logcontext.current_method()
                 guild_id = ctx.guild.id
                 language = await self.ask_language(ctx, title=self.get_string(guild_id, "title_language"))
                 if language:
-                    self.db.set_guild_settings_language(guild_id, language)
-                    self.set_guild_strings(guild_id)
-                    await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_language"), f'{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, "info_set_language"), language=self.settings.languages[language])}', delete_after=10)
+                    await self.db.set_guild_settings_language(guild_id, language)
+                    await self.set_guild_strings(guild_id)
+                    await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_language"), f'{ctx.author.mention}, {self.render_string(guild_id, "info_set_language", language=self.settings.languages[language])}', delete_after=10)
                 else:
                     self.log.debug(guild_id, _method, "Language was None after ask user to set it.")
             except Exception as ex:
                 self.log.error(guild_id, _method , str(ex), traceback.format_exc())
                 await self.notify_of_error(ctx)
             finally:
-                await ctx.message.delete()
+                self.delete_message(ctx.message)
 
     @voice.command()
+    @logcontext.log_method
     async def help(self, ctx, command=""):
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         guild_id = ctx.guild.id
         try:
             command_list = self.settings.commands
             if command and command.lower() in command_list:
                 cmd = command_list[command.lower()]
-                if not cmd['admin'] or (cmd['admin'] and self.isAdmin(ctx)):
+                if not cmd['admin'] or (cmd['admin'] and await self.isAdmin(ctx)):
                     fields = list()
                     fields.append({"name": self.get_string(guild_id, 'help_info_usage'), "value": f"`{cmd['usage']}`"})
                     fields.append({"name": self.get_string(guild_id, 'help_info_example'), "value": f"`{cmd['example']}`"})
                     fields.append({"name": self.get_string(guild_id, 'help_info_aliases'), "value": f"`{cmd['aliases']}`"})
 
-                    await self.sendEmbed(ctx.channel, utils.str_replace(self.get_string(guild_id, ''), command=command.lower()), self.get_string(guild_id, cmd['help']), fields=fields)
+                    await self.sendEmbed(ctx.channel, self.render_string(guild_id, '', command=command.lower()), self.get_string(guild_id, cmd['help']), fields=fields)
             else:
                 filtered_list = list()
-                if self.isAdmin(ctx):
+                if await self.isAdmin(ctx):
                     filtered_list = [i for i in command_list.keys()]
                 else:
                     filtered_list = [i for i in command_list.keys() if command_list[i]['admin'] == False]
@@ -945,7 +1274,7 @@ class voice(commands.Cog):
                     fields = list()
                     for k in chunk:
                         cmd = command_list[k.lower()]
-                        if cmd['admin'] and self.isAdmin(ctx):
+                        if cmd['admin'] and await self.isAdmin(ctx):
                             fields.append({"name": self.get_string(guild_id, cmd['help']), "value": f"`{cmd['usage']}`"})
                             fields.append({"name": self.get_string(guild_id, 'help_info_more_help'), "value": f"`.voice help {k.lower()}`"})
                             fields.append({"name": self.get_string(guild_id, 'help_info_admin_title'), "value": self.get_string(guild_id, "help_info_admin")})
@@ -958,15 +1287,16 @@ class voice(commands.Cog):
         except Exception as ex:
             self.log.error(guild_id, _method , str(ex), traceback.format_exc())
             await self.notify_of_error(ctx)
-        await ctx.message.delete()
+        self.delete_message(ctx.message)
 
     @voice.command(pass_context=True)
     @has_permissions(administrator=True)
+    @logcontext.log_method
     async def init(self, ctx):
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         guild_id = ctx.guild.id
-        if self.isAdmin(ctx):
-            self.db.open()
+        if await self.isAdmin(ctx):
+            await self.db.open()
             try:
                 author = ctx.author
                 author_id = ctx.author.id
@@ -998,41 +1328,42 @@ class voice(commands.Cog):
                 ask_prefix = await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_guild_init'), self.get_string(guild_id, 'ask_prefix'), delete_after=60, footer=self.get_string(guild_id, 'footer_60_seconds'))
                 try:
                     prefixResp = await self.bot.wait_for('message', check=check_user, timeout=60.0)
-                    await ask_prefix.delete()
+                    self.delete_message(ask_prefix)
                 except asyncio.TimeoutError:
                     await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_guild_init'), self.get_string(guild_id, 'took_too_long'), delete_after=5)
                 else:
                     prefix = prefixResp.content
-                    await prefixResp.delete()
+                    self.delete_message(prefixResp)
 
 
-                self.db.insert_or_update_guild_settings(guildId=guild_id, prefix=prefix, defaultRole=selected_guild_role.id, adminRole=selected_admin_role.id, language=language)
+                await self.db.insert_or_update_guild_settings(guildId=guild_id, prefix=prefix, defaultRole=selected_guild_role.id, adminRole=selected_admin_role.id, language=language)
 
                 # after update, update the guild strings
-                self.set_guild_strings(guild_id)
+                await self.set_guild_strings(guild_id)
 
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_guild_init'), f"{author.mention}, {self.get_string(guild_id, 'info_init_success')}", delete_after=5)
             except Exception as ex:
                 self.log.error(guild_id, _method , str(ex), traceback.format_exc())
                 await self.notify_of_error(ctx)
             finally:
-                self.db.close()
-                await ctx.message.delete()
+                await self.db.close()
+                self.delete_message(ctx.message)
         else:
             pass
 
     @voice.command(pass_context=True)
     @has_permissions(administrator=True)
+    @logcontext.log_method
     async def setup(self, ctx):
-        _method = inspect.stack()[1][3]
-        self.db.open()
+        _method = logcontext.current_method()
+        await self.db.open()
         guild_id = ctx.guild.id
         try:
             self.log.debug(guild_id, _method , f"User id triggering setup: {ctx.author.id}")
             author_id = ctx.author.id
             author = ctx.author
             # If the person is the OWNER or an ADMIN
-            if self.isAdmin(ctx):
+            if await self.isAdmin(ctx):
                 def check(m):
                     return m.author.id == author_id
                 def check_limit(m):
@@ -1042,7 +1373,7 @@ class voice(commands.Cog):
                             return val >= 0 and val <= 100
                         else:
                             return False
-                guild_settings = self.db.get_guild_settings(guildId=guild_id)
+                guild_settings = await self.db.get_guild_settings(guildId=guild_id)
                 if not guild_settings:
                     await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_voice_channel_setup'), f"{author.mention}, {self.get_string(guild_id, 'setup_not_configured')}", delete_after=10)
                     return
@@ -1062,21 +1393,21 @@ class voice(commands.Cog):
                     await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_voice_channel_setup'), self.get_string(guild_id, 'took_too_long'), delete_after=5)
                 else:
                     try:
-                        channel = await ctx.guild.create_voice_channel(channelName.content, category=category)
-                        await channelName.delete()
-                        await name_ask.delete()
+                        channel = await self.rest.submit(requestpriority.RequestPriority.CREATE, ("guild", guild_id, "channels"), ctx.guild.create_voice_channel, channelName.content, category=category)
+                        self.delete_message(channelName)
+                        self.delete_message(name_ask)
 
-                        guild_cc_settings = self.db.get_guild_create_channel_settings(guildId=guild_id)
+                        guild_cc_settings = await self.db.get_guild_create_channel_settings(guildId=guild_id)
 
                         if guild_cc_settings:
                             if len([c for c in guild_cc_settings.channels if c.category_id == category.id and c.channel_id == channel.id]) >= 1:
-                                self.db.update_guild_create_channel_settings(guildId=guild_id, createChannelId=channel.id, categoryId=category.id, ownerId=author_id, useStage=useStage)
+                                await self.db.update_guild_create_channel_settings(guildId=guild_id, createChannelId=channel.id, categoryId=category.id, ownerId=author_id, useStage=useStage)
                             else:
-                                self.db.insert_guild_create_channel_settings(guildId=guild_id, createChannelId=channel.id, categoryId=category.id, ownerId=author_id, useStage=useStage)
+                                await self.db.insert_guild_create_channel_settings(guildId=guild_id, createChannelId=channel.id, categoryId=category.id, ownerId=author_id, useStage=useStage)
                         else:
-                            self.db.insert_guild_create_channel_settings(guildId=guild_id, createChannelId=channel.id, categoryId=category.id, ownerId=author_id, useStage=useStage)
+                            await self.db.insert_guild_create_channel_settings(guildId=guild_id, createChannelId=channel.id, categoryId=category.id, ownerId=author_id, useStage=useStage)
 
-                        guild_category_settings = self.db.get_guild_category_settings(guildId=guild_id, categoryId=category.id)
+                        guild_category_settings = await self.db.get_guild_category_settings(guildId=guild_id, categoryId=category.id)
                         if not guild_category_settings:
 
                             defaultLimit = await self.ask_limit(ctx, self.get_string(guild_id, 'title_voice_channel_setup'))
@@ -1089,7 +1420,7 @@ class voice(commands.Cog):
                             if not selected_guild_role:
                                 selected_guild_role = self.get_by_name_or_id(ctx.guild.roles, guild_settings.default_role)
 
-                            self.db.set_guild_category_settings(guildId=guild_id, categoryId=category.id, channelLimit=defaultLimit, channelLocked=locked, bitrate=defaultBitrate, defaultRole=(selected_guild_role or ctx.guild.default_role).id)
+                            await self.db.set_guild_category_settings(guildId=guild_id, categoryId=category.id, channelLimit=defaultLimit, channelLocked=locked, bitrate=defaultBitrate, defaultRole=(selected_guild_role or ctx.guild.default_role).id)
                         else:
                             self.log.debug(guild_id, _method , f"GUILD CATEGORY SETTINGS FOUND")
                         await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_voice_channel_setup'), f"{ctx.author.mention}, {self.get_string(guild_id, 'ready_to_go')}", delete_after=10)
@@ -1103,25 +1434,26 @@ class voice(commands.Cog):
             self.log.error(guild_id, _method , str(ex), traceback.format_exc())
             await self.notify_of_error(ctx)
         finally:
-            self.db.close()
-            await ctx.message.delete()
+            await self.db.close()
+            self.delete_message(ctx.message)
 
     @voice.command(aliases=['get-default-role', 'gdr'])
+    @logcontext.log_method
     async def get_default_role(self, ctx):
         guild_id = ctx.guild.id
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         author = ctx.author
         try:
-            if self.isAdmin(ctx):
+            if await self.isAdmin(ctx):
                 if self.isInVoiceChannel(ctx):
                     voice_channel = ctx.author.voice.channel
                     # category_id = ctx.author.voice.channel.category.id
-                    self.db.open()
-                    user_id = self.db.get_channel_owner_id(guildId=guild_id, channelId=voice_channel.id)
-                    default_role = self.db.get_default_role(guildId=guild_id, categoryId=voice_channel.category.id, userId=user_id)
+                    await self.db.open()
+                    user_id = await self.db.get_channel_owner_id(guildId=guild_id, channelId=voice_channel.id)
+                    default_role = await self.db.get_default_role(guildId=guild_id, categoryId=voice_channel.category.id, userId=user_id)
                     if default_role:
                         role = self.get_by_name_or_id(ctx.guild.roles, default_role)
-                        await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_voice_channel_settings'), f"{author.mention}, {utils.str_replace(self.get_string(guild_id, 'info_get_default_role'), role=role.name)}", fields=None, delete_after=30)
+                        await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_voice_channel_settings'), f"{author.mention}, {self.render_string(guild_id, 'info_get_default_role', role=role.name)}", fields=None, delete_after=30)
                     else:
                         await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_voice_channel_settings'), f"{author.mention}, {self.get_string(guild_id, 'info_default_role_not_found')}", fields=None, delete_after=5)
                 else:
@@ -1133,25 +1465,26 @@ class voice(commands.Cog):
             self.log.error(guild_id, _method , str(ex), traceback.format_exc())
             await self.notify_of_error(ctx)
         finally:
-            await ctx.message.delete()
-            self.db.close()
+            self.delete_message(ctx.message)
+            await self.db.close()
 
     @voice.command(aliases=['set-default-role', 'sdr'])
+    @logcontext.log_method
     async def set_default_role(self, ctx):
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         guild_id = ctx.guild.id
         author = ctx.author
-        if self.isAdmin(ctx):
-            self.db.open()
+        if await self.isAdmin(ctx):
+            await self.db.open()
             try:
                 selected_default_role = await self.ask_default_role(ctx, self.get_string(guild_id, "title_voice_channel_settings"))
                 if not selected_default_role:
                         selected_default_role = ctx.guild.default_role
                 category = await self.set_role_ask_category(ctx)
                 if category:
-                    category_settings = self.db.get_guild_category_settings(guildId=guild_id, categoryId=category.id)
+                    category_settings = await self.db.get_guild_category_settings(guildId=guild_id, categoryId=category.id)
                     if category_settings:
-                        self.db.set_default_role_for_category(guildId=guild_id, categoryId=category.id, defaultRole=selected_default_role.id)
+                        await self.db.set_default_role_for_category(guildId=guild_id, categoryId=category.id, defaultRole=selected_default_role.id)
                     else:
                         await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_voice_channel_settings"), f"{author.mention}, {self.get_string(guild_id, 'info_no_category_settings')}", fields=None, delete_after=5)
                 else:
@@ -1159,16 +1492,17 @@ class voice(commands.Cog):
             except Exception as ex:
                 self.log.error(guild_id, _method, str(ex), traceback.format_exc())
             finally:
-                self.db.close()
-                await ctx.message.delete()
+                await self.db.close()
+                self.delete_message(ctx.message)
 
     @voice.command()
+    @logcontext.log_method
     async def settings(self, ctx):
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         guild_id = ctx.guild.id
         author = ctx.author
-        if self.isAdmin(ctx):
-            self.db.open()
+        if await self.isAdmin(ctx):
+            await self.db.open()
             try:
                 found_category = await self.set_role_ask_category(ctx)
 
@@ -1180,7 +1514,7 @@ class voice(commands.Cog):
                     if not new_default_role:
                         new_default_role = ctx.guild.default_role
 
-                    self.db.set_guild_category_settings(guildId=guild_id, categoryId=found_category.id, channelLimit=limit, channelLocked=locked, bitrate=bitrate_value, defaultRole=new_default_role.id)
+                    await self.db.set_guild_category_settings(guildId=guild_id, categoryId=found_category.id, channelLimit=limit, channelLocked=locked, bitrate=bitrate_value, defaultRole=new_default_role.id)
                     embed_fields = list()
                     embed_fields.append({
                         "name": self.get_string(guild_id, 'locked'),
@@ -1199,7 +1533,7 @@ class voice(commands.Cog):
                         "value": f"{new_default_role.name}"
                     })
 
-                    await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_voice_channel_settings"), f"{author.mention}, {utils.str_replace(self.get_string(guild_id, 'info_category_settings'), category=found_category.name)}", fields=embed_fields, delete_after=5)
+                    await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_voice_channel_settings"), f"{author.mention}, {self.render_string(guild_id, 'info_category_settings', category=found_category.name)}", fields=embed_fields, delete_after=5)
 
                 else:
                     self.log.error(guild_id, _method, f"No Category found for '{found_category}'")
@@ -1207,20 +1541,21 @@ class voice(commands.Cog):
                 self.log.error(guild_id, _method, str(ex), traceback.format_exc())
                 await self.notify_of_error(ctx)
             finally:
-                self.db.close()
+                await self.db.close()
         else:
             await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_voice_channel_settings"), f"{author.mention}, {self.get_string(guild_id, 'setup_no_permission')}", delete_after=5)
-        await ctx.message.delete()
+        self.delete_message(ctx.message)
 
     @voice.command()
+    @logcontext.log_method
     async def cleandb(self,ctx):
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         guild_id = ctx.guild.id
         author = ctx.author
         try:
-            if self.isAdmin(ctx):
-                self.db.open()
-                self.db.clean_guild_user_settings(guildId=guild_id)
+            if await self.isAdmin(ctx):
+                await self.db.open()
+                await self.db.clean_guild_user_settings(guildId=guild_id)
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_cleandb"), f"{author.mention}, {self.get_string(guild_id, 'info_cleandb')}", delete_after=5)
             else:
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_permission_denied"), f"{author.mention}, {self.get_string(guild_id, 'info_permission_denied')}", delete_after=5)
@@ -1229,29 +1564,31 @@ class voice(commands.Cog):
             self.log.error(guild_id, _method, str(ex), traceback.format_exc())
             await self.notify_of_error(ctx)
         finally:
-            self.db.close()
-            await ctx.message.delete()
+            await self.db.close()
+            self.delete_message(ctx.message)
 
     @voice.command()
+    @logcontext.log_method
     async def reset(self,ctx, user: discord.Member = None):
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         guild_id = ctx.guild.id
         try:
             author = ctx.author
-            if user and self.isAdmin(ctx):
+            if user and await self.isAdmin(ctx):
                 author = user
-            self.db.clean_user_settings(guildId=guild_id, userId=author.id)
+            await self.db.clean_user_settings(guildId=guild_id, userId=author.id)
             await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_reset_user"), f"{author.mention}, {self.get_string(guild_id, 'info_reset_user')}", delete_after=5)
         except Exception as ex:
             self.log.error(guild_id, _method, str(ex), traceback.format_exc())
             await self.notify_of_error(ctx)
         finally:
-            self.db.close()
-            await ctx.message.delete()
+            await self.db.close()
+            self.delete_message(ctx.message)
 
     @voice.command()
+    @logcontext.log_method
     async def lock(self, ctx, role: discord.Role = None):
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         guild_id = ctx.guild.id
         author = ctx.author
         try:
@@ -1266,46 +1603,46 @@ class voice(commands.Cog):
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_not_in_channel"), f'{author.mention}, {self.get_string(guild_id, "info_not_in_channel")}', delete_after=5)
                 return
 
-            if self.isAdmin(ctx):
-                owner_id = self.db.get_channel_owner_id(guildId=guild_id, channelId=current_voice_channel_id)
+            if await self.isAdmin(ctx):
+                owner_id = await self.db.get_channel_owner_id(guildId=guild_id, channelId=current_voice_channel_id)
                 owner = await self.get_or_fetch_user(owner_id)
-            default_role = self.db.get_default_role(guildId=guild_id, categoryId=category_id, userId=owner_id)
+            default_role = await self.db.get_default_role(guildId=guild_id, categoryId=category_id, userId=owner_id)
 
             validRole = len([ x for x in ctx.guild.roles if x.name == default_role or x.id == default_role ]) == 1
             if not validRole:
                 default_role = ctx.guild.default_role.id
-            owned_channel_ids = self.db.get_tracked_voice_channel_id_by_owner(guildId=guild_id,ownerId=owner_id)
-            is_owner = len([ c for c in owned_channel_ids if int(c) == current_voice_channel_id ]) >= 1
-            if not is_owner and not self.isAdmin(ctx):
+            is_owner = await self.db.is_tracked_channel_owner(guildId=guild_id, ownerId=owner_id, voiceChannelId=current_voice_channel_id)
+            if not is_owner and not await self.isAdmin(ctx):
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_channel_lock"), f'{author.mention}, {self.get_string(guild_id, "info_not_owner")}', delete_after=5)
             else:
                 everyone = self.get_by_name_or_id(ctx.guild.roles, default_role)
-                text_channel_id = self.db.get_text_channel_id(guildId=guild_id, voiceChannelId=current_voice_channel_id)
+                text_channel_id = await self.db.get_text_channel_id(guildId=guild_id, voiceChannelId=current_voice_channel_id)
                 if text_channel_id:
                     text_channel = await self.get_or_fetch_channel(text_channel_id)
                     if text_channel:
-                        await text_channel.set_permissions(owner, connect=True, read_messages=True, send_messages=True, view_channel=True, read_message_history=True)
+                        await self.set_permissions(text_channel, owner, connect=True, read_messages=True, send_messages=True, view_channel=True, read_message_history=True)
                         if everyone:
-                            await text_channel.set_permissions(everyone, read_messages=False,send_messages=False, view_channel=True, read_message_history=False)
+                            await self.set_permissions(text_channel, everyone, read_messages=False,send_messages=False, view_channel=True, read_message_history=False)
 
-                    await current_voice_channel.set_permissions(owner, connect=True, read_messages=True, send_messages=True, view_channel=True, read_message_history=True)
-                    await current_voice_channel.set_permissions(everyone, connect=False, view_channel=True, stream=False)
+                    await self.set_permissions(current_voice_channel, owner, connect=True, read_messages=True, send_messages=True, view_channel=True, read_message_history=True)
+                    await self.set_permissions(current_voice_channel, everyone, connect=False, view_channel=True, stream=False)
                     if role:
-                        await current_voice_channel.set_permissions(role, connect=False, read_messages=False, send_messages=False, view_channel=True, stream=False)
+                        await self.set_permissions(current_voice_channel, role, connect=False, read_messages=False, send_messages=False, view_channel=True, stream=False)
                         if text_channel:
-                            await text_channel.set_permissions(role, read_messages=False,send_messages=False, view_channel=True, read_message_history=False)
+                            await self.set_permissions(text_channel, role, read_messages=False,send_messages=False, view_channel=True, read_message_history=False)
 
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_channel_lock"), f'{author.mention}, Voice chat locked! 🔒', delete_after=5)
         except Exception as ex:
             self.log.error(guild_id, _method, str(ex), traceback.format_exc())
             await self.notify_of_error(ctx)
         finally:
-            self.db.close()
-            await ctx.message.delete()
+            await self.db.close()
+            self.delete_message(ctx.message)
 
     @voice.command()
+    @logcontext.log_method
     async def unlock(self, ctx, role: discord.Role = None):
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         guild_id = ctx.guild.id
         author = ctx.author
         try:
@@ -1320,49 +1657,49 @@ class voice(commands.Cog):
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_not_in_channel"), f'{author.mention}, {self.get_string(guild_id, "info_not_in_channel")}', delete_after=5)
                 return
 
-            if self.isAdmin(ctx):
-                owner_id = self.db.get_channel_owner_id(guildId=guild_id, channelId=current_voice_channel_id)
+            if await self.isAdmin(ctx):
+                owner_id = await self.db.get_channel_owner_id(guildId=guild_id, channelId=current_voice_channel_id)
                 owner = await self.get_or_fetch_user(owner_id)
-            default_role = self.db.get_default_role(guildId=guild_id, categoryId=category_id, userId=owner_id)
+            default_role = await self.db.get_default_role(guildId=guild_id, categoryId=category_id, userId=owner_id)
 
             validRole = len([ x for x in ctx.guild.roles if x.name == default_role or x.id == default_role ]) == 1
             if not validRole:
                 default_role = ctx.guild.default_role.id
-            owned_channel_ids = self.db.get_tracked_voice_channel_id_by_owner(guildId=guild_id,ownerId=owner_id)
-            is_owner = len([ c for c in owned_channel_ids if int(c) == current_voice_channel_id ]) >= 1
-            if not is_owner and not self.isAdmin(ctx):
+            is_owner = await self.db.is_tracked_channel_owner(guildId=guild_id, ownerId=owner_id, voiceChannelId=current_voice_channel_id)
+            if not is_owner and not await self.isAdmin(ctx):
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_permission_denied'), f"{ctx.author.mention}, {self.get_string(guild_id, 'info_permission_denied')}", delete_after=5)
             else:
                 # everyone = discord.utils.get(ctx.guild.roles, name=default_role)
                 everyone = self.get_by_name_or_id(ctx.guild.roles, default_role)
-                text_channel_id = self.db.get_text_channel_id(guildId=guild_id, voiceChannelId=current_voice_channel_id)
+                text_channel_id = await self.db.get_text_channel_id(guildId=guild_id, voiceChannelId=current_voice_channel_id)
                 if text_channel_id:
                     text_channel = await self.get_or_fetch_channel(text_channel_id)
 
                     if text_channel:
-                        await text_channel.set_permissions(owner, connect=True, read_messages=True, send_messages=True, view_channel=True, read_message_history=True)
+                        await self.set_permissions(text_channel, owner, connect=True, read_messages=True, send_messages=True, view_channel=True, read_message_history=True)
                         if everyone:
-                            await text_channel.set_permissions(everyone, read_messages=True,send_messages=True, view_channel=True, read_message_history=True)
+                            await self.set_permissions(text_channel, everyone, read_messages=True,send_messages=True, view_channel=True, read_message_history=True)
 
-                    await current_voice_channel.set_permissions(owner, connect=True, read_messages=True, send_messages=True, view_channel=True, read_message_history=True)
-                    await current_voice_channel.set_permissions(everyone, connect=True, view_channel=True, stream=True)
+                    await self.set_permissions(current_voice_channel, owner, connect=True, read_messages=True, send_messages=True, view_channel=True, read_message_history=True)
+                    await self.set_permissions(current_voice_channel, everyone, connect=True, view_channel=True, stream=True)
                     if role:
-                        await current_voice_channel.set_permissions(role, connect=True, read_messages=True, send_messages=True, view_channel=True, stream=True)
+                        await self.set_permissions(current_voice_channel, role, connect=True, read_messages=True, send_messages=True, view_channel=True, stream=True)
                         if text_channel:
-                            await text_channel.set_permissions(role, read_messages=True,send_messages=True, view_channel=True, read_message_history=True)
+                            await self.set_permissions(text_channel, role, read_messages=True,send_messages=True, view_channel=True, read_message_history=True)
 
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_channel_unlock'), f'{author.mention}, {self.get_string(guild_id, "info_unlocked")}', delete_after=5)
         except Exception as ex:
             self.log.error(guild_id, _method, str(ex), traceback.format_exc())
             await self.notify_of_error(ctx)
         finally:
-            self.db.close()
-            await ctx.message.delete()
+            await self.db.close()
+            self.delete_message(ctx.message)
 
     @voice.command(aliases=["allow"])
+    @logcontext.log_method
     async def permit(self, ctx, userOrRole: typing.Union[discord.Role, discord.Member] = None):
-        _method = inspect.stack()[1][3]
-        self.db.open()
+        _method = logcontext.current_method()
+        await self.db.open()
         guild_id = ctx.guild.id
         voice_channel_id = None
         text_channel = None
@@ -1374,31 +1711,32 @@ class voice(commands.Cog):
             return
         try:
             # get the channel owner, in case this is an admin running the command.
-            owner_id = self.db.get_channel_owner_id(guildId=guild_id, channelId=voice_channel_id)
-            if not self.isAdmin(ctx) and ctx.author.id != owner_id:
+            owner_id = await self.db.get_channel_owner_id(guildId=guild_id, channelId=voice_channel_id)
+            if not await self.isAdmin(ctx) and ctx.author.id != owner_id:
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_permission_denied'), f"{ctx.author.mention}, {self.get_string(guild_id, 'info_permission_denied')}", delete_after=5)
                 return
-            text_channel_id = self.db.get_text_channel_id(guildId=guild_id, voiceChannelId=voice_channel_id)
+            text_channel_id = await self.db.get_text_channel_id(guildId=guild_id, voiceChannelId=voice_channel_id)
             if text_channel_id:
                 text_channel = await self.get_or_fetch_channel(text_channel_id)
 
             if text_channel:
                 if userOrRole:
-                    await text_channel.set_permissions(userOrRole, read_messages=True, send_messages=True, view_channel=True, read_message_history=True, )
+                    await self.set_permissions(text_channel, userOrRole, read_messages=True, send_messages=True, view_channel=True, read_message_history=True, )
             if userOrRole:
-                await voice_channel.set_permissions(userOrRole, connect=True, view_channel=True, speak=True, stream=True)
-                await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_channel_grant"), f'{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, "info_channel_grant"), user=userOrRole.name)}', delete_after=5)
+                await self.set_permissions(voice_channel, userOrRole, connect=True, view_channel=True, speak=True, stream=True)
+                await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_channel_grant"), f'{ctx.author.mention}, {self.render_string(guild_id, "info_channel_grant", user=userOrRole.name)}', delete_after=5)
         except Exception as ex:
             self.log.error(guild_id, _method, str(ex), traceback.format_exc())
             await self.notify_of_error(ctx)
         finally:
-            self.db.close()
-            await ctx.message.delete()
+            await self.db.close()
+            self.delete_message(ctx.message)
 
     @voice.command(aliases=["deny"])
+    @logcontext.log_method
     async def reject(self, ctx, userOrRole: typing.Union[discord.Role, discord.Member] = None):
-        _method = inspect.stack()[1][3]
-        self.db.open()
+        _method = logcontext.current_method()
+        await self.db.open()
         guild_id = ctx.guild.id
         voice_channel_id = None
         text_channel = None
@@ -1411,16 +1749,16 @@ class voice(commands.Cog):
             return
         try:
             # get the channel owner, in case this is an admin running the command.
-            owner_id = self.db.get_channel_owner_id(guildId=guild_id, channelId=voice_channel_id)
-            if not self.isAdmin(ctx) and ctx.author.id != owner_id:
+            owner_id = await self.db.get_channel_owner_id(guildId=guild_id, channelId=voice_channel_id)
+            if not await self.isAdmin(ctx) and ctx.author.id != owner_id:
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_permission_denied'), f"{ctx.author.mention}, {self.get_string(guild_id, 'info_permission_denied')}", delete_after=5)
                 return
-            text_channel_id = self.db.get_text_channel_id(guildId=guild_id, voiceChannelId=voice_channel_id)
+            text_channel_id = await self.db.get_text_channel_id(guildId=guild_id, voiceChannelId=voice_channel_id)
             if text_channel_id:
                 text_channel = await self.get_or_fetch_channel(text_channel_id)
 
             if userOrRole:
-                await text_channel.set_permissions(userOrRole, read_messages=False, send_messages=False, view_channel=True, read_message_history=False)
+                await self.set_permissions(text_channel, userOrRole, read_messages=False, send_messages=False, view_channel=True, read_message_history=False)
 
             if userOrRole:
                 for m in voice_channel.members:
@@ -1430,21 +1768,22 @@ class voice(commands.Cog):
                         if m.has_role(userOrRole):
                             m.disconnect()
 
-            await voice_channel.set_permissions(userOrRole, connect=False, read_messages=False, view_channel=True, speak=False, stream=False, read_message_history=False)
-            await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_channel_revoke"), f'{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, "info_channel_revoke"), user=userOrRole.name)}', delete_after=5)
+            await self.set_permissions(voice_channel, userOrRole, connect=False, read_messages=False, view_channel=True, speak=False, stream=False, read_message_history=False)
+            await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_channel_revoke"), f'{ctx.author.mention}, {self.render_string(guild_id, "info_channel_revoke", user=userOrRole.name)}', delete_after=5)
         except Exception as ex:
             self.log.error(guild_id, _method, str(ex), traceback.format_exc())
             await self.notify_of_error(ctx)
         finally:
-            self.db.close()
-            await ctx.message.delete()
+            await self.db.close()
+            self.delete_message(ctx.message)
 
     @voice.command()
+    @logcontext.log_method
     async def limit(self, ctx, limit):
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         guild_id = ctx.guild.id
         try:
-            self.db.open()
+            await self.db.open()
             author = ctx.author
             owner = ctx.author
             owner_id = owner.id
@@ -1457,36 +1796,37 @@ class voice(commands.Cog):
             else:
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_not_in_channel"), f'{author.mention}, {self.get_string(guild_id, "info_not_in_channel")}', delete_after=5)
                 return
-            owner_id = self.db.get_channel_owner_id(guildId=guild_id, channelId=voice_channel_id)
-            if self.isAdmin(ctx) or owner_id == author.id:
+            owner_id = await self.db.get_channel_owner_id(guildId=guild_id, channelId=voice_channel_id)
+            if await self.isAdmin(ctx) or owner_id == author.id:
                 owner = await self.get_or_fetch_user(owner_id)
             else:
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_permission_denied'), f"{ctx.author.mention}, {self.get_string(guild_id, 'info_permission_denied')}", delete_after=5)
                 return
 
-            await voice_channel.edit(user_limit=limit)
-            await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_channel_limit"), f'{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, "info_channel_limit"), limit=str(limit))}', delete_after=5)
-            default_role = self.db.get_default_role(guildId=guild_id, categoryId=category_id, userId=owner_id) or ctx.guild.default_role
+            await self.edit_channel(voice_channel, user_limit=limit)
+            await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_channel_limit"), f'{ctx.author.mention}, {self.render_string(guild_id, "info_channel_limit", limit=str(limit))}', delete_after=5)
+            default_role = await self.db.get_default_role(guildId=guild_id, categoryId=category_id, userId=owner_id) or ctx.guild.default_role
             temp_default_role = self.get_by_name_or_id(ctx.guild.roles, default_role)
-            user_settings = self.db.get_user_settings(guildId=guild_id, userId=owner_id)
-            category_settings = self.db.get_guild_category_settings(guildId=guild_id, categoryId=category_id)
+            user_settings = await self.db.get_user_settings(guildId=guild_id, userId=owner_id)
+            category_settings = await self.db.get_guild_category_settings(guildId=guild_id, categoryId=category_id)
             if user_settings:
-                self.db.update_user_limit(guildId=guild_id, userId=owner_id, channelLimit=limit)
+                await self.db.update_user_limit(guildId=guild_id, userId=owner_id, limit=limit)
             else:
-                self.db.insert_user_settings(guildId=guild_id, userId=owner_id, channelName=voice_channel.name, channelLimit=limit, bitrate=category_settings.bitrate, defaultRole=temp_default_role.id, autoGame=False)
+                await self.db.insert_user_settings(guildId=guild_id, userId=owner_id, channelName=voice_channel.name, channelLimit=limit, bitrate=category_settings.bitrate, defaultRole=temp_default_role.id, autoGame=False)
         except Exception as ex:
             self.log.error(guild_id, _method, str(ex), traceback.format_exc())
             await self.notify_of_error(ctx)
         finally:
-            self.db.close()
-            await ctx.message.delete()
+            await self.db.close()
+            self.delete_message(ctx.message)
 
     @voice.command()
+    @logcontext.log_method
     async def bitrate(self, ctx, bitrate: int = 64):
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         guild_id = ctx.guild.id
         try:
-            self.db.open()
+            await self.db.open()
             author = ctx.author
             owner = ctx.author
             owner_id = owner.id
@@ -1501,8 +1841,8 @@ class voice(commands.Cog):
             else:
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_not_in_channel"), f'{author.mention}, {self.get_string(guild_id, "info_not_in_channel")}', delete_after=5)
                 return
-            owner_id = self.db.get_channel_owner_id(guildId=guild_id, channelId=voice_channel_id)
-            if self.isAdmin(ctx) or owner_id == author.id:
+            owner_id = await self.db.get_channel_owner_id(guildId=guild_id, channelId=voice_channel_id)
+            if await self.isAdmin(ctx) or owner_id == author.id:
                 owner = await self.get_or_fetch_user(owner_id)
             else:
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_permission_denied'), f"{ctx.author.mention}, {self.get_string(guild_id, 'info_permission_denied')}", delete_after=5)
@@ -1510,33 +1850,34 @@ class voice(commands.Cog):
             br_set = int(bitrate)
 
             if br_set > bitrate_limit:
-                await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_channel_bitrate"), f"{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, 'info_bitrate_too_high'), bitrate_max=bitrate_limit)}", delete_after=5)
+                await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_channel_bitrate"), f"{ctx.author.mention}, {self.render_string(guild_id, 'info_bitrate_too_high', bitrate_max=bitrate_limit)}", delete_after=5)
                 br_set = bitrate_limit
             elif br_set < bitrate_min:
-                await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_channel_bitrate"), f"{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, 'info_bitrate_too_high'), bitrate_min=bitrate_min)}", delete_after=5)
+                await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_channel_bitrate"), f"{ctx.author.mention}, {self.render_string(guild_id, 'info_bitrate_too_high', bitrate_min=bitrate_min)}", delete_after=5)
                 br_set = bitrate_min
 
             br = br_set * 1000
-            await voice_channel.edit(bitrate=br)
-            await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_channel_bitrate"), f'{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, "info_bitrate_set"), bitrate=br_set)}', delete_after=5)
-            default_role = self.db.get_default_role(guildId=guild_id, categoryId=category_id, userId=owner_id)
+            await self.edit_channel(voice_channel, bitrate=br)
+            await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_channel_bitrate"), f'{ctx.author.mention}, {self.render_string(guild_id, "info_bitrate_set", bitrate=br_set)}', delete_after=5)
+            default_role = await self.db.get_default_role(guildId=guild_id, categoryId=category_id, userId=owner_id)
             temp_default_role = self.get_by_name_or_id(ctx.guild.roles, default_role) or ctx.guild.default_role
-            user_settings = self.db.get_user_settings(guildId=guild_id, userId=owner_id)
-            category_settings = self.db.get_guild_category_settings(guildId=guild_id, categoryId=category_id)
+            user_settings = await self.db.get_user_settings(guildId=guild_id, userId=owner_id)
+            category_settings = await self.db.get_guild_category_settings(guildId=guild_id, categoryId=category_id)
             if user_settings:
-                self.db.update_user_bitrate(guildId=guild_id, userId=owner_id, bitrate=br_set)
+                await self.db.update_user_bitrate(guildId=guild_id, userId=owner_id, bitrate=br_set)
             else:
-                self.db.insert_user_settings(guildId=guild_id, userId=owner_id, channelName=voice_channel.name, channelLimit=category_settings.channel_limit, bitrate=br_set, defaultRole=temp_default_role.id, autoGame=False)
+                await self.db.insert_user_settings(guildId=guild_id, userId=owner_id, channelName=voice_channel.name, channelLimit=category_settings.channel_limit, bitrate=br_set, defaultRole=temp_default_role.id, autoGame=False)
         except Exception as ex:
             self.log.error(guild_id, _method, str(ex), traceback.format_exc())
             await self.notify_of_error(ctx)
         finally:
-            self.db.close()
-            await ctx.message.delete()
+            await self.db.close()
+            self.delete_message(ctx.message)
 
     @voice.command(aliases=["enable-auto-game", "eag"])
+    @logcontext.log_method
     async def auto_game(self, ctx):
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         guild_id = ctx.guild.id
         try:
             author = ctx.author
@@ -1548,32 +1889,32 @@ class voice(commands.Cog):
             else:
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_not_in_channel"), f'{author.mention}, {self.get_string(guild_id, "info_not_in_channel")}', delete_after=5)
                 return
-            owner_id = self.db.get_channel_owner_id(guildId=guild_id, channelId=voice_channel_id)
+            owner_id = await self.db.get_channel_owner_id(guildId=guild_id, channelId=voice_channel_id)
             if owner_id != author.id:
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_permission_denied'), f"{ctx.author.mention}, {self.get_string(guild_id, 'info_permission_denied')}", delete_after=5)
                 return
 
             enable_auto = await self.ask_yes_no(ctx, self.get_string(guild_id, "ask_enabled_auto_game"), self.get_string(guild_id, "title_enable_auto_game"))
 
-            user_settings = self.db.get_user_settings(guildId=guild_id, userId=owner_id)
-            default_role = self.db.get_default_role(guildId=guild_id, categoryId=channel_category_id, userId=owner_id)
+            user_settings = await self.db.get_user_settings(guildId=guild_id, userId=owner_id)
+            default_role = await self.db.get_default_role(guildId=guild_id, categoryId=channel_category_id, userId=owner_id)
             temp_default_role = self.get_by_name_or_id(ctx.guild.roles, default_role)
             if temp_default_role is None:
                 temp_default_role = ctx.guild.default_role
             if user_settings:
-                self.db.set_user_settings_auto_game(guildId=guild_id, userId=owner_id, autoGame=enable_auto)
+                await self.db.set_user_settings_auto_game(guildId=guild_id, userId=owner_id, autoGame=enable_auto)
             else:
-                self.db.insert_user_settings(guildId=guild_id, userId=owner_id, channelName=voice_channel.name, channelLimit=0, bitrate=self.settings.BITRATE_DEFAULT, defaultRole=temp_default_role.id, autoGame=enable_auto)
+                await self.db.insert_user_settings(guildId=guild_id, userId=owner_id, channelName=voice_channel.name, channelLimit=0, bitrate=self.settings.BITRATE_DEFAULT, defaultRole=temp_default_role.id, autoGame=enable_auto)
             state = self.get_string(guild_id, "disabled")
             if enable_auto:
                 state = self.get_string(guild_id, "enabled")
-            await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_enable_auto_game"), f'{author.mention}, {utils.str_replace(self.get_string(guild_id, "info_enable_auto_game"), state=state)}', delete_after=5)
+            await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_enable_auto_game"), f'{author.mention}, {self.render_string(guild_id, "info_enable_auto_game", state=state)}', delete_after=5)
         except Exception as ex:
             self.log.error(guild_id, _method, str(ex), traceback.format_exc())
             await self.notify_of_error(ctx)
         finally:
-            self.db.close()
-            await ctx.message.delete()
+            await self.db.close()
+            self.delete_message(ctx.message)
 
     # "game": {
 	#     "help": "**Change your channel name to the game you are currently playing**",
@@ -1583,8 +1924,9 @@ class voice(commands.Cog):
 	# 	"aliases": []
 	# },
     @voice.command()
+    @logcontext.log_method
     async def game(self, ctx):
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         guild_id = ctx.guild.id
         def check_user(m):
             return m.author.id == ctx.author.id
@@ -1598,8 +1940,8 @@ class voice(commands.Cog):
             else:
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_not_in_channel"), f'{author.mention}, {self.get_string(guild_id, "info_not_in_channel")}', delete_after=5)
                 return
-            owner_id = self.db.get_channel_owner_id(guildId=guild_id, channelId=channel_id)
-            if owner_id != author_id and not self.isAdmin(ctx):
+            owner_id = await self.db.get_channel_owner_id(guildId=guild_id, channelId=channel_id)
+            if owner_id != author_id and not await self.isAdmin(ctx):
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_permission_denied'), f"{ctx.author.mention}, {self.get_string(guild_id, 'info_permission_denied')}", delete_after=5)
                 return
             owner = await self.get_or_fetch_member(ctx.guild, owner_id)
@@ -1609,10 +1951,10 @@ class voice(commands.Cog):
                     await self._name(ctx, selected_title, False)
                 else:
                     await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_unknown_game"), f'{ctx.author.mention}, {self.get_string(guild_id, "info_unknown_game")}', delete_after=5)
-                    await ctx.message.delete()
+                    self.delete_message(ctx.message)
             else:
                 self.log.debug(guild_id, _method, f"Unable to locate the owner for 'game' call.")
-                await ctx.message.delete()
+                self.delete_message(ctx.message)
         except discord.errors.NotFound as nf:
             self.log.warn(guild_id, _method, str(nf), traceback.format_exc())
         except Exception as ex:
@@ -1620,11 +1962,12 @@ class voice(commands.Cog):
             await self.notify_of_error(ctx)
 
     @voice.command()
+    @logcontext.log_method
     async def name(self, ctx, *, name: str = None):
         await self._name(ctx, name=name, saveSettings=True)
 
     async def _name(self, ctx, name: str = None, saveSettings: bool = True):
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         guild_id = ctx.guild.id
         voice_channel_id = None
         voice_channel = None
@@ -1635,50 +1978,51 @@ class voice(commands.Cog):
             await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_not_in_channel"), f'{ctx.author.mention}, {self.get_string(guild_id, "info_not_in_channel")}', delete_after=5)
             return
         if not name or name == "":
-            name = utils.get_random_name()
-        self.db.open()
+            name = self.get_random_name(guild_id)
+        await self.db.open()
         author_id = ctx.author.id
         category_id = ctx.author.voice.channel.category.id
         try:
-            owner_id = self.db.get_channel_owner_id(guildId=guild_id, channelId=voice_channel_id)
-            if owner_id != author_id and not self.isAdmin(ctx):
+            owner_id = await self.db.get_channel_owner_id(guildId=guild_id, channelId=voice_channel_id)
+            if owner_id != author_id and not await self.isAdmin(ctx):
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_permission_denied'), f"{ctx.author.mention}, {self.get_string(guild_id, 'info_permission_denied')}", delete_after=5)
                 return
-            category_settings = self.db.get_guild_category_settings(guildId=guild_id, categoryId=category_id)
+            category_settings = await self.db.get_guild_category_settings(guildId=guild_id, categoryId=category_id)
 
-            default_role = self.db.get_default_role(guildId=guild_id, categoryId=category_id, userId=owner_id)
+            default_role = await self.db.get_default_role(guildId=guild_id, categoryId=category_id, userId=owner_id)
             temp_default_role = self.get_by_name_or_id(ctx.guild.roles, default_role) or ctx.guild.default_role
-            is_tracked_channel = len([c for c in self.db.get_tracked_voice_channel_id_by_owner(guildId=guild_id, ownerId=owner_id) if c == voice_channel_id]) >= 1
+            is_tracked_channel = await self.db.is_tracked_channel_owner(guildId=guild_id, ownerId=owner_id, voiceChannelId=voice_channel_id)
             if not is_tracked_channel:
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_update_channel_name'), f"{ctx.author.mention}, {self.get_string(guild_id, 'info_voice_not_tracked')}", delete_after=5)
                 return
 
-            text_channel_id = self.db.get_text_channel_id(guildId=guild_id, voiceChannelId=voice_channel_id)
+            text_channel_id = await self.db.get_text_channel_id(guildId=guild_id, voiceChannelId=voice_channel_id)
             if text_channel_id:
                 text_channel = await self.get_or_fetch_channel(int(text_channel_id))
             if text_channel:
-                await text_channel.edit(name=name)
+                await self.edit_channel(text_channel, name=name)
 
-            await voice_channel.edit(name=name)
+            await self.edit_channel(voice_channel, name=name)
             if saveSettings:
-                user_settings = self.db.get_user_settings(guildId=guild_id, userId=owner_id)
+                user_settings = await self.db.get_user_settings(guildId=guild_id, userId=owner_id)
                 if user_settings:
-                    self.db.update_user_channel_name(guildId=guild_id, userId=owner_id, channelName=name)
+                    await self.db.update_user_channel_name(guildId=guild_id, userId=owner_id, channelName=name)
                 else:
-                    self.db.insert_user_settings(guildId=guild_id, userId=owner_id, channelName=name, channelLimit=category_settings.channel_limit, bitrate=category_settings.bitrate, defaultRole=temp_default_role.id, autoGame=False)
-            await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_update_channel_name'), f'{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, "info_channel_name_change"), channel=name)}', delete_after=5)
+                    await self.db.insert_user_settings(guildId=guild_id, userId=owner_id, channelName=name, channelLimit=category_settings.channel_limit, bitrate=category_settings.bitrate, defaultRole=temp_default_role.id, autoGame=False)
+            await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_update_channel_name'), f'{ctx.author.mention}, {self.render_string(guild_id, "info_channel_name_change", channel=name)}', delete_after=5)
         except Exception as ex:
             self.log.error(guild_id, _method, str(ex), traceback.format_exc())
             await self.notify_of_error(ctx)
         finally:
-            self.db.close()
-            await ctx.message.delete()
+            await self.db.close()
+            self.delete_message(ctx.message)
 
 
     @voice.command(aliases=["rename"])
+    @logcontext.log_method
     async def force_name(self, ctx, *, name: str = None):
-        _method = inspect.stack()[1][3]
-        self.db.open()
+        _method = logcontext.current_method()
+        await self.db.open()
         guild_id = ctx.guild.id
         channel_id = ctx.author.voice.channel.id
         channel = ctx.author.voice.channel
@@ -1686,67 +2030,69 @@ class voice(commands.Cog):
             if not self.isInVoiceChannel(ctx):
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_not_in_channel"), f'{ctx.author.mention}, {self.get_string(guild_id, "info_not_in_channel")}', delete_after=5)
                 return
-            if self.isAdmin(ctx):
+            if await self.isAdmin(ctx):
                 if not name or name == "":
-                    name = utils.get_random_name()
+                    name = self.get_random_name(guild_id)
                 category_id = ctx.author.voice.channel.category.id
-                guild_category_settings = self.db.get_guild_category_settings(guildId=guild_id, categoryId=category_id)
-                owner_id = self.db.get_channel_owner_id(guildId=guild_id, channelId=channel_id)
+                guild_category_settings = await self.db.get_guild_category_settings(guildId=guild_id, categoryId=category_id)
+                owner_id = await self.db.get_channel_owner_id(guildId=guild_id, channelId=channel_id)
                 if not owner_id:
                     await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_update_channel_name'), f"{ctx.author.mention}, {self.get_string(guild_id, 'info_voice_not_tracked')}", delete_after=5)
                     return
-                user_settings = self.db.get_user_settings(guildId=guild_id, userId=owner_id)
-                default_role = self.db.get_default_role(guildId=guild_id, categoryId=category_id, userId=owner_id)
+                user_settings = await self.db.get_user_settings(guildId=guild_id, userId=owner_id)
+                default_role = await self.db.get_default_role(guildId=guild_id, categoryId=category_id, userId=owner_id)
                 temp_default_role = self.get_by_name_or_id(ctx.guild.roles, default_role) or ctx.guild.default_role
                 # text channel rename is automatically handled by the change event on the voice channel.
 
                 if channel:
                     self.log.debug(guild_id, _method, f"Edit the channel to: {channel.name} -> {name}")
-                    await channel.edit(name=name)
-                    await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_update_channel_name'), f'{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, "info_channel_name_change"), channel=name)}', delete_after=5)
+                    await self.edit_channel(channel, name=name)
+                    await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_update_channel_name'), f'{ctx.author.mention}, {self.render_string(guild_id, "info_channel_name_change", channel=name)}', delete_after=5)
 
                 if user_settings:
-                    self.db.update_user_channel_name(guildId=guild_id, userId=owner_id, channelName=name)
+                    await self.db.update_user_channel_name(guildId=guild_id, userId=owner_id, channelName=name)
                 else:
-                    self.db.insert_user_settings(guildId=guild_id, userId=owner_id, channelName=name, channelLimit=guild_category_settings.channel_limit, bitrate=guild_category_settings.bitrate, defaultRole=temp_default_role.id, autoGame=False)
+                    await self.db.insert_user_settings(guildId=guild_id, userId=owner_id, channelName=name, channelLimit=guild_category_settings.channel_limit, bitrate=guild_category_settings.bitrate, defaultRole=temp_default_role.id, autoGame=False)
             else:
                 self.log.debug(guild_id, _method, f"{ctx.author} tried to run command 'rename'")
         except Exception as ex:
             self.log.error(guild_id, _method, str(ex), traceback.format_exc())
             await self.notify_of_error(ctx)
         finally:
-            self.db.close()
-            await ctx.message.delete()
+            await self.db.close()
+            self.delete_message(ctx.message)
 
     @voice.command()
+    @logcontext.log_method
     async def whoowns(self, ctx):
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         guild_id = ctx.guild.id
         try:
-            self.db.open()
+            await self.db.open()
             channel = ctx.author.voice.channel
             if channel == None:
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, "title_not_in_channel"), f'{ctx.author.mention}, {self.get_string(guild_id, "info_not_in_channel")}', delete_after=5)
             else:
-                owner_id = self.db.get_channel_owner_id(guildId=guild_id, channelId=channel.id)
+                owner_id = await self.db.get_channel_owner_id(guildId=guild_id, channelId=channel.id)
                 if owner_id:
                     owner = await self.get_or_fetch_member(ctx.guild, owner_id)
                     if owner:
-                        await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_who_owns'), f"{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, 'info_who_owns'), channel=channel.name, user=owner.mention)}", delete_after=30)
+                        await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_who_owns'), f"{ctx.author.mention}, {self.render_string(guild_id, 'info_who_owns', channel=channel.name, user=owner.mention)}", delete_after=30)
                     else:
-                        await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_who_owns'), f"{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, 'info_who_owns'), channel=channel.name, user=f'UserId:{str(owner_id)}')}", delete_after=30)
+                        await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_who_owns'), f"{ctx.author.mention}, {self.render_string(guild_id, 'info_who_owns', channel=channel.name, user=f'UserId:{str(owner_id)}')}", delete_after=30)
         except Exception as ex:
             self.log.error(guild_id, _method, str(ex), traceback.format_exc())
             await self.notify_of_error(ctx)
         finally:
-            self.db.close()
-            await ctx.message.delete()
+            await self.db.close()
+            self.delete_message(ctx.message)
 
     @voice.command()
+    @logcontext.log_method
     async def give(self, ctx, newOwner: discord.Member):
         """Give ownership of the channel to another user in the channel"""
-        _method = inspect.stack()[1][3]
-        self.db.open()
+        _method = logcontext.current_method()
+        await self.db.open()
         guild_id = ctx.guild.id
         if not self.isInVoiceChannel(ctx):
             await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_not_in_channel'), f'{ctx.author.mention}, {self.get_string(guild_id, "info_not_in_channel")}', delete_after=5)
@@ -1756,25 +2102,26 @@ class voice(commands.Cog):
             channel_id = ctx.author.voice.channel.id
             new_owner_id = newOwner.id
             # update_tracked_channel_owner
-            owner_id = self.db.get_channel_owner_id(guildId=guild_id, channelId=channel_id)
+            owner_id = await self.db.get_channel_owner_id(guildId=guild_id, channelId=channel_id)
             if new_owner_id == owner_id:
                 # Can't grant to self
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_update_owner'), f"{ctx.author.mention}, {self.get_string(guild_id, 'info_channel_owned_you')}", delete_after=5)
             else:
-                self.db.update_tracked_channel_owner(guildId=guild_id, voiceChannelId=channel_id, ownerId=owner_id, newOwnerId=new_owner_id)
-                await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_update_owner'), f"{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, 'info_new_owner'), user=newOwner.mention)}", delete_after=5)
+                await self.db.update_tracked_channel_owner(guildId=guild_id, voiceChannelId=channel_id, ownerId=owner_id, newOwnerId=new_owner_id)
+                await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_update_owner'), f"{ctx.author.mention}, {self.render_string(guild_id, 'info_new_owner', user=newOwner.mention)}", delete_after=5)
         except Exception as ex:
             self.log.error(guild_id, _method, str(ex), traceback.format_exc())
             await self.notify_of_error(ctx)
         finally:
-            self.db.close()
-            await ctx.message.delete()
+            await self.db.close()
+            self.delete_message(ctx.message)
 
     @voice.command()
+    @logcontext.log_method
     async def claim(self, ctx):
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         found_as_owner = False
-        self.db.open()
+        await self.db.open()
         guild_id = ctx.guild.id
         if not self.isInVoiceChannel(ctx):
             await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_not_in_channel'), f'{ctx.author.mention}, {self.get_string(guild_id, "info_not_in_channel")}', delete_after=5)
@@ -1783,25 +2130,25 @@ class voice(commands.Cog):
             channel = ctx.author.voice.channel
             aid = ctx.author.id
 
-            owner_id = self.db.get_channel_owner_id(guildId=guild_id, channelId=channel.id)
-            if not owner_id and not self.isAdmin(ctx):
+            owner_id = await self.db.get_channel_owner_id(guildId=guild_id, channelId=channel.id)
+            if not owner_id and not await self.isAdmin(ctx):
                 await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_permission_denied'), f"{ctx.author.mention}, {self.get_string(guild_id, 'info_permission_denied')}", delete_after=5)
             else:
                 for data in channel.members:
                     if data.id == owner_id:
                         owner = await self.get_or_fetch_member(ctx.guild, owner_id)
-                        await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_update_owner'), f"{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, 'info_channel_owned'), user=owner.mention)}", delete_after=5)
+                        await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_update_owner'), f"{ctx.author.mention}, {self.render_string(guild_id, 'info_channel_owned', user=owner.mention)}", delete_after=5)
                         found_as_owner = True
                         break
                 if not found_as_owner:
-                    self.db.update_tracked_channel_owner(guildId=guild_id, voiceChannelId=channel.id, ownerId=owner_id, newOwnerId=aid)
-                    await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_update_owner'), f"{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, 'info_new_owner'), user=ctx.author.mention)}", delete_after=5)
+                    await self.db.update_tracked_channel_owner(guildId=guild_id, voiceChannelId=channel.id, ownerId=owner_id, newOwnerId=aid)
+                    await self.sendEmbed(ctx.channel, self.get_string(guild_id, 'title_update_owner'), f"{ctx.author.mention}, {self.render_string(guild_id, 'info_new_owner', user=ctx.author.mention)}", delete_after=5)
         except Exception as ex:
             self.log.error(guild_id, _method, str(ex), traceback.format_exc())
             await self.notify_of_error(ctx)
         finally:
-            self.db.close()
-            await ctx.message.delete()
+            await self.db.close()
+            self.delete_message(ctx.message)
 
     async def ask_yes_no(self, ctx, question: str, title: str = "Voice Channel Setup"):
         guild_id = ctx.guild.id
@@ -1821,7 +2168,7 @@ class voice(commands.Cog):
             await self.sendEmbed(ctx.channel, title, self.get_string(guild_id, 'took_too_long'), delete_after=5)
         else:
             yes_no = utils.str2bool(button_ctx.custom_id)
-            await yes_no_req.delete()
+            self.delete_message(yes_no_req)
         return yes_no
 
     async def ask_limit(self, ctx, title: str = "Voice Channel Setup"):
@@ -1846,8 +2193,8 @@ class voice(commands.Cog):
             return
         else:
             defaultLimit = int(limitResp.content)
-            await limitResp.delete()
-            await limit_ask.delete()
+            self.delete_message(limitResp)
+            self.delete_message(limit_ask)
         return defaultLimit
 
     async def ask_bitrate(self, ctx, title: str = "Voice Channel Setup"):
@@ -1869,7 +2216,7 @@ class voice(commands.Cog):
 
         bitrate_min = 8
         bitrate_limit = int(round(ctx.guild.bitrate_limit / 1000))
-        bitrate_ask = await self.sendEmbed(ctx.channel, title, f'{utils.str_replace(self.get_string(guild_id, "info_bitrate"), bitrate_min=str(bitrate_min), bitrate_limit=str(bitrate_limit))}', delete_after=60, footer=self.get_string(guild_id, 'footer_60_seconds'))
+        bitrate_ask = await self.sendEmbed(ctx.channel, title, f'{self.render_string(guild_id, "info_bitrate", bitrate_min=str(bitrate_min), bitrate_limit=str(bitrate_limit))}', delete_after=60, footer=self.get_string(guild_id, 'footer_60_seconds'))
         try:
             bitrateResp = await self.bot.wait_for('message', check=check_bitrate, timeout=60)
         except asyncio.TimeoutError:
@@ -1877,8 +2224,8 @@ class voice(commands.Cog):
             return
         else:
             defaultBitrate = int(bitrateResp.content)
-            await bitrateResp.delete()
-            await bitrate_ask.delete()
+            self.delete_message(bitrateResp)
+            self.delete_message(bitrate_ask)
             if defaultBitrate == 0:
                 defaultBitrate = self.settings.BITRATE_DEFAULT
         return defaultBitrate
@@ -1887,9 +2234,9 @@ class voice(commands.Cog):
         def check_user(m):
             same = m.author.id == ctx.author.id
             return same
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         guild_id = ctx.guild.id
-        if not self.isAdmin(ctx):
+        if not await self.isAdmin(ctx):
             raise PermissionError()
         def check_user(m):
             same = m.author.id == ctx.author.id
@@ -1919,7 +2266,7 @@ class voice(commands.Cog):
             await self.sendEmbed(ctx.channel, title, self.get_string(guild_id, "took_too_long"), delete_after=5)
         else:
             category_id = int(button_ctx.selected_options[0])
-            await ask_context.delete()
+            self.delete_message(ask_context)
             if category_id == 0: # selected "OTHER"
                 try:
                     ask_existing_category = await self.sendEmbed(ctx.channel, title, self.get_string(guild_id, 'ask_category_name'), delete_after=60, footer=self.get_string(guild_id, 'footer_60_seconds'))
@@ -1927,17 +2274,17 @@ class voice(commands.Cog):
                 except asyncio.TimeoutError:
                     await self.sendEmbed(ctx.channel, title, self.get_string(guild_id, "took_too_long"), delete_after=5)
                 else:
-                    await ask_existing_category.delete()
+                    self.delete_message(ask_existing_category)
                     cat_name_or_id = category.content
                     if cat_name_or_id.isnumeric():
                         cat_name_or_id = int(cat_name_or_id)
                     found_category = self.get_by_name_or_id(ctx.guild.categories, cat_name_or_id)
-                    await category.delete()
+                    self.delete_message(category)
                     if found_category:
-                        await self.sendEmbed(ctx.channel, title, f"{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, 'info_found_existing_category'), category=found_category.name)}", delete_after=5)
+                        await self.sendEmbed(ctx.channel, title, f"{ctx.author.mention}, {self.render_string(guild_id, 'info_found_existing_category', category=found_category.name)}", delete_after=5)
                         return found_category
                     else:
-                        await self.sendEmbed(ctx.channel, title, f"{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, 'info_no_category_found'), category=found_category.name)}", delete_after=5)
+                        await self.sendEmbed(ctx.channel, title, f"{ctx.author.mention}, {self.render_string(guild_id, 'info_no_category_found', category=found_category.name)}", delete_after=5)
                         return None
             elif category_id == -1: # selected "NEW"
                 try:
@@ -1946,17 +2293,17 @@ class voice(commands.Cog):
                 except asyncio.TimeoutError:
                     await self.sendEmbed(ctx.channel, title, self.get_string(guild_id, "took_too_long"), delete_after=5)
                 else:
-                    await ask_new_category.delete()
-                    selected_category = await ctx.guild.create_category_channel(new_category.content)
-                    await new_category.delete()
-                    await self.sendEmbed(ctx.channel, title, f"{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, 'info_category_created'), category=selected_category.name)}", delete_after=5)
+                    self.delete_message(ask_new_category)
+                    selected_category = await self.rest.submit(requestpriority.RequestPriority.CREATE, ("guild", guild_id, "channels"), ctx.guild.create_category_channel, new_category.content)
+                    self.delete_message(new_category)
+                    await self.sendEmbed(ctx.channel, title, f"{ctx.author.mention}, {self.render_string(guild_id, 'info_category_created', category=selected_category.name)}", delete_after=5)
 
                     return selected_category
             else: # selected a category
                 selected_category = discord.utils.get(ctx.guild.categories, id=category_id)
                 if selected_category:
                     self.log.debug(guild_id, _method, f"{ctx.author.mention} selected the category '{selected_category.name}'")
-                    await self.sendEmbed(ctx.channel, title, f"{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, 'info_category_selected'), category=selected_category.name)}", delete_after=5)
+                    await self.sendEmbed(ctx.channel, title, f"{ctx.author.mention}, {self.render_string(guild_id, 'info_category_selected', category=selected_category.name)}", delete_after=5)
                     return selected_category
                 else:
                     await self.sendEmbed(ctx.channel, title, f"{ctx.author.mention}, {self.get_string(guild_id, 'info_unverified_category')}", delete_after=5)
@@ -1966,7 +2313,7 @@ class voice(commands.Cog):
         def check_user(m):
             same = m.author.id == user.id
             return same
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         guild_id = targetChannel.guild.id
         options = []
         games = []
@@ -2021,10 +2368,10 @@ class voice(commands.Cog):
             except asyncio.TimeoutError:
                 await self.sendEmbed(targetChannel, title, self.get_string(guild_id, 'took_too_long'), delete_after=5)
             else:
-                await ask_context.delete()
+                self.delete_message(ask_context)
                 selected_game = button_ctx.selected_options[0]
                 if selected_game:
-                    await self.sendEmbed(targetChannel, title, f"{user.mention}, {utils.str_replace(self.get_string(guild_id, 'info_game_selected'), game=selected_game.name)}", delete_after=5)
+                    await self.sendEmbed(targetChannel, title, f"{user.mention}, {self.render_string(guild_id, 'info_game_selected', game=selected_game.name)}", delete_after=5)
                     return selected_game
                 else:
                     return None
@@ -2035,7 +2382,7 @@ class voice(commands.Cog):
         def check_user(m):
             same = m.author.id == ctx.author.id
             return same
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         guild_id = ctx.guild.id
         role_id = None
         try:
@@ -2044,16 +2391,16 @@ class voice(commands.Cog):
         except asyncio.TimeoutError:
             await self.sendEmbed(ctx.channel, title, self.get_string(guild_id, "took_too_long"), delete_after=5)
         else:
-            await ask_role_name_id.delete()
+            self.delete_message(ask_role_name_id)
             role_name_id = role_name_id_resp.content
             if role_name_id.isnumeric():
                 role_name_id = int(role_name_id)
             found_role= self.get_by_name_or_id(ctx.guild.roles, role_name_id)
-            await role_name_id_resp.delete()
+            self.delete_message(role_name_id_resp)
             if found_role:
                 role_id = found_role.id
             else:
-                await self.sendEmbed(ctx.channel, title, utils.str_replace(self.get_string(guild_id, "info_role_not_found"), role=str(role_name_id)), delete_after=5)
+                await self.sendEmbed(ctx.channel, title, self.render_string(guild_id, "info_role_not_found", role=str(role_name_id)), delete_after=5)
                 role_id = ctx.guild.default_role.id
         return role_id
 
@@ -2061,7 +2408,7 @@ class voice(commands.Cog):
         def check_user(m):
             same = m.author.id == ctx.author.id
             return same
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         guild_id = ctx.guild.id
         options = []
         roles = [r for r in ctx.guild.roles if not r.is_bot_managed() and not r.managed and not r.is_integration() and r.permissions.administrator]
@@ -2092,11 +2439,11 @@ class voice(commands.Cog):
             if role_id == 0:
                 role_id = await self.ask_role_by_name_or_id(ctx, title)
 
-            await ask_context.delete()
+            self.delete_message(ask_context)
             selected_role = discord.utils.get(ctx.guild.roles, id=role_id)
             if selected_role:
                 self.log.debug(guild_id, _method, f"{ctx.author.mention} selected the role '{selected_role.name}'")
-                await self.sendEmbed(ctx.channel, title, f"{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, 'info_role_selected'), role=selected_role.name)}", delete_after=5)
+                await self.sendEmbed(ctx.channel, title, f"{ctx.author.mention}, {self.render_string(guild_id, 'info_role_selected', role=selected_role.name)}", delete_after=5)
                 return selected_role
             else:
                 await self.sendEmbed(ctx.channel, title, f"{ctx.author.mention}, {self.get_string(guild_id, 'info_unverified_admin_role')}", delete_after=5)
@@ -2106,7 +2453,7 @@ class voice(commands.Cog):
         def check_user(m):
             same = m.author.id == ctx.author.id
             return same
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         guild_id = ctx.guild.id
         options = []
         roles = [r for r in ctx.guild.roles if not r.is_bot_managed() and not r.managed and not r.is_integration()]
@@ -2135,11 +2482,11 @@ class voice(commands.Cog):
             if role_id == 0:
                 role_id = await self.ask_role_by_name_or_id(ctx, title)
 
-            await ask_context.delete()
+            self.delete_message(ask_context)
             selected_role = discord.utils.get(ctx.guild.roles, id=role_id)
             if selected_role:
                 self.log.debug(guild_id, _method, f"{ctx.author.mention} selected the role '{selected_role.name}'")
-                await self.sendEmbed(ctx.channel, title, f"{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, 'info_role_selected'), role=selected_role.name)}", delete_after=5)
+                await self.sendEmbed(ctx.channel, title, f"{ctx.author.mention}, {self.render_string(guild_id, 'info_role_selected', role=selected_role.name)}", delete_after=5)
                 return selected_role
             else:
                 await self.sendEmbed(ctx.channel, title, f"{ctx.author.mention}, {self.get_string(guild_id, 'info_unverified_role')}", delete_after=5)
@@ -2149,7 +2496,7 @@ class voice(commands.Cog):
         def check_user(m):
             same = m.author.id == ctx.author.id
             return same
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         guild_id = ctx.guild.id
         options = []
         categories = [r for r in ctx.guild.categories]
@@ -2175,7 +2522,7 @@ class voice(commands.Cog):
             await self.sendEmbed(ctx.channel, title, self.get_string(guild_id, 'took_too_long'), delete_after=5)
         else:
             category_id = int(button_ctx.selected_options[0])
-            await ask_context.delete()
+            self.delete_message(ask_context)
             if category_id == 0: # selected "OTHER"
                 try:
                     ask_existing_category = await self.sendEmbed(ctx.channel, title, self.get_string(guild_id, 'ask_category_name'), delete_after=60, footer=self.get_string(guild_id, 'footer_60_seconds'))
@@ -2183,17 +2530,17 @@ class voice(commands.Cog):
                 except asyncio.TimeoutError:
                     await self.sendEmbed(ctx.channel, title, self.get_string(guild_id, 'took_too_long'), delete_after=5)
                 else:
-                    await ask_existing_category.delete()
+                    self.delete_message(ask_existing_category)
                     cat_name_or_id = category.content
                     if cat_name_or_id.isnumeric():
                         cat_name_or_id = int(cat_name_or_id)
                     found_category = self.get_by_name_or_id(ctx.guild.categories, cat_name_or_id)
-                    await category.delete()
+                    self.delete_message(category)
                     if found_category:
-                        await self.sendEmbed(ctx.channel, title, f"{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, 'info_found_existing_category'), category=found_category.name)}", delete_after=5)
+                        await self.sendEmbed(ctx.channel, title, f"{ctx.author.mention}, {self.render_string(guild_id, 'info_found_existing_category', category=found_category.name)}", delete_after=5)
                         return found_category
                     else:
-                        await self.sendEmbed(ctx.channel, title, f"{ctx.author.mention}, {utils.str_replace(self.get_string(guild_id, 'info_no_category_found'), category=cat_name_or_id)}", delete_after=5)
+                        await self.sendEmbed(ctx.channel, title, f"{ctx.author.mention}, {self.render_string(guild_id, 'info_no_category_found', category=cat_name_or_id)}", delete_after=5)
                         return None
             elif category_id == -1: # selected "NEW"
                 try:
@@ -2202,9 +2549,9 @@ class voice(commands.Cog):
                 except asyncio.TimeoutError:
                     await self.sendEmbed(ctx.channel, title, self.get_string(guild_id, 'took_too_long'), delete_after=5)
                 else:
-                    await ask_new_category.delete()
-                    selected_category = await ctx.guild.create_category_channel(new_category.content)
-                    await new_category.delete()
+                    self.delete_message(ask_new_category)
+                    selected_category = await self.rest.submit(requestpriority.RequestPriority.CREATE, ("guild", guild_id, "channels"), ctx.guild.create_category_channel, new_category.content)
+                    self.delete_message(new_category)
                     await self.sendEmbed(ctx.channel, title, f"{ctx.author.mention}, {self.get_string(guild_id, 'info_created_category')} '{selected_category.name}'", delete_after=5)
 
                     return selected_category
@@ -2222,7 +2569,7 @@ class voice(commands.Cog):
         def check_user(m):
             same = m.author.id == ctx.author.id
             return same
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         guild_id = ctx.guild.id
         options = []
 
@@ -2256,7 +2603,7 @@ class voice(commands.Cog):
             await self.sendEmbed(ctx.channel, title, self.get_string(guild_id, 'took_too_long'), delete_after=5)
         else:
             language_id = button_ctx.selected_options[0]
-            await ask_language.delete()
+            self.delete_message(ask_language)
         return language_id
 
     def isInVoiceChannel(self, ctx):
@@ -2265,19 +2612,18 @@ class voice(commands.Cog):
         else:
             return ctx.author.voice.channel is not None
 
-    def isAdmin(self, ctx):
-        _method = inspect.stack()[1][3]
-        self.db.open()
-        guild_settings = self.db.get_guild_settings(ctx.guild.id)
-        is_in_guild_admin_role = False
-        # see if there are guild settings for admin role
-        if guild_settings:
-            guild_admin_role = self.get_by_name_or_id(ctx.guild.roles, guild_settings.admin_role)
-            is_in_guild_admin_role = guild_admin_role in ctx.author.roles
-        is_bot_owner = str(ctx.author.id) == self.settings.bot_owner
-        return is_bot_owner or is_in_guild_admin_role
-
-    async def sendEmbed(self, channel, title, message, fields=None, delete_after=None, footer=None, components=None):
+    async def isAdmin(self, ctx):
+        if str(ctx.author.id) == self.settings.bot_owner:
+            return True
+        # the admin role is resolved once per guild and the answer kept per member, until the
+        # guild settings, the guild roles or the member's roles change
+        return await self.db.is_admin_member(ctx.guild, ctx.author)
+
+    async def sendEmbed(self, channel, title, message, fields=None, delete_after=None, footer=None, components=None, priority: requestpriority.RequestPriority = requestpriority.RequestPriority.NOTICE):
+        return await self.post_embed(channel, title, message, fields=fields, delete_after=delete_after, footer=footer, components=components, priority=priority)
+
+    def post_embed(self, channel, title, message, fields=None, delete_after=None, footer=None, components=None, priority: requestpriority.RequestPriority = requestpriority.RequestPriority.NOTICE):
+        # queues the embed, the returned future has the message. callers that do not wait for it use detach_request
         embed = discord.Embed(title=title, description=message, color=0x7289da)
         if fields is not None:
             for f in fields:
@@ -2286,7 +2632,46 @@ class voice(commands.Cog):
             embed.set_footer(text=f'Developed by {self.settings.author}')
         else:
             embed.set_footer(text=footer)
-        return await channel.send(embed=embed, delete_after=delete_after, components=components)
+        future = self.rest.submit(priority, ("channel", channel.id), channel.send, embed=embed, components=components)
+        if delete_after is not None:
+            # not discord.py's delete_after, that delete would skip the queue
+            future.add_done_callback(lambda f: self.delete_sent_message_later(f, delete_after))
+        return future
+
+    def edit_channel(self, channel, priority: requestpriority.RequestPriority = requestpriority.RequestPriority.EDIT, **fields):
+        # a queued edit of the same fields of the channel is replaced by this one, only the last rename is sent
+        return self.rest.submit(priority, ("channel", channel.id), channel.edit, coalesce=("edit", channel.id, tuple(sorted(fields))), **fields)
+
+    def set_permissions(self, channel, target, priority: requestpriority.RequestPriority = requestpriority.RequestPriority.EDIT, **perms):
+        # set_permissions replaces the target's whole overwrite, so a queued one for the same target is replaced by this one
+        return self.rest.submit(priority, ("channel", channel.id), channel.set_permissions, target, coalesce=("permissions", channel.id, target.id), **perms)
+
+    def delete_channel(self, channel, priority: requestpriority.RequestPriority = requestpriority.RequestPriority.DELETE):
+        return self.rest.submit(priority, ("channel", channel.id), channel.delete)
+
+    def delete_message(self, message):
+        # cleanup waits behind everything members are waiting on and nothing waits for it
+        future = self.rest.submit(requestpriority.RequestPriority.DELETE, ("channel", message.channel.id), message.delete)
+        guild_id = message.guild.id if message.guild else 0
+        future.add_done_callback(lambda f: self.log_request_error(guild_id, "voice.delete_message", f))
+        return future
+
+    def delete_sent_message_later(self, future, delay: float):
+        if future.cancelled() or future.exception() is not None:
+            return
+        asyncio.get_event_loop().call_later(delay, self.delete_message, future.result())
+
+    def detach_request(self, guildId: int, method: str, future):
+        # for requests nothing waits on, a failure is only logged
+        future.add_done_callback(lambda f: self.log_request_error(guildId, method, f))
+        return future
+
+    def log_request_error(self, guildId: int, method: str, future):
+        if future.cancelled():
+            return
+        ex = future.exception()
+        if ex is not None and not isinstance(ex, discord.errors.NotFound):
+            self.log.error(guildId, method, str(ex), "".join(traceback.format_exception(type(ex), ex, ex.__traceback__)))
 
     async def notify_of_error(self, ctx):
         guild_id = ctx.guild.id
@@ -2301,7 +2686,7 @@ class voice(commands.Cog):
             return None
 
     async def get_or_fetch_channel(self, channelId: int):
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         try:
             if channelId:
                 chan = self.bot.get_channel(channelId)
@@ -2318,7 +2703,7 @@ class voice(commands.Cog):
             return None
 
     async def get_or_fetch_user(self, userId: int):
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         try:
             if userId:
                 user = self.bot.get_user(userId)
@@ -2334,7 +2719,7 @@ class voice(commands.Cog):
             return None
 
     async def get_or_fetch_member(self, guild, userId: int):
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         try:
             if userId:
                 user = guild.get_member(userId)
@@ -2350,47 +2735,48 @@ class voice(commands.Cog):
             return None
 
     @setup.error
+    @logcontext.log_method
     async def info_error(self, ctx, error):
-        _method = inspect.stack()[1][3]
+        _method = logcontext.current_method()
         if isinstance(error, discord.errors.NotFound):
             self.log.warn(ctx.guild.id, _method , str(error), traceback.format_exc())
         else:
             self.log.error(ctx.guild.id, _method , str(error), traceback.format_exc())
 
-    def set_guild_strings(self, guildId: int):
-        _method = inspect.stack()[1][3]
-        guild_settings = self.db.get_guild_settings(guildId)
+    async def set_guild_strings(self, guildId: int):
+        _method = logcontext.current_method()
+        guild_settings = await self.db.get_guild_settings(guildId)
         lang = self.settings.language
-        if guild_settings:
+        if guild_settings and guild_settings.language:
             lang = guild_settings.language
-        self.strings[str(guildId)] = self.settings.strings[lang]
+        self.strings[guildId] = self.settings.string_tables.get(lang, self.default_strings)
         self.log.debug(guildId, _method, f"Guild Language Set: {lang}")
 
-        # for x in self.strings[str(guildId)]:
-        #     self.log.debug(guildId, _method, self.get_string(guildId, x))
     def get_string(self, guildId: int, key: str):
-        _method = inspect.stack()[1][3]
-        if not key:
-            self.log.debug(guildId, _method, f"KEY WAS EMPTY")
-            return ''
-        if str(guildId) in self.strings:
-            if key in self.strings[str(guildId)]:
-                return self.strings[str(guildId)][key]
-            elif key in self.settings.strings[self.settings.language]:
-                self.log.debug(guildId, _method, f"Unable to find key in defined language. Falling back to {self.settings.language}")
-                return self.settings.strings[self.settings.language][key]
-            else:
-                self.log.warn(guildId, _method, f"UNKNOWN STRING KEY: {key}")
-                return f"{key}"
-        else:
-            if key in self.settings.strings[self.settings.language]:
-                return self.settings.strings[self.settings.language][key]
-            else:
-                self.log.warn(guildId, _method, f"UNKNOWN STRING KEY: {key}")
-                return f"{key}"
-
-    def get_language(self, guildId: int):
-        guild_setting = self.db.get_guild_settings(guildId)
+        # the tables have the default language merged in, a miss is an unknown key
+        try:
+            return self.strings.get(guildId, self.default_strings).strings[key]
+        except KeyError:
+            return self.get_unknown_string(guildId, key)
+
+    def render_string(self, guildId: int, key: str, **kwargs):
+        template = self.strings.get(guildId, self.default_strings).templates.get(key)
+        if template is None:
+            return self.get_unknown_string(guildId, key)
+        return template.render(**kwargs)
+
+    def get_random_name(self, guildId: int, nounCount: int = 1, adjectiveCount: int = 1):
+        # in the guild's language, from the bundled word lists
+        language = self.strings.get(guildId, self.default_strings).language
+        return utils.get_random_name(noun_count=nounCount, adjective_count=adjectiveCount, language=language)
+
+    def get_unknown_string(self, guildId: int, key: str):
+        if key:
+            self.log.warn(guildId, logcontext.current_method(), f"UNKNOWN STRING KEY: {key}")
+        return f"{key}"
+
+    async def get_language(self, guildId: int):
+        guild_setting = await self.db.get_guild_settings(guildId)
         if not guild_setting:
             return self.settings.language
         return guild_setting.language or self.settings.language
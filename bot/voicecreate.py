@@ -15,7 +15,9 @@ import typing
 from .cogs.lib import utils
 from .cogs.lib import settings
 from .cogs.lib import sqlite
-from .cogs.lib import mongo
+from .cogs.lib import database
+from .cogs.lib import guildconfig
+from .cogs.lib import channelregistry
 from .cogs.lib import logger
 from .cogs.lib import loglevel
 from .cogs.lib import dbprovider
@@ -23,7 +25,7 @@ from discord_slash import SlashCommand
 
 class VoiceCreate():
     DISCORD_TOKEN = os.environ['DISCORD_BOT_TOKEN']
-    DBVERSION = 6 # CHANGED WHEN THERE ARE NEW SQL FILES TO PROCESS
+    DBVERSION = 11 # CHANGED WHEN THERE ARE NEW SQL FILES TO PROCESS
     # 0 = NO SCHEMA APPLIED
 
     # VERSION HISTORY:
@@ -33,25 +35,49 @@ class VoiceCreate():
     # v4: 9/9/2021 - added auto_game column to userSettings
     # v5: 9/13/2021 - rename the collections
     # v6: 9/15/2021 - added language field to guild_settings
+    # v7: 10/18/2026 - added mongo indexes for the hot query shapes
+    # v8: 10/18/2026 - primary keys and covering indexes for the sqlite tables
+    # v9: 10/18/2026 - voice and text tracking merged into channel sets
+    # v10: 10/18/2026 - created_at on logs and history for retention, sqlite logs and history tables
+    # v11: 10/18/2026 - pool size on create channels, pooled channel sets
     def __init__(self):
         self.settings = settings.Settings()
         print(f"APP VERSION: {self.settings.APP_VERSION}")
         print(f"DBPath: {self.settings.db_path}")
         self.client = discord.Client()
 
+        # one client pool for the whole process. the cogs, logger and migrator all check out of it.
+        # the mongo modules are only imported when mongo is used, sqlite deployments never load pymongo.
+        self.mongo_pool = None
+        if self.settings.db_provider != dbprovider.DatabaseProvider.SQLITE:
+            from .cogs.lib import mongopool
+            self.mongo_pool = mongopool.MongoClientPool(self.settings.db_url, maxPoolSize=self.settings.db_pool_size, minPoolSize=self.settings.db_min_pool_size)
+
+        # the cogs await every database call. the synchronous providers are wrapped so their
+        # blocking calls run on worker threads instead of the event loop.
         if self.settings.db_provider == dbprovider.DatabaseProvider.SQLITE:
-            self.db = sqlite.SqliteDatabase()
-        elif self.settings.db_provider == dbprovider.DatabaseProvider.MONGODB:
-            self.db = mongo.MongoDatabase()
+            # sqlite only allows one writer, more threads would just wait on the file lock
+            self.db = database.ExecutorDatabase(sqlite.SqliteDatabase(), maxWorkers=1, threadNamePrefix="sqlite")
+        elif self.settings.db_provider == dbprovider.DatabaseProvider.MONGODB_ASYNC:
+            from .cogs.lib import mongoasync
+            self.db = mongoasync.MongoAsyncDatabase(pool=self.mongo_pool)
         else:
-            self.db = mongo.MongoDatabase()
+            from .cogs.lib import mongo
+            workers = min(32, self.settings.db_pool_size)
+            self.db = database.ExecutorDatabase(mongo.MongoDatabase(pool=self.mongo_pool), maxWorkers=workers, threadNamePrefix="mongo")
+        # guild configuration is read on every voice event but rarely changes, keep it in memory
+        self.db = guildconfig.GuildConfigCache(self.db)
+        # tracked channel sets are owned by this process, look them up in memory
+        self.db = channelregistry.TrackedChannelRegistry(self.db)
         self.initDB()
 
         log_level = loglevel.LogLevel[self.settings.log_level.upper()]
         if not log_level:
             log_level = loglevel.LogLevel.DEBUG
 
-        self.log = logger.Log(minimumLogLevel=log_level)
+        # one logger for the whole bot, the cogs get it from the bot
+        sinks = logger.create_sinks(self.settings, minimumLogLevel=log_level, pool=self.mongo_pool)
+        self.log = logger.Log(minimumLogLevel=log_level, sinks=sinks, queueSize=self.settings.log_queue_size, batchSize=self.settings.log_batch_size, flushInterval=self.settings.log_flush_interval)
         self.log.debug(0, "voice.__init__", f"DB Provider {self.settings.db_provider.name}")
         self.log.debug(0, "voice.__init__", f"Logger initialized with level {log_level.name}")
 
@@ -60,6 +86,9 @@ class VoiceCreate():
             case_insensitive=True,
             intents=discord.Intents.all()
         )
+        self.bot.mongo_pool = self.mongo_pool
+        self.bot.db = self.db
+        self.bot.log = self.log
 
         initial_extensions = ['bot.cogs.events', 'bot.cogs.voice', 'bot.cogs.slash']
         for extension in initial_extensions:
@@ -73,6 +102,10 @@ class VoiceCreate():
 
         self.bot.remove_command("help")
         self.bot.run(self.DISCORD_TOKEN)
+        self.db.shutdown()
+        self.log.close()
+        if self.mongo_pool:
+            self.mongo_pool.close()
 
     def initDB(self):
         self.db.UPDATE_SCHEMA(self.DBVERSION)
@@ -82,17 +115,17 @@ class VoiceCreate():
         # # mdb.RESET_MIGRATION()
         # mdb.UPDATE_SCHEMA(self.DBVERSION)
 
-    def get_prefix(self, client, message):
-        self.db.open()
-        # get the prefix for the guild.
-        prefixes = ['.']    # sets the prefixes, you can keep it as an array of only 1 item if you need only one prefix
-        if message.guild:
-            guild_settings = self.db.get_guild_settings(message.guild.id)
-            if guild_settings:
-                prefixes = guild_settings.prefix or "."
-        elif not message.guild:
-            prefixes = ['.']   # Only allow '.' as a prefix when in DMs, this is optional
+    async def get_prefix(self, client, message):
+        # called for every message the bot can see, before it knows if it is a command
+        if not message.guild:
+            # Only allow '.' as a prefix when in DMs, this is optional
+            return commands.when_mentioned_or('.')(client, message)
+        if not self.db.could_be_command(message.content):
+            # no prefix in use starts with this character, plain chat never reaches the database
+            return '.'
+        # get the prefix for the guild, cached until set-prefix or init changes it
+        prefix = await self.db.get_guild_prefix(message.guild.id)
 
         # Allow users to @mention the bot instead of using a prefix when using a command. Also optional
-        # Do `return prefixes` if you don't want to allow mentions instead of prefix.
-        return commands.when_mentioned_or(*prefixes)(client, message)
+        # Do `return prefix` if you don't want to allow mentions instead of prefix.
+        return commands.when_mentioned_or(prefix)(client, message)
@@ -0,0 +1,7 @@
+BEGIN TRANSACTION;
+CREATE TABLE `TEMP_GUILD` ( `guildID` INTEGER NOT NULL, `ownerID` INTEGER, `voiceChannelID` INTEGER NOT NULL, `voiceCategoryID` INTEGER, `useStage` INTEGER DEFAULT 0, PRIMARY KEY (`guildID`, `voiceChannelID`) ) WITHOUT ROWID;
+INSERT OR REPLACE INTO `TEMP_GUILD` SELECT guildID, ownerID, voiceChannelID, voiceCategoryID, useStage FROM `guild` WHERE guildID IS NOT NULL AND voiceChannelID IS NOT NULL ORDER BY rowid;
+DROP TABLE `guild`;
+ALTER TABLE `TEMP_GUILD` RENAME TO `guild`;
+CREATE INDEX IF NOT EXISTS `IX_guild_category` ON `guild` (`guildID`, `voiceCategoryID`, `voiceChannelID`, `useStage`);
+COMMIT;
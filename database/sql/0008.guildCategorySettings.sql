@@ -0,0 +1,6 @@
+BEGIN TRANSACTION;
+CREATE TABLE `TEMP_GCS` ( `guildID` INTEGER NOT NULL, `voiceCategoryID` INTEGER NOT NULL, `channelLimit` INTEGER, `channelLocked` INTEGER, `bitrate` INTEGER DEFAULT 64, `defaultRole` INTEGER DEFAULT '@everyone', PRIMARY KEY (`guildID`, `voiceCategoryID`) ) WITHOUT ROWID;
+INSERT OR REPLACE INTO `TEMP_GCS` SELECT guildID, voiceCategoryID, channelLimit, channelLocked, bitrate, defaultRole FROM `guildCategorySettings` WHERE guildID IS NOT NULL AND voiceCategoryID IS NOT NULL ORDER BY rowid;
+DROP TABLE `guildCategorySettings`;
+ALTER TABLE `TEMP_GCS` RENAME TO `guildCategorySettings`;
+COMMIT;
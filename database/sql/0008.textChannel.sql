@@ -0,0 +1,7 @@
+BEGIN TRANSACTION;
+CREATE TABLE `TEMP_TC` ( `guildID` INTEGER NOT NULL, `userID` INTEGER, `channelID` INTEGER NOT NULL, `voiceID` INTEGER, PRIMARY KEY (`guildID`, `channelID`) ) WITHOUT ROWID;
+INSERT OR REPLACE INTO `TEMP_TC` SELECT guildID, userID, channelID, voiceID FROM `textChannel` WHERE guildID IS NOT NULL AND channelID IS NOT NULL ORDER BY rowid;
+DROP TABLE `textChannel`;
+ALTER TABLE `TEMP_TC` RENAME TO `textChannel`;
+CREATE INDEX IF NOT EXISTS `IX_textChannel_voice` ON `textChannel` (`guildID`, `voiceID`, `channelID`, `userID`);
+COMMIT;
@@ -0,0 +1,6 @@
+BEGIN TRANSACTION;
+CREATE TABLE `TEMP_US` ( `guildID` INTEGER NOT NULL, `userID` INTEGER NOT NULL, `channelName` TEXT, `channelLimit` INTEGER, `bitrate` INTEGER DEFAULT 64, `defaultRole` INTEGER DEFAULT '@everyone', `auto_game` INTEGER DEFAULT 0, PRIMARY KEY (`guildID`, `userID`) ) WITHOUT ROWID;
+INSERT OR REPLACE INTO `TEMP_US` SELECT guildID, userID, channelName, channelLimit, bitrate, defaultRole, auto_game FROM `userSettings` WHERE guildID IS NOT NULL AND userID IS NOT NULL ORDER BY rowid;
+DROP TABLE `userSettings`;
+ALTER TABLE `TEMP_US` RENAME TO `userSettings`;
+COMMIT;
@@ -0,0 +1,7 @@
+BEGIN TRANSACTION;
+CREATE TABLE `TEMP_VC` ( `guildID` INTEGER NOT NULL, `userID` INTEGER, `voiceID` INTEGER NOT NULL, PRIMARY KEY (`guildID`, `voiceID`) ) WITHOUT ROWID;
+INSERT OR REPLACE INTO `TEMP_VC` SELECT guildID, userID, voiceID FROM `voiceChannel` WHERE guildID IS NOT NULL AND voiceID IS NOT NULL ORDER BY rowid;
+DROP TABLE `voiceChannel`;
+ALTER TABLE `TEMP_VC` RENAME TO `voiceChannel`;
+CREATE INDEX IF NOT EXISTS `IX_voiceChannel_user` ON `voiceChannel` (`guildID`, `userID`, `voiceID`);
+COMMIT;
@@ -0,0 +1,7 @@
+BEGIN TRANSACTION;
+CREATE TABLE IF NOT EXISTS `channelSet` ( `guildID` INTEGER NOT NULL, `userID` INTEGER, `voiceID` INTEGER NOT NULL, `channelID` INTEGER, PRIMARY KEY (`guildID`, `voiceID`) ) WITHOUT ROWID;
+INSERT OR REPLACE INTO `channelSet` SELECT v.guildID, v.userID, v.voiceID, t.channelID FROM `voiceChannel` v LEFT JOIN `textChannel` t ON t.guildID = v.guildID AND t.voiceID = v.voiceID;
+INSERT OR IGNORE INTO `channelSet` SELECT t.guildID, t.userID, t.voiceID, t.channelID FROM `textChannel` t WHERE t.voiceID IS NOT NULL;
+CREATE INDEX IF NOT EXISTS `IX_channelSet_channel` ON `channelSet` (`guildID`, `channelID`, `voiceID`, `userID`);
+CREATE INDEX IF NOT EXISTS `IX_channelSet_user` ON `channelSet` (`guildID`, `userID`, `voiceID`);
+COMMIT;
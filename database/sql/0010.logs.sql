@@ -0,0 +1,5 @@
+BEGIN TRANSACTION;
+CREATE TABLE IF NOT EXISTS `logs` ( `guildID` INTEGER, `timestamp` REAL NOT NULL, `level` TEXT NOT NULL, `method` TEXT, `message` TEXT, `stackTrace` TEXT );
+CREATE INDEX IF NOT EXISTS `IX_logs_timestamp` ON `logs` (`timestamp`);
+CREATE INDEX IF NOT EXISTS `IX_logs_guild` ON `logs` (`guildID`);
+COMMIT;
@@ -0,0 +1,4 @@
+BEGIN TRANSACTION;
+CREATE TABLE IF NOT EXISTS `trackedChannelsHistory` ( `guildID` INTEGER NOT NULL, `userID` INTEGER, `voiceID` INTEGER, `channelID` INTEGER, `timestamp` REAL NOT NULL );
+CREATE INDEX IF NOT EXISTS `IX_trackedChannelsHistory_timestamp` ON `trackedChannelsHistory` (`timestamp`);
+COMMIT;
@@ -0,0 +1,3 @@
+BEGIN TRANSACTION;
+CREATE TABLE IF NOT EXISTS `channelPool` ( `guildID` INTEGER NOT NULL, `createChannelID` INTEGER NOT NULL, `voiceID` INTEGER NOT NULL, `channelID` INTEGER NOT NULL, `timestamp` REAL NOT NULL, PRIMARY KEY (`guildID`, `voiceID`) ) WITHOUT ROWID;
+COMMIT;
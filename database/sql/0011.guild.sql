@@ -0,0 +1 @@
+ALTER TABLE `guild` ADD COLUMN `poolSize` INTEGER DEFAULT 0;